@@ -0,0 +1,103 @@
+import argparse
+import time
+from src.lexer.tokens import Tokens
+from src.lexer.token_types import TokenTypes
+from src.source.currencies_reader import CurrenciesReader
+from src.source.currencies import Currencies
+from src.source.rate_table import RateTable
+from src.engines import ENGINES, run_program
+from .interpreter_modes import parse
+
+
+PROGRAM = '''
+void main() {{
+    dec i = 0;
+    cur balance = 100 pln;
+    cur converted = 0 eur;
+    while (i < {iterations}) {{
+        converted = balance eur + 1 usd - 2 chf;
+        converted = converted pln + balance gbd;
+        i = i + 1;
+    }}
+    print(converted);
+}}
+'''
+
+
+def timed(function, *arguments):
+    start = time.perf_counter()
+    function(*arguments)
+    return time.perf_counter() - start
+
+
+def nested_dict_conversions(pairs, rounds):  # what CurrencyVariable.exchange did before the rate table
+    currencies = Currencies.currencies
+    value = 1.0
+    for _ in range(rounds):
+        for source, target in pairs:
+            if source != target:
+                value *= currencies[source][target]
+    return value
+
+
+def rate_table_conversions(pairs, rounds):
+    table = Currencies.table()
+    rows = table.rows
+    id_pairs = [(RateTable.intern(source), RateTable.intern(target)) for source, target in pairs]
+    value = 1.0
+    for _ in range(rounds):
+        for source, target in id_pairs:
+            if source != target:
+                value *= rows[source][target]
+    return value
+
+
+def sparse_universe(size):  # every currency quoted only against a hub, as large feeds usually are
+    codes = [f'x{index}' for index in range(size)]
+    rates = {code: {'hub': 1.0 + index / size} for index, code in enumerate(codes)}
+    rates['hub'] = {code: 1.0 / (1.0 + index / size) for index, code in enumerate(codes)}
+    return codes, rates
+
+
+def triangulated_conversions(table, id_pairs):
+    value = 1.0
+    for source, target in id_pairs:
+        value *= table.rate(source, target)
+    return value
+
+
+def main():
+    argument_parser = argparse.ArgumentParser()
+    argument_parser.add_argument('--rounds', type=int, default=20000)
+    argument_parser.add_argument('--iterations', type=int, default=5000)
+    argument_parser.add_argument('--rates', default='resources/currencies.json')
+    argument_parser.add_argument('--modes', nargs='+', default=ENGINES)
+    argument_parser.add_argument('--universe', type=int, default=5000,
+                                 help='number of currencies in the sparse rate graph')
+    arguments = argument_parser.parse_args()
+
+    CurrenciesReader(arguments.rates)
+    for currency in Currencies.currencies:
+        Tokens.keywords[currency] = TokenTypes.CURRENCY_TYPE
+    pairs = [(source, target) for source in Currencies.currencies for target in Currencies.currencies[source]]
+
+    baseline = timed(nested_dict_conversions, pairs, arguments.rounds)
+    print(f"{'nested dict':12} {baseline:8.3f} s (1.0x)")
+    elapsed = timed(rate_table_conversions, pairs, arguments.rounds)
+    print(f"{'rate table':12} {elapsed:8.3f} s ({baseline / elapsed:.1f}x)")
+
+    codes, rates = sparse_universe(arguments.universe)
+    start = time.perf_counter()
+    table = RateTable(rates)
+    print(f"{'sparse load':12} {time.perf_counter() - start:8.3f} s ({arguments.universe} currencies)")
+    id_pairs = [(RateTable.intern(source), RateTable.intern(target)) for source, target in zip(codes, reversed(codes))]
+    print(f"{'first use':12} {timed(triangulated_conversions, table, id_pairs):8.3f} s ({len(id_pairs)} pairs)")
+    print(f"{'memoized':12} {timed(triangulated_conversions, table, id_pairs):8.3f} s")
+
+    program = parse(PROGRAM.format(iterations=arguments.iterations))
+    for mode in arguments.modes:
+        print(f"{mode:12} {timed(run_program, program, mode):8.3f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+import argparse
+import io
+import time
+from src.lexer.lexer import Lexer
+from src.lexer.tokens import Tokens
+from src.lexer.token_types import TokenTypes
+from src.parser.parser import Parser
+from src.engines import ENGINES, run_program
+from src.source.currencies_reader import CurrenciesReader
+from src.source.currencies import Currencies
+from src.source.source import BufferedSource
+
+
+PROGRAM = '''
+void main() {{
+    dec i = 0;
+    dec total = 0;
+    cur balance = 100 pln;
+    cur fee = 1 eur;
+    while (i < {iterations}) {{
+        total = total + i * 2 - 1;
+        balance = balance + fee / 4 - 1 pln;
+        i = i + 1;
+    }}
+    print(total, " ", balance);
+}}
+'''
+
+
+def parse(source_string):
+    parser = Parser(Lexer(BufferedSource(io.StringIO(source_string))))
+    parser.parse_program()
+    return parser.program
+
+
+def main():
+    argument_parser = argparse.ArgumentParser()
+    argument_parser.add_argument('--iterations', type=int, default=20000)
+    argument_parser.add_argument('--rates', default='resources/currencies.json')
+    argument_parser.add_argument('--modes', nargs='+', default=ENGINES)
+    arguments = argument_parser.parse_args()
+
+    CurrenciesReader(arguments.rates)
+    for currency in Currencies.currencies:
+        Tokens.keywords[currency] = TokenTypes.CURRENCY_TYPE
+    program = parse(PROGRAM.format(iterations=arguments.iterations))
+
+    baseline = None
+    for mode in arguments.modes:
+        start = time.perf_counter()
+        run_program(program, mode)
+        elapsed = time.perf_counter() - start
+        baseline = baseline or elapsed
+        print(f"{mode:10} {elapsed:8.3f} s ({baseline / elapsed:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+import argparse
+import io
+import time
+from src.lexer.lexer import Lexer
+from src.lexer.tokens import Tokens
+from src.lexer.token_types import TokenTypes
+from src.parser.parser import Parser
+from src.engines import ENGINES, run_program
+from src.source.currencies_reader import CurrenciesReader
+from src.source.currencies import Currencies
+from src.source.source import BufferedSource
+
+
+CONSTANTS = '''
+void main() {{
+    dec i = 0;
+    cur total = 0 chf;
+    while (i < {iterations}) {{
+        total = total + pln (eur 100 + 5 usd) chf * (1 + 2.5 / 100) - (12 chf * 30 + 5 chf);
+        i = i + 1;
+    }}
+    print(total);
+}}
+'''
+
+DEAD_CODE = '''
+{functions}
+dec step(dec a) {{
+    if (a > 0) {{
+        return a - 1;
+        print("never");
+    }}
+    else {{
+        return 0;
+    }}
+    a = a * 2;
+    print("never");
+    return a;
+}}
+
+void main() {{
+    dec i = {iterations};
+    while (i > 0) {{
+        i = step(i);
+        if (2 > 3) {{
+            print("never");
+        }}
+    }}
+    print(i);
+}}
+'''
+
+UNUSED = '''
+dec unused{index}(dec a) {{
+    dec b = a * 2 + 1;
+    while (b > 0) {{
+        b = b - unused{index}(b);
+    }}
+    return b;
+}}
+'''
+
+LOOP_INVARIANTS = '''
+cur repay(cur debt, cur installment, dec rate, dec months) {{
+    dec month = 0;
+    while (month < months * 12 & debt > 0 chf) {{
+        debt = debt + debt * (rate / 12) - (installment) chf;
+        month = month + 1;
+    }}
+    return debt;
+}}
+
+void main() {{
+    print(repay(100000 chf, 1 eur, 0.01, {iterations} / 12));
+}}
+'''
+
+PROGRAMS = {
+    'constants': CONSTANTS,
+    'dead_code': DEAD_CODE,
+    'loop_invariants': LOOP_INVARIANTS
+}
+
+
+def parse(source_string):
+    parser = Parser(Lexer(BufferedSource(io.StringIO(source_string))))
+    parser.parse_program()
+    return parser.program
+
+
+def main():
+    argument_parser = argparse.ArgumentParser()
+    argument_parser.add_argument('--iterations', type=int, default=20000)
+    argument_parser.add_argument('--unused', type=int, default=500, help='functions never called in dead_code')
+    argument_parser.add_argument('--rates', default='resources/currencies.json')
+    argument_parser.add_argument('--engines', nargs='+', default=ENGINES)
+    arguments = argument_parser.parse_args()
+
+    CurrenciesReader(arguments.rates)
+    for currency in Currencies.currencies:
+        Tokens.keywords[currency] = TokenTypes.CURRENCY_TYPE
+    functions = ''.join(UNUSED.format(index=index) for index in range(arguments.unused))
+
+    for name, source_string in PROGRAMS.items():
+        source_string = source_string.format(iterations=arguments.iterations, functions=functions)
+        for engine in arguments.engines:
+            times = []
+            for optimize in (0, 1):
+                program = parse(source_string)
+                start = time.perf_counter()
+                run_program(program, engine, optimize=optimize)
+                times.append(time.perf_counter() - start)
+            optimized = program.optimized
+            print(f"{name:15} {engine:8} -O0 {times[0]:8.3f} s  -O1 {times[1]:8.3f} s ({times[0] / times[1]:.2f}x), "
+                  f"{optimized.folded} operations folded, {optimized.removed} nodes removed, "
+                  f"{optimized.hoisted} expressions moved out of loops")
+
+
+if __name__ == "__main__":
+    main()
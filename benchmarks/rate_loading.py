@@ -0,0 +1,62 @@
+import argparse
+import gc
+import json
+import os
+import tempfile
+import time
+import tracemalloc
+from src.source.currencies_reader import CurrenciesReader
+from src.source.currencies import Currencies
+from src.source.rate_file import compile_rates
+
+
+def generate_rates(path, currencies):  # a dense pairwise dump, the shape of our largest rate files
+    codes = [f'c{index:04}' for index in range(currencies)]
+    with open(path, 'w') as file:
+        file.write('{')
+        for index, code in enumerate(codes):
+            rates = {target: 1.0 + (index * 7 + position) % 1000 / 997 for position, target in enumerate(codes)
+                     if target != code}
+            file.write(('' if index == 0 else ',') + json.dumps(code) + ':' + json.dumps(rates))
+        file.write('}')
+
+
+def load(path, streaming):  # reading the file and building the rate table
+    Currencies.currencies = {}
+    Currencies.snapshot = None
+    gc.collect()
+    start = time.perf_counter()
+    CurrenciesReader(path, streaming=streaming)
+    Currencies.table()
+    return time.perf_counter() - start
+
+
+def measure(path, streaming):
+    elapsed = load(path, streaming)
+    tracemalloc.start()
+    load(path, streaming)
+    size, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, size, peak
+
+
+def main():
+    argument_parser = argparse.ArgumentParser()
+    argument_parser.add_argument('--currencies', type=int, default=600)
+    arguments = argument_parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'rates.json')
+        generate_rates(path, arguments.currencies)
+        print(f"rates file:  {os.path.getsize(path) / 2 ** 20:8.1f} MiB ({arguments.currencies} currencies)")
+        compiled_path = os.path.join(directory, 'rates.cpr')
+        compile_rates(path, compiled_path)
+        print(f"compiled:    {os.path.getsize(compiled_path) / 2 ** 20:8.1f} MiB")
+        for name, file_path, streaming in (('json.loads', path, False), ('streaming', path, True),
+                                           ('.cpr', compiled_path, None)):
+            elapsed, size, peak = measure(file_path, streaming)
+            print(f"{name:12} {elapsed:8.3f} s, {size / 2 ** 20:8.1f} MiB kept, {peak / 2 ** 20:8.1f} MiB peak")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+import argparse
+import io
+import time
+from src.lexer.lexer import Lexer
+from src.lexer.tokens import Tokens
+from src.lexer.token_types import TokenTypes
+from src.parser.parser import Parser
+from src.engines import ENGINES, run_program
+from src.source.currencies_reader import CurrenciesReader
+from src.source.currencies import Currencies
+from src.source.source import BufferedSource
+
+
+PROGRAM = '''
+dec sum(dec n) {{
+    if (n > 0) {{
+        return sum(n - 1) + n;
+    }}
+    return 0;
+}}
+
+void main() {{
+    dec i = 0;
+    dec total = 0;
+    while (i < {repeat}) {{
+        total = total + sum({depth});
+        i = i + 1;
+    }}
+    print(total);
+}}
+'''
+
+
+def parse(source_string):
+    parser = Parser(Lexer(BufferedSource(io.StringIO(source_string))))
+    parser.parse_program()
+    return parser.program
+
+
+def main():
+    argument_parser = argparse.ArgumentParser()
+    argument_parser.add_argument('--depth', type=int, default=50)
+    argument_parser.add_argument('--repeat', type=int, default=400)
+    argument_parser.add_argument('--deep', type=int, default=50000, help='depth of one call chain run by each engine')
+    argument_parser.add_argument('--rates', default='resources/currencies.json')
+    argument_parser.add_argument('--modes', nargs='+', default=ENGINES)
+    arguments = argument_parser.parse_args()
+
+    CurrenciesReader(arguments.rates)
+    for currency in Currencies.currencies:
+        Tokens.keywords[currency] = TokenTypes.CURRENCY_TYPE
+    program = parse(PROGRAM.format(repeat=arguments.repeat, depth=arguments.depth))
+    deep_program = parse(PROGRAM.format(repeat=1, depth=arguments.deep))
+    calls = arguments.repeat * (arguments.depth + 1)
+
+    for mode in arguments.modes:
+        start = time.perf_counter()
+        run_program(program, mode)
+        elapsed = time.perf_counter() - start
+        try:
+            run_program(deep_program, mode)
+            deep = 'ok'
+        except RecursionError:
+            deep = 'RecursionError'
+        print(f"{mode:10} {elapsed / calls * 1e6:8.2f} us per call, depth {arguments.deep}: {deep}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+import argparse
+import io
+import tracemalloc
+from src.lexer.lexer import Lexer
+from src.lexer.token_array import TokenArray
+from src.source.source import BufferedSource
+
+
+class DictToken:  # the token layout before __slots__, kept here as the baseline
+    def __init__(self, _type, line, column, value=None):
+        self.line = line
+        self.column = column
+        self.type = _type
+        self.value = value
+        self.numerical_value = None
+
+
+FUNCTION = '''dec step{0}(dec a, dec b) {{
+    dec result = a * 2 + b / 4 - 1.5;
+    while (result > 100) {{
+        result = result - 10;
+    }}
+    return result;
+}}
+'''
+
+
+def generate_program(tokens):
+    tokens_per_function = len(list(Lexer(BufferedSource(io.StringIO(FUNCTION.format(0))), engine="fast").tokens()))
+    count = tokens // (tokens_per_function - 1) + 1
+    return ''.join(FUNCTION.format(index) for index in range(count))
+
+
+def measure(build):
+    tracemalloc.start()
+    result = build()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, size
+
+
+def main():
+    argument_parser = argparse.ArgumentParser()
+    argument_parser.add_argument('--tokens', type=int, default=1000000)
+    arguments = argument_parser.parse_args()
+
+    program = generate_program(arguments.tokens)
+    tokens = list(Lexer(BufferedSource(io.StringIO(program)), engine="fast").tokens())
+
+    dict_tokens, dict_size = measure(lambda: [DictToken(token.type, token.line, token.column,
+                                                        token.value)
+                                              for token in tokens])
+    slot_tokens, slot_size = measure(lambda: [type(token)(token.type, token.line, token.column,
+                                                          token.value)
+                                              for token in tokens])
+    token_array, array_size = measure(lambda: TokenArray.from_tokens(tokens))
+
+    print(f"tokens:                {len(tokens)}")
+    print(f"dict-backed Token:     {dict_size / 2 ** 20:8.1f} MiB")
+    print(f"__slots__ Token:       {slot_size / 2 ** 20:8.1f} MiB ({dict_size / slot_size:.1f}x smaller)")
+    print(f"TokenArray:            {array_size / 2 ** 20:8.1f} MiB ({dict_size / array_size:.1f}x smaller)")
+
+
+if __name__ == "__main__":
+    main()
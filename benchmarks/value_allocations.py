@@ -0,0 +1,103 @@
+import argparse
+import ast
+import contextlib
+import io
+import time
+import tracemalloc
+from src.lexer.lexer import Lexer
+from src.lexer.tokens import Tokens
+from src.lexer.token_types import TokenTypes
+from src.parser.parser import Parser
+from src.engines import run_program
+from src.interpreter.variables import CurrencyVariable, DecimalVariable
+from src.source.currencies_reader import CurrenciesReader
+from src.source.currencies import Currencies
+from src.source.source import BufferedSource
+from tests.programs import PROGRAMS
+
+
+def interpreter_test_programs(path='tests/interpreter_test.py'):  # whole programs the interpreter tests run
+    with open(path) as test_file:
+        tree = ast.parse(test_file.read())
+    programs = []
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Call) and getattr(node.func, 'id', None) == 'create_interpreter':
+            try:
+                source_string = ast.literal_eval(node.args[0])
+            except ValueError:
+                continue
+            if 'main' in source_string:
+                programs.append(source_string)
+    return programs
+
+
+def parse(source_string):
+    parser = Parser(Lexer(BufferedSource(io.StringIO(source_string))))
+    parser.parse_program()
+    return parser.program
+
+
+class ValueCounter:  # counts the value objects built while it is installed
+    def __init__(self):
+        self.count = 0
+        self.originals = {}
+
+    def __enter__(self):
+        for cls in (CurrencyVariable, DecimalVariable):
+            original = self.originals[cls] = cls.__init__
+
+            def counted(variable, *arguments, original=original, **keywords):
+                self.count += 1
+                original(variable, *arguments, **keywords)
+            cls.__init__ = counted
+        return self
+
+    def __exit__(self, *exception):
+        for cls, original in self.originals.items():
+            cls.__init__ = original
+
+
+def run_all(programs, engine, repeat):
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(repeat):
+            for program in programs:
+                try:
+                    run_program(program, engine)
+                except Exception:  # some of the test programs check the reported errors
+                    pass
+
+
+def main():
+    argument_parser = argparse.ArgumentParser()
+    argument_parser.add_argument('--repeat', type=int, default=200)
+    argument_parser.add_argument('--rates', default='resources/currencies.json')
+    argument_parser.add_argument('--engines', nargs='+', default=['visitor', 'closure', 'vm'])
+    arguments = argument_parser.parse_args()
+
+    CurrenciesReader(arguments.rates)
+    for currency in Currencies.currencies:
+        Tokens.keywords[currency] = TokenTypes.CURRENCY_TYPE
+    programs = []
+    for source_string in interpreter_test_programs() + list(PROGRAMS.values()):
+        try:
+            programs.append(parse(source_string))
+        except Exception:  # some of the test programs check syntax errors
+            pass
+    print(f"{len(programs)} programs, {arguments.repeat} runs each")
+
+    for engine in arguments.engines:
+        run_all(programs, engine, 1)  # closures and rates are built on the first run
+        with ValueCounter() as counter:
+            run_all(programs, engine, 1)
+        tracemalloc.start()
+        run_all(programs, engine, arguments.repeat)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        start = time.perf_counter()
+        run_all(programs, engine, arguments.repeat)
+        elapsed = time.perf_counter() - start
+        print(f"{engine:10} {counter.count:8} values per run {peak / 1024:10.1f} KiB peak {elapsed:8.3f} s")
+
+
+if __name__ == "__main__":
+    main()
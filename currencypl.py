@@ -1,27 +1,143 @@
 from src.source.currencies_reader import CurrenciesReader
 from src.source.currencies import Currencies
+from src.source.rate_file import compile_rates
+from src.source.rate_history import RateHistory, build_history, read_daily_rates
 from src.lexer.tokens import Tokens
 from src.lexer.token_types import TokenTypes
 from src.lexer.lexer import Lexer
+from src.lexer.currency_scan import referenced_currencies_in_file
 from src.parser.parser import Parser
-from src.interpreter.interpreter import Interpreter
-from src.source.source import FileSource
+from src.source.source import FileSource, BufferedSource, MmapSource
+from src.cache.program_cache import ProgramCache
+from src.compiler.compiler import Compiler
+from src.compiler.disassembler import disassemble
+from src.compiler.transpiler import PythonTranspiler
+from src.engines import ENGINES, MAX_DEPTH, run_program
+from src.interpreter.numeric import NUMERICS, numeric_backend
+from src.interpreter.memo import MemoCache
+import argparse
+import datetime
+import os
 import sys
 
 
-if __name__ == "__main__":
-    program_file_path = sys.argv[1]
-    program = open(program_file_path)
+SOURCES = {
+    'buffered': BufferedSource,
+    'file': FileSource,
+    'mmap': MmapSource
+}
 
-    currencies_file_path = sys.argv[2]
-    CurrenciesReader(currencies_file_path)
-    currencies = Currencies.currencies
-    for currency in currencies:
-        Tokens.keywords[currency] = TokenTypes.CURRENCY_TYPE
 
-    lexer = Lexer(FileSource(program))
-    parser = Parser(lexer)
-    interpreter = Interpreter(parser)
-    interpreter.interpret()
+def minor_units(value):
+    minor_units = int(value)
+    if minor_units < 0:
+        raise argparse.ArgumentTypeError(f"must not be negative: {value}")
+    return minor_units
 
-    program.close()
+
+def parse_arguments():
+    argument_parser = argparse.ArgumentParser(prog='currencypl.py')
+    argument_parser.add_argument('program', help='path to a text file with the code of the program')
+    argument_parser.add_argument('rates', help='path to a json file containing defined currencies with their rates')
+    argument_parser.add_argument('--source', choices=SOURCES.keys(), default='buffered',
+                                 help='how the program file is read (default: buffered)')
+    argument_parser.add_argument('--lexer', choices=['reference', 'fast'], default='reference',
+                                 help='lexer engine (default: reference)')
+    argument_parser.add_argument('--engine', choices=ENGINES, default='visitor',
+                                 help='execution engine (default: visitor)')
+    argument_parser.add_argument('--numeric', choices=NUMERICS.keys(), default='float',
+                                 help='how amounts are stored and computed (default: float)')
+    argument_parser.add_argument('--minor-units', type=minor_units, default=2,
+                                 help='digits after the decimal point kept by --numeric fixed (default: 2)')
+    argument_parser.add_argument('--max-depth', type=int, default=MAX_DEPTH,
+                                 help=f'deepest nesting of function calls run by --engine vm (default: {MAX_DEPTH})')
+    argument_parser.add_argument('--memo-size', type=int, default=1024,
+                                 help='results of pure function calls remembered by the visitor and closure engines, '
+                                      '0 to always run the calls (default: 1024)')
+    argument_parser.add_argument('--memo-stats', action='store_true',
+                                 help='print the hits and misses of the function result cache to stderr')
+    argument_parser.add_argument('-O', dest='optimize', type=int, choices=[0, 1], default=1,
+                                 help='optimization level, -O0 runs the program as parsed (default: 1)')
+    argument_parser.add_argument('--optimizer-stats', action='store_true',
+                                 help='print the number of operations folded, nodes removed and expressions moved out '
+                                      'of loops by the optimizer to stderr')
+    argument_parser.add_argument('--disassemble', action='store_true',
+                                 help='print the bytecode (or the Python source with --engine python) of the program '
+                                      'instead of running it')
+    argument_parser.add_argument('--dates', nargs=2, type=datetime.date.fromisoformat, metavar=('START', 'END'),
+                                 help='run the program once for every quoted day between START and END, '
+                                      'with rates read from a rate history file or a directory of daily json files')
+    argument_parser.add_argument('--no-cache', action='store_true',
+                                 help='always lex and parse the program, bypassing the compilation cache')
+    arguments = argument_parser.parse_args()
+    if arguments.source == 'mmap' and arguments.lexer == 'fast':  # the fast lexer needs the whole text in memory
+        argument_parser.error("--lexer fast cannot be used with --source mmap")
+    return arguments
+
+
+def parse_compile_rates_arguments(arguments):
+    argument_parser = argparse.ArgumentParser(prog='currencypl.py compile-rates',
+                                              description='compile a json rates file to a binary .cpr rate file')
+    argument_parser.add_argument('json', help='path to a json file containing defined currencies with their rates')
+    argument_parser.add_argument('cpr', help='path of the compiled rate file to write')
+    return argument_parser.parse_args(arguments)
+
+
+def parse_program(arguments):
+    with open(arguments.program) as program_file, SOURCES[arguments.source](program_file) as source:
+        lexer = Lexer(source, engine=arguments.lexer)
+        parser = Parser(lexer)
+        parser.parse_program()
+    return parser.program
+
+
+def load_history(path):
+    if os.path.isdir(path):
+        return RateHistory(build_history(read_daily_rates(path)))
+    return RateHistory(path)
+
+
+if __name__ == "__main__" and sys.argv[1:2] == ['compile-rates']:
+    arguments = parse_compile_rates_arguments(sys.argv[2:])
+    compile_rates(arguments.json, arguments.cpr)
+elif __name__ == "__main__":
+    arguments = parse_arguments()
+
+    history = None
+    if arguments.dates:
+        history = load_history(arguments.rates)
+        currencies = history.codes
+    else:
+        CurrenciesReader(arguments.rates, lazy=True)  # rates are read when a program first converts from a currency
+        currencies = Currencies.currencies  # for a .cpr file, the code table from its header
+    currencies = set(currencies)
+
+    cache = None if arguments.no_cache else ProgramCache(arguments.program, currencies=currencies)
+    program = cache.load() if cache else None
+    if program is None:
+        with open(arguments.program) as program_file:
+            referenced = referenced_currencies_in_file(program_file, currencies)
+        for currency in referenced:  # the other currencies are never looked up by the lexer
+            Tokens.keywords[currency] = TokenTypes.CURRENCY_TYPE
+        program = parse_program(arguments)
+        if cache:
+            cache.store(program)
+
+    numeric = numeric_backend(arguments.numeric, arguments.minor_units)
+    memo = MemoCache(arguments.memo_size)  # shared by the runs of --dates, flushed when the rates change
+    if arguments.disassemble and arguments.engine == 'python':
+        print(PythonTranspiler().transpile(program))
+    elif arguments.disassemble:
+        print(disassemble(Compiler(numeric).compile_program(program)))
+    elif history:
+        for day in history.days(*arguments.dates):
+            print(f"[{day}]")
+            Currencies.currencies = history.currencies(day)
+            run_program(program, arguments.engine, numeric, arguments.max_depth, memo, arguments.optimize)
+    else:
+        run_program(program, arguments.engine, numeric, arguments.max_depth, memo, arguments.optimize)
+    if arguments.memo_stats:
+        print(f"memo: {memo.hits} hits, {memo.misses} misses", file=sys.stderr)
+    if arguments.optimizer_stats and program.optimized is not None:
+        print(f"optimizer: {program.optimized.folded} operations folded, {program.optimized.removed} nodes removed, "
+              f"{program.optimized.hoisted} expressions moved out of loops", file=sys.stderr)
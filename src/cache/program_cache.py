@@ -0,0 +1,59 @@
+import hashlib
+import os
+import pickle
+import zlib
+from ..lexer.tokens import Tokens
+from ..lexer.token_types import TokenTypes
+
+
+class ProgramCache:
+    VERSION = 1  # bump whenever the grammar classes change shape
+    DIRECTORY = '__cplcache__'
+
+    def __init__(self, program_path, directory=None, currencies=None):
+        self.program_path = program_path
+        self.currencies = currencies  # codes of the rates file; currency keywords registered so far by default
+        if directory is None:
+            directory = os.path.join(os.path.dirname(os.path.abspath(program_path)), self.DIRECTORY)
+        self.directory = directory
+        self.key = self.compute_key()
+        name = os.path.basename(program_path)
+        self.path = os.path.join(self.directory, f"{name}.{self.key[:16]}.cplc")
+
+    def compute_key(self):
+        digest = hashlib.sha256(f"currencypl-cache-{self.VERSION}\n".encode())
+        if self.currencies is None:
+            currencies = sorted(keyword for keyword, token_type in Tokens.keywords.items()
+                                if token_type == TokenTypes.CURRENCY_TYPE)
+        else:
+            currencies = sorted(self.currencies)
+        digest.update(','.join(currencies).encode())
+        digest.update(b'\n')
+        with open(self.program_path, 'rb') as file:
+            for chunk in iter(lambda: file.read(1 << 20), b''):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    def load(self):
+        try:
+            with open(self.path, 'rb') as file:
+                key = file.readline().strip().decode()
+                if key != self.key:
+                    return None
+                return pickle.loads(zlib.decompress(file.read()))
+        except (OSError, EOFError, ValueError, zlib.error, pickle.UnpicklingError, AttributeError, ImportError):
+            return None
+
+    def store(self, program):  # like __pycache__, a cache that cannot be written is left out
+        temporary_path = f"{self.path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            with open(temporary_path, 'wb') as file:
+                file.write(self.key.encode() + b'\n')
+                file.write(zlib.compress(pickle.dumps(program, pickle.HIGHEST_PROTOCOL)))
+            os.replace(temporary_path, self.path)
+        except OSError:
+            try:
+                os.remove(temporary_path)
+            except OSError:
+                pass
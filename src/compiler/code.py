@@ -0,0 +1,23 @@
+from array import array
+
+
+class CodeObject:  # bytecode of one function: pairs of (opcode, argument) in a flat int array
+    def __init__(self, name, function_def=None):
+        self.name = name
+        self.function_def = function_def
+        self.code = array('i')
+        self.constants = []
+        self.names = []  # function names referenced by LOAD_FUNCTION
+        self.local_names = []  # local variable name of each frame slot
+        self.parameters = []  # frame slot of each parameter
+        self.duplicate_parameter = None
+
+    @property
+    def frame_size(self):
+        return len(self.local_names)
+
+
+class CompiledProgram:
+    def __init__(self, functions, entry):
+        self.functions = functions  # function name -> CodeObject
+        self.entry = entry  # blocks of all 'main' functions, run in one frame like the interpreter does
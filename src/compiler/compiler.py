@@ -0,0 +1,313 @@
+from .code import CodeObject, CompiledProgram
+from .opcodes import *
+from ..lexer.token_types import TokenTypes
+from ..source.rate_table import RateTable
+
+
+RELATION_OPS = {
+    TokenTypes.GREATER_THAN: COMPARISONS.index('>'),
+    TokenTypes.LESS_THAN: COMPARISONS.index('<'),
+    TokenTypes.GREATER_OR_EQUAL: COMPARISONS.index('>='),
+    TokenTypes.LESS_OR_EQUAL: COMPARISONS.index('<='),
+    TokenTypes.EQUAL: COMPARISONS.index('=='),
+    TokenTypes.NOT_EQUAL: COMPARISONS.index('!=')
+}
+
+
+def contains_return(node):
+    statements = node.statements if type(node).__name__ == 'Block' else [node]
+    for statement in statements:
+        name = type(statement).__name__
+        if name == 'ReturnStatement':
+            return True
+        if name == 'IfStatement' and (contains_return(statement.block1)
+                                      or statement.block2 is not None and contains_return(statement.block2)):
+            return True
+        if name == 'WhileStatement' and contains_return(statement.block):
+            return True
+    return False
+
+
+class Compiler:  # lowers a parsed Program to bytecode with the exact semantics of the visitor interpreter
+    def __init__(self, numeric=None):
+        self.numeric = numeric  # backend turning number literals into constants, None for plain floats
+        self.code_object = None
+        self.slots = {}
+        self.may_return = False  # whether a return statement could have run before the current position
+        self.return_target = None  # start of the innermost while loop, None for the end of the function
+        self.return_jumps = []
+
+    def compile_program(self, program):
+        functions = {}
+        mains = []
+        for function_def in program.function_defs:
+            functions[function_def.signature.id] = self.compile_function(function_def.signature.id, [function_def],
+                                                                         function_def)
+            if function_def.signature.id == 'main':
+                mains.append(function_def)
+        entry = self.compile_function('main', mains) if mains else None
+        return CompiledProgram(functions, entry)
+
+    def compile_function(self, name, function_defs, function_def=None):
+        self.code_object = CodeObject(name, function_def)
+        self.slots = {}
+        self.may_return = False
+        self.return_target = None
+        self.return_jumps = []
+        if function_def is not None:
+            for signature in function_def.parameters.signatures:
+                if signature.id in self.slots and self.code_object.duplicate_parameter is None:
+                    self.code_object.duplicate_parameter = signature.id
+                self.code_object.parameters.append(self.slot(signature.id))
+        for definition in function_defs:  # a return in one 'main' ends its own block only
+            self.compile(definition.block)
+            for position in self.return_jumps:
+                self.patch(position, self.here())
+            self.return_jumps = []
+        self.emit(RET)
+        return self.code_object
+
+    def slot(self, name):
+        slot = self.slots.get(name)
+        if slot is None:
+            slot = self.slots[name] = len(self.code_object.local_names)
+            self.code_object.local_names.append(name)
+        return slot
+
+    def constant(self, value):
+        constants = self.code_object.constants
+        for index, constant in enumerate(constants):
+            if type(constant) is type(value) and repr(constant) == repr(value):
+                return index
+        constants.append(value)
+        return len(constants) - 1
+
+    def function_name(self, name):
+        names = self.code_object.names
+        if name not in names:
+            names.append(name)
+        return names.index(name)
+
+    def emit(self, opcode, argument=0):  # returns the position of the instruction
+        position = len(self.code_object.code)
+        self.code_object.code.append(opcode)
+        self.code_object.code.append(argument)
+        return position
+
+    def patch(self, position, target):
+        self.code_object.code[position + 1] = target
+
+    def here(self):
+        return len(self.code_object.code)
+
+    def compile(self, node):
+        getattr(self, 'compile_' + type(node).__name__)(node)
+
+    def compile_Block(self, block):
+        for statement in block.statements:
+            self.compile(statement)
+            if type(statement).__name__ == 'FunctionCall':
+                self.emit(POP)
+            if self.may_return:
+                position = self.emit(JUMP_IF_RETURNING, self.return_target or 0)
+                if self.return_target is None:
+                    self.return_jumps.append(position)
+
+    def compile_IfStatement(self, if_statement):
+        self.compile(if_statement.condition)
+        else_jump = self.emit(POP_JUMP_IF_FALSE)
+        self.compile(if_statement.block1)
+        if if_statement.block2 is not None:
+            end_jump = self.emit(JUMP)
+            self.patch(else_jump, self.here())
+            self.compile(if_statement.block2)
+            self.patch(end_jump, self.here())
+        else:
+            self.patch(else_jump, self.here())
+
+    def compile_WhileStatement(self, while_statement):
+        start = self.here()
+        self.compile(while_statement.condition)
+        end_jump = self.emit(POP_JUMP_IF_FALSE)
+        outer_target = self.return_target
+        self.return_target = start  # a return only ends the current iteration of the loop body
+        if contains_return(while_statement.block):
+            self.may_return = True
+        self.compile(while_statement.block)
+        self.return_target = outer_target
+        self.emit(JUMP, start)
+        self.patch(end_jump, self.here())
+
+    def compile_ReturnStatement(self, return_statement):
+        self.compile(return_statement.expression)
+        self.emit(SET_RETURN)
+        self.may_return = True
+
+    def compile_InitStatement(self, init_statement):
+        slot = self.slot(init_statement.signature.id)
+        _type = init_statement.signature.type
+        if _type not in (TokenTypes.DECIMAL, TokenTypes.CURRENCY):
+            self.emit(INVALID_TYPE, slot)
+        elif init_statement.expression is None:
+            self.emit(DECLARE_EMPTY_DEC if _type == TokenTypes.DECIMAL else DECLARE_EMPTY_CUR, slot)
+        else:
+            self.compile(init_statement.expression)
+            self.emit(DECLARE_DEC if _type == TokenTypes.DECIMAL else DECLARE_CUR, slot)
+
+    def compile_AssignStatement(self, assign_statement):
+        self.compile(assign_statement.expression)
+        self.emit(STORE, self.slot(assign_statement.id))
+
+    def compile_PrintStatement(self, print_statement):
+        for printable in print_statement.printables:
+            if isinstance(printable, str):
+                self.emit(LOAD_CONST, self.constant(printable.replace('"', '')))
+            else:
+                self.compile(printable)
+                self.emit(TO_STRING)
+        self.emit(PRINT, len(print_statement.printables))
+
+    def compile_FunctionCall(self, function_call):
+        self.emit(LOAD_FUNCTION, self.function_name(function_call.id))
+        for expression in function_call.arguments.expressions:
+            self.compile(expression)
+        self.emit(CALL_TYPED if function_call.typed else CALL, len(function_call.arguments.expressions))
+
+    def compile_Expression(self, expression):  # multiplExpr, { additiveOp, multiplExpr } ;
+        self.compile(expression.multipl_exprs[0])
+        if expression.type is not None:  # see type_inference
+            exchange = int(expression.type == TokenTypes.CURRENCY and (
+                expression.currency is None
+                or any(multipl_expr.currency != expression.currency for multipl_expr in expression.multipl_exprs)))
+            for additive_op, multipl_expr in zip(expression.additive_ops, expression.multipl_exprs[1:]):
+                self.compile(multipl_expr)
+                self.emit(ADD_TYPED if additive_op == TokenTypes.PLUS else SUB_TYPED, exchange)
+            return
+        for additive_op, multipl_expr in zip(expression.additive_ops, expression.multipl_exprs[1:]):
+            self.compile(multipl_expr)
+            self.emit(ADD if additive_op == TokenTypes.PLUS else SUB)
+
+    def compile_MultiplExpr(self, multipl_expr):  # primaryExpr, { multiplOp, primaryExpr } ;
+        self.compile(multipl_expr.primary_exprs[0])
+        if multipl_expr.type == TokenTypes.DECIMAL:  # no cur ends the chain
+            for multipl_op, primary_expr in zip(multipl_expr.multipl_ops, multipl_expr.primary_exprs[1:]):
+                self.compile(primary_expr)
+                self.emit(MUL_DEC if multipl_op == TokenTypes.MULTIPLY else DIV_DEC)
+            return
+        final_jumps = []
+        for multipl_op, primary_expr in zip(multipl_expr.multipl_ops, multipl_expr.primary_exprs[1:]):
+            self.compile(primary_expr)
+            final_jumps.append(self.emit(MUL if multipl_op == TokenTypes.MULTIPLY else DIV))
+        for position in final_jumps:
+            self.patch(position, self.here())
+
+    def compile_currency_part(self, currency, get_currency):
+        if currency is not None:
+            self.emit(LOAD_CURRENCY, RateTable.intern(currency))
+        else:
+            self.compile(get_currency)
+
+    def compile_PrimaryExpr(self, primary_expr):  # [ “-” ], [currency | getCurrency], ( number | id |
+        # parenthExpr | functionCall ), [currency | getCurrency] ;
+        parts = [(currency, get_currency) for currency, get_currency in
+                 ((primary_expr.currency1, primary_expr.get_currency1),
+                  (primary_expr.currency2, primary_expr.get_currency2))
+                 if currency is not None or get_currency is not None]
+        if primary_expr.number is not None:
+            number = -primary_expr.number if primary_expr.minus else primary_expr.number
+            if self.numeric is not None:
+                number = self.numeric.number(number)
+            if not parts:
+                self.emit(LOAD_DEC, self.constant(number))
+            elif parts[0][0] is not None:  # only the first currency is used, the others are still evaluated
+                for currency, get_currency in parts[1:]:
+                    if get_currency is not None:
+                        self.compile(get_currency)
+                        self.emit(POP)
+                self.emit(LOAD_CUR, self.constant((number, RateTable.intern(parts[0][0]))))
+            else:
+                for currency, get_currency in parts:
+                    self.compile_currency_part(currency, get_currency)
+                for _ in parts[1:]:
+                    self.emit(POP)
+                self.emit(LOAD_NUMBER_IN, self.constant(number))
+            return
+        if primary_expr.id is not None:
+            self.emit(LOAD_VAR, self.slot(primary_expr.id))
+            for currency, get_currency in parts:
+                self.compile_currency_part(currency, get_currency)
+            if parts:
+                self.emit(EXCHANGE_VAR, len(parts))
+        elif primary_expr.parenth_expr is not None:
+            for currency, get_currency in parts:
+                self.compile_currency_part(currency, get_currency)
+            self.compile(primary_expr.parenth_expr)
+            if parts:
+                self.emit(EXCHANGE, len(parts))
+        else:
+            for currency, get_currency in parts:
+                if get_currency is not None:
+                    self.compile(get_currency)
+                    self.emit(POP)
+            self.compile(primary_expr.function_call)
+        if primary_expr.minus:
+            self.emit(NEGATE)
+
+    def compile_ParenthExpr(self, parenth_expr):
+        self.compile(parenth_expr.expression)
+
+    def compile_GetCurrency(self, get_currency):
+        self.emit(GET_CURRENCY, self.slot(get_currency.id))
+
+    def compile_Condition(self, condition):  # andCond, { orOp, andCond } ;
+        if len(condition.and_conds) == 1:
+            self.compile(condition.and_conds[0])
+            return
+        true_jumps = []
+        for and_cond in condition.and_conds:
+            self.compile(and_cond)
+            true_jumps.append(self.emit(POP_JUMP_IF_TRUE))
+        self.emit(LOAD_CONST, self.constant(False))
+        end_jump = self.emit(JUMP)
+        for position in true_jumps:
+            self.patch(position, self.here())
+        self.emit(LOAD_CONST, self.constant(True))
+        self.patch(end_jump, self.here())
+
+    def compile_AndCond(self, and_cond):  # equalityCond, { andOp, equalityCond } ;
+        for equality_cond in and_cond.equality_conds:  # all operands are evaluated
+            self.compile(equality_cond)
+        if len(and_cond.equality_conds) == 1:
+            self.emit(TO_BOOL)
+        else:
+            self.emit(AND, len(and_cond.equality_conds))
+
+    def compile_EqualityCond(self, equality_cond):  # relationalCond, [ equalOp, relationalCond ] ;
+        self.compile_comparison(equality_cond.relational_cond1, equality_cond.equal_op,
+                                equality_cond.relational_cond2)
+
+    def compile_RelationalCond(self, relational_cond):  # primaryCond, [ relationOp, primaryCond ];
+        self.compile_comparison(relational_cond.primary_cond1, relational_cond.relation_op,
+                                relational_cond.primary_cond2)
+
+    def compile_comparison(self, first, operator, second):
+        self.compile(first)
+        if operator is None:
+            return
+        self.emit(IS_TUPLE)
+        self.compile(first)  # the visitor evaluates the first operand twice
+        self.emit(UNWRAP)
+        self.compile(second)
+        self.emit(COMPARE, RELATION_OPS[operator])
+
+    def compile_PrimaryCond(self, primary_cond):  # [ unaryOp ], ( parenthCond | expression ) ;
+        if primary_cond.parenth_cond is not None:
+            self.compile(primary_cond.parenth_cond)
+            self.emit(NOT if primary_cond.unary_op else TO_BOOL)
+        else:
+            self.compile(primary_cond.expression)
+            if primary_cond.unary_op:
+                self.emit(MAKE_NOT)
+
+    def compile_ParenthCond(self, parenth_cond):
+        self.compile(parenth_cond.condition)
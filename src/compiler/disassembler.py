@@ -0,0 +1,43 @@
+from .opcodes import OPNAMES, JUMPS, LOCALS, CONSTANTS, NAMES, CURRENCIES, COMPARISONS
+from ..source.rate_table import RateTable
+
+
+def disassemble_code(code_object):
+    parameters = ', '.join(code_object.local_names[slot] for slot in code_object.parameters)
+    lines = [f"{code_object.name}({parameters}): {code_object.frame_size} slots, "
+             f"{len(code_object.code) // 2} instructions"]
+    targets = {code_object.code[position + 1] for position in range(0, len(code_object.code), 2)
+               if OPNAMES[code_object.code[position]] in JUMPS}
+    for position in range(0, len(code_object.code), 2):
+        opname = OPNAMES[code_object.code[position]]
+        argument = code_object.code[position + 1]
+        if opname in LOCALS:
+            detail = f"{argument} ({code_object.local_names[argument]})"
+        elif opname == 'LOAD_CUR':
+            value, currency_id = code_object.constants[argument]
+            detail = f"{argument} ({value!r} {RateTable.codes[currency_id]})"
+        elif opname in CURRENCIES:
+            detail = f"{argument} ({RateTable.codes[argument]})"
+        elif opname in CONSTANTS:
+            detail = f"{argument} ({code_object.constants[argument]!r})"
+        elif opname in NAMES:
+            detail = f"{argument} ({code_object.names[argument]})"
+        elif opname in JUMPS:
+            detail = f"to {argument}"
+        elif opname == 'COMPARE':
+            detail = f"{argument} ({COMPARISONS[argument]})"
+        elif opname in ('EXCHANGE_VAR', 'EXCHANGE', 'ADD_TYPED', 'SUB_TYPED', 'CALL', 'CALL_TYPED', 'PRINT', 'AND'):
+            detail = str(argument)
+        else:
+            detail = ''
+        marker = '>>' if position in targets else '  '
+        lines.append(f"{marker} {position:5} {opname:<18} {detail}".rstrip())
+    return '\n'.join(lines)
+
+
+def disassemble(compiled_program):
+    sections = [disassemble_code(code_object) for code_object in compiled_program.functions.values()
+                if code_object.name != 'main']
+    if compiled_program.entry is not None:
+        sections.append(disassemble_code(compiled_program.entry))
+    return '\n\n'.join(sections)
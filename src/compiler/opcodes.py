@@ -0,0 +1,57 @@
+OPNAMES = [
+    'LOAD_CONST',           # push constants[arg]
+    'LOAD_DEC',             # push a new dec value of constants[arg]
+    'LOAD_CURRENCY',        # push currency id arg
+    'LOAD_CUR',             # push a new cur value of constants[arg] = (value, currency id)
+    'LOAD_NUMBER_IN',       # pop a currency id, push a new cur value of constants[arg] in it
+    'LOAD_VAR',             # push a copy of local arg
+    'GET_CURRENCY',         # push the currency id of local arg
+    'EXCHANGE_VAR',         # pop a variable copy and arg currencies below it, convert (skipping the first for dec)
+    'EXCHANGE',             # pop a value and arg currencies below it, convert to each in order
+    'NEGATE',               # negate the value on top of the stack in place
+    'ADD',
+    'SUB',
+    'ADD_TYPED',            # add operands of one type, converting a cur to the currency of the result when arg is 1
+    'SUB_TYPED',
+    'MUL_DEC',              # multiply two dec values
+    'DIV_DEC',              # divide two dec values
+    'MUL',                  # multiply, jump to arg when the chain result is final
+    'DIV',                  # divide, jump to arg when the chain result is final
+    'IS_TUPLE',             # replace top of the stack with whether it is a negated operand
+    'UNWRAP',               # replace a negated operand with the operand itself
+    'COMPARE',              # pop result2, result1, negation flag and push COMPARISONS[arg](result1, result2)
+    'MAKE_NOT',             # replace top of the stack with a negated operand
+    'TO_BOOL',
+    'NOT',
+    'AND',                  # pop arg values, push whether all of them are true
+    'JUMP',
+    'POP_JUMP_IF_TRUE',
+    'POP_JUMP_IF_FALSE',
+    'JUMP_IF_RETURNING',    # jump to arg when a return value was set
+    'DECLARE_DEC',          # pop an initial value into new local arg
+    'DECLARE_CUR',
+    'DECLARE_EMPTY_DEC',
+    'DECLARE_EMPTY_CUR',
+    'INVALID_TYPE',         # raise for a variable declared with type void
+    'STORE',                # pop a value into declared local arg
+    'TO_STRING',
+    'PRINT',                # pop arg strings and print them joined
+    'LOAD_FUNCTION',        # push function names[arg]
+    'CALL',                 # pop arg arguments and a function, push its result
+    'CALL_TYPED',           # like CALL, for arguments of the types of the parameters
+    'POP',
+    'SET_RETURN',           # pop the return value of the running function
+    'RET'
+]
+
+for _opcode, _opname in enumerate(OPNAMES):
+    globals()[_opname] = _opcode
+
+JUMPS = {'MUL', 'DIV', 'JUMP', 'POP_JUMP_IF_TRUE', 'POP_JUMP_IF_FALSE', 'JUMP_IF_RETURNING'}
+LOCALS = {'LOAD_VAR', 'GET_CURRENCY', 'DECLARE_DEC', 'DECLARE_CUR', 'DECLARE_EMPTY_DEC', 'DECLARE_EMPTY_CUR',
+          'INVALID_TYPE', 'STORE'}
+CONSTANTS = {'LOAD_CONST', 'LOAD_DEC', 'LOAD_CUR', 'LOAD_NUMBER_IN'}
+NAMES = {'LOAD_FUNCTION'}
+CURRENCIES = {'LOAD_CURRENCY'}
+
+COMPARISONS = ['>', '<', '>=', '<=', '==', '!=']
@@ -0,0 +1,573 @@
+import weakref
+from collections import OrderedDict
+from ..lexer.token_types import TokenTypes
+from ..source.currencies import Currencies
+from ..source.rate_table import RateTable
+from ..interpreter.variables import CurrencyVariable, DecimalVariable
+from ..exceptions.exceptions import NotTranspilableError, MainNotDeclaredError, UndeclaredError, OverwriteError, \
+    CurrencyNotDefinedError, GetCurrencyError, DivisionZeroError, CurrencyUsedForDecimalVariableError, \
+    IllicitOperationError, ChangeVariableTypeError, CurrencyNotDefinedOrChangeVariableTypeError, \
+    InvalidReturnedTypeError, IncorrectArgumentsNumberError, InvalidArgumentTypeError
+
+
+DEC = 'dec'
+CUR = 'cur'
+VOID = 'void'
+TYPES = {TokenTypes.DECIMAL: DEC, TokenTypes.CURRENCY: CUR, TokenTypes.VOID: VOID}
+TYPE_NAMES = {DEC: 'TokenTypes.DECIMAL', CUR: 'TokenTypes.CURRENCY', VOID: 'TokenTypes.VOID'}
+CLASS_NAMES = {DEC: 'DecimalVariable', CUR: 'CurrencyVariable'}
+RELATIONS = {  # operator and the operator used when the first operand is negated with '!'
+    TokenTypes.GREATER_THAN: ('>', '<='),
+    TokenTypes.LESS_THAN: ('<', '>='),
+    TokenTypes.GREATER_OR_EQUAL: ('>=', '<'),
+    TokenTypes.LESS_OR_EQUAL: ('<=', '>'),
+    TokenTypes.EQUAL: ('==', '!='),
+    TokenTypes.NOT_EQUAL: ('!=', '==')
+}
+UNDECLARED = object()
+NAMESPACE = {
+    'Currencies': Currencies, 'CurrencyVariable': CurrencyVariable, 'DecimalVariable': DecimalVariable,
+    'TokenTypes': TokenTypes, 'NoneType': type(None), 'UNDECLARED': UNDECLARED,
+    'MainNotDeclaredError': MainNotDeclaredError, 'UndeclaredError': UndeclaredError, 'OverwriteError': OverwriteError,
+    'CurrencyNotDefinedError': CurrencyNotDefinedError, 'GetCurrencyError': GetCurrencyError,
+    'DivisionZeroError': DivisionZeroError, 'CurrencyUsedForDecimalVariableError': CurrencyUsedForDecimalVariableError,
+    'IllicitOperationError': IllicitOperationError, 'ChangeVariableTypeError': ChangeVariableTypeError,
+    'CurrencyNotDefinedOrChangeVariableTypeError': CurrencyNotDefinedOrChangeVariableTypeError,
+    'InvalidReturnedTypeError': InvalidReturnedTypeError, 'IncorrectArgumentsNumberError': IncorrectArgumentsNumberError,
+    'InvalidArgumentTypeError': InvalidArgumentTypeError
+}
+
+CODE_CACHE = OrderedDict()  # generated source -> compiled code object, least recently used first
+CODE_CACHE_SIZE = 32  # sources kept; each version of the rates of --dates may fold a program to a new one
+TRANSPILED = weakref.WeakKeyDictionary()  # Program -> entry function, None when it cannot be transpiled
+
+
+def load_program(program):
+    if program in TRANSPILED:
+        return TRANSPILED[program]
+    try:
+        source = PythonTranspiler().transpile(program)
+    except NotTranspilableError:
+        TRANSPILED[program] = None
+        return None
+    code = CODE_CACHE.get(source)
+    if code is None:
+        code = CODE_CACHE[source] = compile(source, '<currencypl>', 'exec')
+        while len(CODE_CACHE) > CODE_CACHE_SIZE:
+            CODE_CACHE.pop(next(iter(CODE_CACHE), None), None)  # pop: programs may be loaded by several threads
+    else:
+        try:
+            CODE_CACHE.move_to_end(source)
+        except KeyError:  # dropped by another thread meanwhile
+            pass
+    namespace = dict(NAMESPACE)
+    exec(code, namespace)
+    TRANSPILED[program] = namespace['run']
+    return namespace['run']
+
+
+def statements_of(block):
+    for statement in block.statements:
+        yield statement
+        name = type(statement).__name__
+        if name == 'IfStatement':
+            yield from statements_of(statement.block1)
+            if statement.block2 is not None:
+                yield from statements_of(statement.block2)
+        elif name == 'WhileStatement':
+            yield from statements_of(statement.block)
+
+
+def declared_names(block):
+    return {statement.signature.id for statement in statements_of(block)
+            if type(statement).__name__ == 'InitStatement'}
+
+
+def contains_return(block):
+    return any(type(statement).__name__ == 'ReturnStatement' for statement in statements_of(block))
+
+
+def contains_loop_return(block):
+    return any(type(statement).__name__ == 'WhileStatement' and contains_return(statement.block)
+               for statement in statements_of(block))
+
+
+def is_temp(expression):
+    return expression[0] == 't' and expression[1:].isdigit()
+
+
+def is_literal(expression):
+    return expression[0] in '\'"-0123456789'
+
+
+class PythonTranspiler:  # generates one Python function per CurrencyPL function, with statically typed unboxed
+    # values: dec is a float, cur is a float and a currency id; operands are (type, expression[, currency id])
+    def __init__(self):
+        self.functions = {}
+        self.lines = []
+        self.indent = 0
+        self.temps = 0
+
+    def transpile(self, program):
+        mains = []
+        for function_def in program.function_defs:
+            self.functions[function_def.signature.id] = function_def
+            if function_def.signature.id == 'main':
+                mains.append(function_def)
+        if len(mains) > 1:
+            raise NotTranspilableError("more than one 'main' function")
+        output = []
+        for function_def in self.functions.values():
+            output.extend(self.transpile_function(function_def))
+        if mains:
+            output.extend(self.transpile_function(mains[0], entry=True))
+        else:
+            output.extend(['def run():', '    raise MainNotDeclaredError()'])
+        return '\n'.join(output) + '\n'
+
+    def transpile_function(self, function_def, entry=False):
+        name = function_def.signature.id
+        signatures = [] if entry else function_def.parameters.signatures
+        self.return_type = None if entry else TYPES[function_def.signature.type]
+        self.types = {}
+        for signature in signatures + [statement.signature for statement in statements_of(function_def.block)
+                                       if type(statement).__name__ == 'InitStatement']:
+            _type = TYPES.get(signature.type)
+            if _type not in (DEC, CUR) or self.types.get(signature.id, _type) != _type:
+                raise NotTranspilableError(f"variable '{signature.id}' has no single type in '{name}'")
+            self.types[signature.id] = _type
+        self.lines = []
+        self.indent = 1
+        self.temps = 0
+        self.declared = {signature.id for signature in signatures}  # definitely declared at this point
+        self.maybe_declared = set(self.declared)
+        self.checked = set()  # variables read or declared where they might not be, initialized to UNDECLARED
+        self.loop_depth = 0
+        self.may_return = False
+        self.terminated = False
+
+        parameter_names = [signature.id for signature in signatures]
+        if len(set(parameter_names)) != len(parameter_names):
+            duplicate = next(parameter for index, parameter in enumerate(parameter_names)
+                             if parameter in parameter_names[:index])
+            return [f'def f_{name}(*arguments):', f'    raise OverwriteError({duplicate!r})']
+        self.block(function_def.block)
+        if not self.terminated and self.return_type in (DEC, CUR):
+            self.raise_error(f'InvalidReturnedTypeError({TYPE_NAMES[self.return_type]}, NoneType)')
+
+        parameters = []
+        for signature in signatures:
+            parameters.append(f'v_{signature.id}')
+            if self.types[signature.id] == CUR:
+                parameters.append(f'c_{signature.id}')
+        header = 'def run():' if entry else f"def f_{name}({', '.join(parameters)}):"
+        prologue = []
+        if any('rates[' in line for line in self.lines):
+            prologue.append('    rates = Currencies.table().rows')
+        prologue.extend(f'    v_{variable} = UNDECLARED' for variable in sorted(self.checked - set(parameter_names)))
+        if contains_loop_return(function_def.block):
+            prologue.append('    rt = NoneType')
+        return [header] + prologue + (self.lines or ['    pass'])
+
+    def emit(self, line):
+        self.lines.append('    ' * self.indent + line)
+
+    def temp(self):
+        self.temps += 1
+        return f't{self.temps}'
+
+    def raise_error(self, error):
+        self.emit(f'raise {error}')
+        self.terminated = True
+
+    def own(self, operand):  # operand whose value may be changed in place
+        if is_temp(operand[1]):
+            return operand
+        value = self.temp()
+        self.emit(f'{value} = {operand[1]}')
+        return (operand[0], value) + operand[2:]
+
+    def exchange(self, operand, currency):
+        operand = self.own(operand)
+        static = is_literal(operand[2]) and is_literal(currency)
+        if static and operand[2] == currency:
+            return CUR, operand[1], currency
+        lines = [f'{operand[1]} *= rates[{operand[2]}][{currency}]']  # rows resolve missing pairs themselves
+        if not static:
+            self.emit(f'if {operand[2]} != {currency}:')
+            lines = ['    ' + line for line in lines]
+        for line in lines:
+            self.emit(line)
+        return CUR, operand[1], currency
+
+    def read(self, name):
+        if name not in self.types:
+            self.raise_error(f'UndeclaredError({name!r})')
+            return False
+        if name not in self.declared:
+            self.checked.add(name)
+            self.emit(f'if v_{name} is UNDECLARED:')
+            self.emit(f'    raise UndeclaredError({name!r})')
+            self.declared.add(name)
+        return True
+
+    # statements
+
+    def block(self, block):
+        for statement in block.statements:
+            if self.terminated:
+                return
+            if type(statement).__name__ == 'FunctionCall':
+                self.call(statement)
+            else:
+                getattr(self, 'statement_' + type(statement).__name__)(statement)
+            if self.may_return and not self.terminated:
+                self.emit('if rt is not NoneType:')
+                self.indent += 1
+                if self.loop_depth:
+                    self.emit('continue')
+                else:
+                    self.returned_epilogue()
+                self.indent -= 1
+
+    def nested_block(self, block):
+        start = len(self.lines)
+        self.indent += 1
+        self.block(block)
+        if len(self.lines) == start:
+            self.emit('pass')
+        self.indent -= 1
+
+    def statement_IfStatement(self, if_statement):
+        condition = self.condition(if_statement.condition)
+        declared, maybe_declared = self.declared, self.maybe_declared
+        self.emit(f'if {condition}:')
+        self.declared = set(declared)
+        self.nested_block(if_statement.block1)
+        branches = [] if self.terminated else [self.declared]
+        self.terminated = False
+        self.declared = set(declared)
+        if if_statement.block2 is not None:
+            self.emit('else:')
+            self.nested_block(if_statement.block2)
+        if not self.terminated:
+            branches.append(self.declared)
+        self.terminated = not branches
+        self.declared = set.intersection(*branches) if branches else declared
+
+    def statement_WhileStatement(self, while_statement):
+        declared = set(self.declared)
+        names = declared_names(while_statement.block)
+        self.maybe_declared |= names
+        header = len(self.lines)
+        self.emit('while True:')
+        self.indent += 1
+        condition = self.condition(while_statement.condition)
+        if len(self.lines) == header + 1:
+            self.lines[header] = '    ' * (self.indent - 1) + f'while {condition}:'
+        else:
+            self.emit(f'if not {condition}:')
+            self.emit('    break')
+        self.indent -= 1
+        self.loop_depth += 1
+        if contains_return(while_statement.block):
+            self.may_return = True  # a return only ends the current iteration of the loop body
+        self.nested_block(while_statement.block)
+        self.loop_depth -= 1
+        self.declared = declared
+        self.terminated = False
+
+    def statement_ReturnStatement(self, return_statement):
+        operand = self.expression(return_statement.expression)
+        if operand[0] == VOID or self.terminated:  # a void result does not end the function
+            return
+        if self.loop_depth:
+            if self.return_type is not None:
+                self.emit(f'rv_v = {operand[1]}')
+                if operand[0] == CUR:
+                    self.emit(f'rv_c = {operand[2]}')
+            self.emit(f'rt = {CLASS_NAMES[operand[0]]}')
+            self.emit('continue')
+        elif self.return_type is None:
+            self.emit('return')
+        elif self.return_type == operand[0]:
+            self.emit(f"return {', '.join(operand[1:])}")
+        else:
+            self.raise_error(f'InvalidReturnedTypeError({TYPE_NAMES[self.return_type]}, {CLASS_NAMES[operand[0]]})')
+        self.terminated = True
+
+    def returned_epilogue(self):
+        if self.return_type is None:
+            self.emit('return')
+        elif self.return_type == VOID:
+            self.emit(f'raise InvalidReturnedTypeError({TYPE_NAMES[VOID]}, rt)')
+        else:
+            self.emit(f'if rt is not {CLASS_NAMES[self.return_type]}:')
+            self.emit(f'    raise InvalidReturnedTypeError({TYPE_NAMES[self.return_type]}, rt)')
+            self.emit('return rv_v, rv_c' if self.return_type == CUR else 'return rv_v')
+
+    def declare(self, name):
+        if name in self.maybe_declared:
+            self.checked.add(name)
+            self.emit(f'if v_{name} is not UNDECLARED:')
+            self.emit(f'    raise OverwriteError({name!r})')
+        self.declared.add(name)
+        self.maybe_declared.add(name)
+
+    def statement_InitStatement(self, init_statement):
+        name = init_statement.signature.id
+        _type = self.types[name]
+        if init_statement.expression is None:
+            self.declare(name)
+            self.emit(f'v_{name} = None' if _type == DEC else f'v_{name}, c_{name} = None, 0')
+            return
+        operand = self.value(init_statement.expression)
+        if _type == DEC and operand[0] == CUR:
+            self.raise_error('CurrencyUsedForDecimalVariableError()')
+        elif _type == CUR and operand[0] == DEC:
+            self.raise_error(f'CurrencyNotDefinedError({name!r})')
+        else:
+            self.declare(name)
+            self.emit(f"v_{name}{', c_' + name if _type == CUR else ''} = {', '.join(operand[1:])}")
+
+    def statement_AssignStatement(self, assign_statement):
+        name = assign_statement.id
+        operand = self.value(assign_statement.expression)
+        if not self.read(name):
+            return
+        _type = self.types[name]
+        if _type == CUR and operand[0] == DEC:
+            self.emit(f'if c_{name} == 0:')
+            self.emit(f'    raise CurrencyNotDefinedOrChangeVariableTypeError({name!r})')
+            self.raise_error(f'ChangeVariableTypeError({name!r})')
+        elif _type == DEC and operand[0] == CUR:
+            self.raise_error(f'ChangeVariableTypeError({name!r})')
+        else:
+            self.emit(f"v_{name}{', c_' + name if _type == CUR else ''} = {', '.join(operand[1:])}")
+
+    def statement_PrintStatement(self, print_statement):
+        parts = []
+        for printable in print_statement.printables:
+            if isinstance(printable, str):
+                parts.append(repr(printable.replace('"', '')))
+            else:
+                parts.append(f'str({self.value(printable)[1]})')
+        self.emit(f"print(''.join(({', '.join(parts)},)))" if parts else "print('')")
+
+    # expressions
+
+    def expression(self, node):
+        return getattr(self, 'expression_' + type(node).__name__)(node)
+
+    def value(self, node):
+        operand = self.expression(node)
+        if operand[0] == VOID:
+            raise NotTranspilableError("result of a void function used as a value")
+        return operand
+
+    def call(self, function_call):
+        name = function_call.id
+        function_def = self.functions.get(name)
+        if function_def is None:
+            self.raise_error(f'UndeclaredError({name!r})')
+            return DEC, 'None'
+        arguments = [self.value(expression) for expression in function_call.arguments.expressions]
+        parameters = function_def.parameters.signatures
+        if len(arguments) != len(parameters):
+            self.raise_error(f'IncorrectArgumentsNumberError({name!r}, {len(parameters)}, {len(arguments)})')
+            return DEC, 'None'
+        for argument, parameter in zip(arguments, parameters):
+            if TYPES[parameter.type] != argument[0]:
+                self.raise_error(f'InvalidArgumentTypeError({name!r}, {parameter.id!r})')
+                return DEC, 'None'
+        call = f"f_{name}({', '.join(value for argument in arguments for value in argument[1:])})"
+        _type = TYPES[function_def.signature.type]
+        if _type == VOID:
+            self.emit(call)
+            return VOID,
+        value = self.temp()
+        if _type == DEC:
+            self.emit(f'{value} = {call}')
+            return DEC, value
+        currency = self.temp()
+        self.emit(f'{value}, {currency} = {call}')
+        return CUR, value, currency
+
+    def expression_Expression(self, expression):  # multiplExpr, { additiveOp, multiplExpr } ;
+        if not expression.additive_ops:
+            return self.expression(expression.multipl_exprs[0])
+        result = self.value(expression.multipl_exprs[0])
+        for additive_op, multipl_expr in zip(expression.additive_ops, expression.multipl_exprs[1:]):
+            operand = self.value(multipl_expr)
+            if operand[0] != result[0]:
+                self.raise_error('IllicitOperationError()')
+                return result
+            if operand[0] == CUR:
+                operand = self.exchange(operand, result[2])
+            result = self.own(result)
+            self.emit(f"{result[1]} {'+=' if additive_op == TokenTypes.PLUS else '-='} {operand[1]}")
+        return result
+
+    def expression_MultiplExpr(self, multipl_expr):  # primaryExpr, { multiplOp, primaryExpr } ;
+        if not multipl_expr.multipl_ops:
+            return self.expression(multipl_expr.primary_exprs[0])
+        result = self.value(multipl_expr.primary_exprs[0])
+        for multipl_op, primary_expr in zip(multipl_expr.multipl_ops, multipl_expr.primary_exprs[1:]):
+            operand = self.value(primary_expr)
+            if multipl_op == TokenTypes.MULTIPLY:
+                if operand[0] == DEC:
+                    result = self.own(result)
+                    self.emit(f'{result[1]} *= {operand[1]}')
+                    if result[0] == CUR:  # a currency result ends the chain, like in the interpreter
+                        return result
+                elif result[0] == CUR:
+                    self.raise_error('IllicitOperationError()')
+                    return result
+                else:
+                    operand = self.own(operand)
+                    self.emit(f'{operand[1]} *= {result[1]}')
+                    return operand
+            else:
+                if not is_literal(operand[1]):
+                    self.emit(f'if {operand[1]} == 0:')
+                    self.emit('    raise DivisionZeroError()')
+                elif float(operand[1]) == 0:
+                    self.raise_error('DivisionZeroError()')
+                    return result
+                if operand[0] == CUR:
+                    self.raise_error('IllicitOperationError()')
+                    return result
+                result = self.own(result)
+                self.emit(f'{result[1]} /= {operand[1]}')
+                if result[0] == CUR:
+                    return result
+        return result
+
+    def currency(self, currency, get_currency):
+        if currency is not None:
+            return str(RateTable.intern(currency))
+        return self.expression_GetCurrency(get_currency)
+
+    def expression_PrimaryExpr(self, primary_expr):  # [ “-” ], [currency | getCurrency], ( number | id |
+        # parenthExpr | functionCall ), [currency | getCurrency] ;
+        parts = [(currency, get_currency) for currency, get_currency in
+                 ((primary_expr.currency1, primary_expr.get_currency1),
+                  (primary_expr.currency2, primary_expr.get_currency2))
+                 if currency is not None or get_currency is not None]
+        if primary_expr.number is not None:
+            number = repr(-primary_expr.number if primary_expr.minus else primary_expr.number)
+            currencies = [self.currency(*part) for part in parts]
+            return (CUR, number, currencies[0]) if currencies else (DEC, number)
+        if primary_expr.id is not None:
+            name = primary_expr.id
+            if not self.read(name):
+                return DEC, 'None'
+            currencies = [self.currency(*part) for part in parts]
+            if self.types[name] == CUR:
+                result = (CUR, f'v_{name}', f'c_{name}')
+                for currency in currencies:
+                    result = self.exchange(result, currency)
+            elif len(currencies) > 1:
+                raise NotTranspilableError(f"conversion of decimal variable '{name}'")
+            else:
+                result = (DEC, f'v_{name}')
+        elif primary_expr.parenth_expr is not None:
+            currencies = [self.currency(*part) for part in parts]
+            result = self.value(primary_expr.parenth_expr.expression)
+            if currencies and result[0] == DEC:
+                raise NotTranspilableError("conversion of a decimal expression")
+            for currency in currencies:
+                result = self.exchange(result, currency)
+        else:
+            for part in parts:
+                self.currency(*part)
+            result = self.call(primary_expr.function_call)
+            if result[0] == VOID and primary_expr.minus:
+                raise NotTranspilableError("negation of a void function result")
+        if primary_expr.minus:
+            result = self.own(result)
+            self.emit(f'{result[1]} *= -1')
+        return result
+
+    def expression_ParenthExpr(self, parenth_expr):
+        return self.expression(parenth_expr.expression)
+
+    def expression_GetCurrency(self, get_currency):
+        name = get_currency.id
+        if not self.read(name):
+            return 'None'
+        if self.types[name] == DEC:
+            self.raise_error(f'GetCurrencyError({name!r})')
+            return 'None'
+        return f'c_{name}'
+
+    # conditions evaluate to ('bool', expression), ('value', operand) or ('not', operand) like the visitor's
+    # bool, variable and (True, variable) results
+
+    def condition(self, node):
+        return self.to_bool(self.expression(node))
+
+    @staticmethod
+    def to_bool(result):
+        return result[1] if result[0] == 'bool' else 'True'
+
+    def expression_Condition(self, condition):  # andCond, { orOp, andCond } ;
+        if len(condition.and_conds) == 1:
+            return self.expression(condition.and_conds[0])
+        result = self.temp()
+        declared = set(self.declared)
+        self.emit(f'{result} = {self.condition(condition.and_conds[0])}')
+        indent = self.indent
+        for and_cond in condition.and_conds[1:]:
+            self.emit(f'if not {result}:')
+            self.indent += 1
+            self.emit(f'{result} = {self.condition(and_cond)}')
+        self.indent = indent
+        self.declared = declared
+        return 'bool', result
+
+    def expression_AndCond(self, and_cond):  # equalityCond, { andOp, equalityCond } ;
+        if len(and_cond.equality_conds) == 1:
+            return 'bool', self.condition(and_cond.equality_conds[0])
+        results = []
+        for equality_cond in and_cond.equality_conds:  # all operands are evaluated
+            result = self.condition(equality_cond)
+            if result != 'True' and not is_temp(result):
+                temp = self.temp()
+                self.emit(f'{temp} = {result}')
+                result = temp
+            results.append(result)
+        return 'bool', f"({' and '.join(results)})"  # negated by a while or '!'
+
+    def expression_EqualityCond(self, equality_cond):  # relationalCond, [ equalOp, relationalCond ] ;
+        return self.comparison(equality_cond.relational_cond1, equality_cond.equal_op, equality_cond.relational_cond2)
+
+    def expression_RelationalCond(self, relational_cond):  # primaryCond, [ relationOp, primaryCond ];
+        return self.comparison(relational_cond.primary_cond1, relational_cond.relation_op,
+                               relational_cond.primary_cond2)
+
+    def comparison(self, first, operator, second):
+        result = self.expression(first)
+        if operator is None:
+            return result
+        if result[0] == 'bool':
+            raise NotTranspilableError("comparison of a condition")
+        negated = result[0] == 'not'
+        result1 = self.expression(first)[1]  # the visitor evaluates the first operand twice
+        result2 = self.expression(second)
+        if result2[0] != 'value':
+            raise NotTranspilableError("comparison with a condition")
+        result2 = result2[1]
+        if result1[0] == CUR and result2[0] == CUR:
+            result2 = self.exchange(result2, result1[2])
+        return 'bool', f'({result1[1]} {RELATIONS[operator][negated]} {result2[1]})'
+
+    def expression_PrimaryCond(self, primary_cond):  # [ unaryOp ], ( parenthCond | expression ) ;
+        if primary_cond.parenth_cond is not None:
+            result = self.condition(primary_cond.parenth_cond.condition)
+            return 'bool', f'(not {result})' if primary_cond.unary_op else result
+        operand = self.value(primary_cond.expression)
+        return ('not' if primary_cond.unary_op else 'value'), operand
+
+    def expression_ParenthCond(self, parenth_cond):
+        return self.expression(parenth_cond.condition)
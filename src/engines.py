@@ -0,0 +1,29 @@
+from .interpreter.interpreter import Interpreter
+from .interpreter.resolver import Resolver
+from .compiler.compiler import Compiler
+from .compiler.transpiler import load_program
+from .vm.vm import VirtualMachine, MAX_DEPTH
+from .optimizer.optimizer import Optimizer
+from .source.currencies import Currencies
+
+
+ENGINES = ['visitor', 'closure', 'vm', 'python']
+
+
+def run_program(program, engine="visitor", numeric=None, max_depth=MAX_DEPTH, memo=None, optimize=1):
+    Resolver().resolve(program)  # declaration errors are reported before any engine runs the program
+    previous = Currencies.pin(Currencies.pinned.snapshot or Currencies.current())  # one version of the rates per run
+    try:
+        program = Optimizer(optimize, numeric).optimize(program)
+        if engine == "vm":
+            VirtualMachine(Compiler(numeric).compile_program(program), max_depth).run()
+        elif engine == "python":
+            run = load_program(program) if numeric is None or numeric.name == 'float' else None
+            if run is None:  # types could not be proven statically, or values are not plain floats
+                Interpreter(None, mode="closure", numeric=numeric, memo=memo).interpret(program)
+            else:
+                run()
+        else:
+            Interpreter(None, mode=engine, numeric=numeric, memo=memo).interpret(program)
+    finally:
+        Currencies.pin(previous)
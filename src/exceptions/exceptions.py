@@ -144,3 +144,25 @@ class IllicitOperationError(Exception):
     def __init__(self):
         self.__message = "Illicit operation"
         super().__init__(self.__message)
+
+
+class NotTranspilableError(Exception):
+    def __init__(self, reason):
+        self.__reason = reason
+        self.__message = f"Program cannot be transpiled to Python: {self.__reason}"
+        super().__init__(self.__message)
+
+
+class InvalidRateFileError(Exception):
+    def __init__(self, path, reason):
+        self.__path = path
+        self.__reason = reason
+        self.__message = f"Invalid rate file {self.__path}: {self.__reason}"
+        super().__init__(self.__message)
+
+
+class CallDepthError(Exception):
+    def __init__(self, max_depth):
+        self.__max_depth = max_depth
+        self.__message = f"Maximum call depth ({self.__max_depth}) exceeded."
+        super().__init__(self.__message)
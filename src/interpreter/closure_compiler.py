@@ -0,0 +1,463 @@
+from .utils import *
+from .memo import MISSING
+from ..lexer.token_types import TokenTypes
+from ..source.rate_table import RateTable
+from ..exceptions.exceptions import CurrencyNotDefinedError, InvalidVariableTypeError, GetCurrencyError, \
+    DivisionZeroError, CurrencyUsedForDecimalVariableError, IllicitOperationError
+
+
+class ClosureCompiler:  # turns AST nodes into pre-bound Python closures that return their values directly
+    expression_visits = {
+        'Expression': 'visit_expression',
+        'MultiplExpr': 'visit_multipl_expr',
+        'PrimaryExpr': 'visit_primary_expr',
+        'ParenthExpr': 'visit_parenth_expr',
+        'FunctionCall': 'visit_function_call',
+        'GetCurrency': 'visit_get_currency',
+        'Condition': 'visit_condition',
+        'AndCond': 'visit_and_cond',
+        'EqualityCond': 'visit_equality_cond',
+        'RelationalCond': 'visit_relational_cond',
+        'PrimaryCond': 'visit_primary_cond',
+        'ParenthCond': 'visit_parenth_cond'
+    }
+    statement_visits = {
+        'Block': 'visit_block',
+        'IfStatement': 'visit_if_statement',
+        'WhileStatement': 'visit_while_statement',
+        'ReturnStatement': 'visit_return_statement',
+        'InitStatement': 'visit_init_statement',
+        'AssignStatement': 'visit_assign_statement',
+        'PrintStatement': 'visit_print_statement'
+    }
+
+    def __init__(self, interpreter):
+        self.interpreter = interpreter
+        self.scope_manager = interpreter.scope_manager
+        self.closures = {}
+
+    def install(self):
+        for visit_name in self.expression_visits.values():
+            setattr(self.interpreter, visit_name, self.run_expression)
+        for visit_name in self.statement_visits.values():
+            setattr(self.interpreter, visit_name, self.run_statement)
+
+    def run_expression(self, node):
+        self.scope_manager.last_result = self.compile(node)()
+
+    def run_statement(self, node):
+        self.compile(node)()
+
+    def compile(self, node):
+        closure = self.closures.get(node)
+        if closure is None:
+            closure = getattr(self, 'compile_' + type(node).__name__)(node)
+            self.closures[node] = closure
+        return closure
+
+    def compile_Block(self, block):
+        scope_manager = self.scope_manager
+        statements = [self.compile(statement) for statement in block.statements]
+
+        def run_block():
+            for statement in statements:
+                statement()
+                if scope_manager.return_result is not None:
+                    return
+        return run_block
+
+    def compile_IfStatement(self, if_statement):
+        condition = self.compile(if_statement.condition)
+        block1 = self.compile(if_statement.block1)
+        block2 = self.compile(if_statement.block2) if if_statement.block2 is not None else None
+
+        def run_if_statement():
+            if condition():
+                block1()
+            elif block2 is not None:
+                block2()
+        return run_if_statement
+
+    def compile_WhileStatement(self, while_statement):
+        condition = self.compile(while_statement.condition)
+        block = self.compile(while_statement.block)
+
+        def run_while_statement():
+            while condition():
+                block()
+        return run_while_statement
+
+    def compile_ReturnStatement(self, return_statement):
+        scope_manager = self.scope_manager
+        expression = self.compile(return_statement.expression)
+
+        def run_return_statement():
+            scope_manager.last_result = scope_manager.return_result = expression()
+        return run_return_statement
+
+    def compile_InitStatement(self, init_statement):
+        scope_manager = self.scope_manager
+        name = init_statement.signature.id
+        slot = init_statement.signature.slot
+        _type = init_statement.signature.type
+        expression = self.compile(init_statement.expression) if init_statement.expression is not None else None
+        if _type == TokenTypes.DECIMAL and expression is not None:
+            def run_init_statement():
+                value = expression()
+                if isinstance(value, CurrencyVariable):
+                    raise CurrencyUsedForDecimalVariableError()
+                scope_manager.add_variable(name, DecimalVariable(name, value.value), slot)
+        elif _type == TokenTypes.DECIMAL:
+            def run_init_statement():
+                scope_manager.add_variable(name, DecimalVariable(name), slot)
+        elif _type == TokenTypes.CURRENCY and expression is not None:
+            def run_init_statement():
+                value = expression()
+                if not isinstance(value, CurrencyVariable):
+                    raise CurrencyNotDefinedError(name)
+                scope_manager.add_variable(name, CurrencyVariable(name, value.value, currency_id=value.currency_id),
+                                           slot)
+        elif _type == TokenTypes.CURRENCY:
+            def run_init_statement():
+                scope_manager.add_variable(name, CurrencyVariable(name), slot)
+        else:
+            def run_init_statement():
+                raise InvalidVariableTypeError(name)
+        return run_init_statement
+
+    def compile_AssignStatement(self, assign_statement):
+        update_variable = self.scope_manager.update_variable
+        name = assign_statement.id
+        slot = assign_statement.slot
+        expression = self.compile(assign_statement.expression)
+
+        def run_assign_statement():
+            value = expression()
+            if value.name != name:
+                value = value.with_value(value.value, name)
+            update_variable(name, value, slot)
+        return run_assign_statement
+
+    def compile_PrintStatement(self, print_statement):
+        scope_manager = self.scope_manager
+        printables = []
+        for printable in print_statement.printables:
+            if isinstance(printable, str):
+                text = printable.replace('"', '')
+                printables.append(lambda text=text: text)
+            else:
+                expression = self.compile(printable)
+                printables.append(lambda expression=expression: str(expression().value))
+
+        def run_print_statement():
+            print_string = ''.join([printable() for printable in printables])
+            scope_manager.last_result = print_string  # only for testing
+            print(print_string)
+        return run_print_statement
+
+    def compile_FunctionCall(self, function_call):
+        scope_manager = self.scope_manager
+        get_function = scope_manager.get_function
+        compile_block = self.compile
+        memo = self.interpreter.memo
+        name = function_call.id
+        expressions = [self.compile(expression) for expression in function_call.arguments.expressions]
+        typed = function_call.typed
+
+        def run_function_call():
+            function = get_function(name)
+            arguments = [expression() for expression in expressions]
+            key = memo.key(function, arguments) if function.pure and memo.size else None
+            if key is not None:
+                result = memo.get(key)
+                if result is not MISSING:
+                    return result
+            if not typed:
+                check_arguments(function, arguments)
+            scope_manager.create_new_scope_and_switch(function)
+            for argument, parameter_signature in zip(arguments, function.parameters.signatures):
+                scope_manager.add_variable(parameter_signature.id, argument, parameter_signature.slot)
+            compile_block(function.block)()
+            result = scope_manager.return_result
+            check_returned_type(function, result)
+            scope_manager.switch_to_parent_context()
+            if key is not None:
+                memo.put(key, result)
+            return result
+        return run_function_call
+
+    def compile_Expression(self, expression):  # multiplExpr, { additiveOp, multiplExpr } ;
+        first = self.compile(expression.multipl_exprs[0])
+        if not expression.additive_ops:
+            return first
+        operations = [(additive_op == TokenTypes.PLUS, self.compile(multipl_expr))
+                      for additive_op, multipl_expr in zip(expression.additive_ops, expression.multipl_exprs[1:])]
+        if expression.type == TokenTypes.DECIMAL or expression.type == TokenTypes.CURRENCY and \
+                expression.currency is not None and all(multipl_expr.currency == expression.currency
+                                                        for multipl_expr in expression.multipl_exprs):
+            def run_expression():  # dec values or cur values in one currency, see type_inference
+                result = first()
+                for plus, operand in operations:
+                    if plus:
+                        result = result.with_value(result.value + operand().value)
+                    else:
+                        result = result.with_value(result.value - operand().value)
+                return result
+            return run_expression
+        if expression.type == TokenTypes.CURRENCY:
+            def run_expression():  # cur values, converted to the currency of the first one
+                result = first()
+                for plus, operand in operations:
+                    value = operand().exchanged(result.currency_id)
+                    if plus:
+                        result = result.with_value(result.value + value.value)
+                    else:
+                        result = result.with_value(result.value - value.value)
+                return result
+            return run_expression
+
+        def run_expression():
+            result = first()
+            value = result
+            for plus, operand in operations:
+                value = operand()
+                if isinstance(value, DecimalVariable):
+                    if isinstance(result, DecimalVariable):
+                        if plus:
+                            result = result.with_value(result.value + value.value)
+                        else:
+                            result = result.with_value(result.value - value.value)
+                        value = result
+                    elif isinstance(result, CurrencyVariable):
+                        raise IllicitOperationError()
+                elif isinstance(value, CurrencyVariable):
+                    if isinstance(result, CurrencyVariable):
+                        value = value.exchanged(result.currency_id)
+                        if plus:
+                            result = result.with_value(result.value + value.value)
+                        else:
+                            result = result.with_value(result.value - value.value)
+                        value = result
+                    elif isinstance(result, DecimalVariable):
+                        raise IllicitOperationError()
+            return value
+        return run_expression
+
+    def compile_MultiplExpr(self, multipl_expr):  # primaryExpr, { multiplOp, primaryExpr } ;
+        first = self.compile(multipl_expr.primary_exprs[0])
+        if not multipl_expr.multipl_ops:
+            return first
+        operations = [(multipl_op == TokenTypes.MULTIPLY, self.compile(primary_expr))
+                      for multipl_op, primary_expr in zip(multipl_expr.multipl_ops, multipl_expr.primary_exprs[1:])]
+        if multipl_expr.type == TokenTypes.DECIMAL:
+            def run_multipl_expr():  # dec values only, see type_inference
+                result = first()
+                value = result
+                for multiply, operand in operations:
+                    value = operand()
+                    if multiply:
+                        result = result.with_value(result.value * value.value)
+                    else:
+                        if value.value == 0:
+                            raise DivisionZeroError()
+                        result = result.with_value(result.value / value.value)
+                return value.with_value(result.value)
+            return run_multipl_expr
+
+        def run_multipl_expr():
+            result = first()
+            value = result
+            for multiply, operand in operations:
+                value = operand()
+                if multiply:
+                    if isinstance(value, DecimalVariable):
+                        result = result.with_value(result.value * value.value)
+                        if isinstance(result, CurrencyVariable):
+                            return result
+                    elif isinstance(value, CurrencyVariable):
+                        if isinstance(result, CurrencyVariable):
+                            raise IllicitOperationError()
+                        elif isinstance(result, DecimalVariable):
+                            return value.with_value(value.value * result.value)
+                else:
+                    if value.value == 0:
+                        raise DivisionZeroError()
+                    if isinstance(value, DecimalVariable):
+                        result = result.with_value(result.value / value.value)
+                        if isinstance(result, CurrencyVariable):
+                            return result
+                    elif isinstance(value, CurrencyVariable):
+                        raise IllicitOperationError()
+            return value.with_value(result.value)
+        return run_multipl_expr
+
+    def compile_PrimaryExpr(self, primary_expr):  # [ “-” ], [currency | getCurrency], ( number | id |
+        # parenthExpr | functionCall ), [currency | getCurrency] ;
+        get_variable = self.scope_manager.get_variable
+        minus = primary_expr.minus
+        conversions = []
+        for currency, get_currency in ((primary_expr.currency1, primary_expr.get_currency1),
+                                       (primary_expr.currency2, primary_expr.get_currency2)):
+            if currency is not None:
+                conversions.append(lambda currency_id=RateTable.intern(currency): currency_id)
+            elif get_currency is not None:
+                conversions.append(self.compile_currency_id(get_currency))
+
+        if primary_expr.number is not None:
+            number = -primary_expr.number if minus else primary_expr.number
+            if self.interpreter.numeric is not None:
+                number = self.interpreter.numeric.number(number)
+
+            if primary_expr.get_currency1 is None and primary_expr.get_currency2 is None:
+                constant = CurrencyVariable('', number, currency_id=conversions[0]()) if conversions \
+                    else DecimalVariable('', number)
+                return lambda: constant
+
+            def run_number():
+                currencies = [conversion() for conversion in conversions]
+                if currencies:
+                    return CurrencyVariable('', number, currency_id=currencies[0])
+                return DecimalVariable('', number)
+            return run_number
+
+        if primary_expr.id is not None:
+            name = primary_expr.id
+            slot = primary_expr.slot
+
+            def run_id():
+                value = get_variable(name, slot)
+                if isinstance(value, CurrencyVariable):
+                    currencies = [conversion() for conversion in conversions]
+                    for currency_id in currencies:
+                        value = value.exchanged(currency_id)
+                else:
+                    if len([conversion() for conversion in conversions]) > 1:  # the first one is skipped
+                        fail_decimal_conversion(value)
+                if minus:
+                    value = value.with_value(value.value * -1)
+                return value
+            return run_id
+
+        if primary_expr.parenth_expr is not None:
+            expression = self.compile(primary_expr.parenth_expr)
+
+            def run_parenth_expr():
+                currencies = [conversion() for conversion in conversions]
+                value = expression()
+                for currency_id in currencies:
+                    if isinstance(value, CurrencyVariable):
+                        value = value.exchanged(currency_id)
+                    else:
+                        fail_decimal_conversion(value)
+                if minus:
+                    negated = value.value * -1
+                    value = value.with_value(negated)
+                return value
+            return run_parenth_expr
+
+        function_call = self.compile(primary_expr.function_call)
+
+        def run_function_call():
+            for conversion in conversions:
+                conversion()
+            value = function_call()
+            if minus:
+                negated = value.value * -1
+                value = value.with_value(negated)
+            return value
+        return run_function_call
+
+    def compile_ParenthExpr(self, parenth_expr):
+        return self.compile(parenth_expr.expression)
+
+    def compile_GetCurrency(self, get_currency):
+        get_variable = self.scope_manager.get_variable
+        name = get_currency.id
+        slot = get_currency.slot
+
+        def run_get_currency():
+            variable = get_variable(name, slot)
+            if isinstance(variable, CurrencyVariable):
+                return variable.currency
+            raise GetCurrencyError(name)
+        return run_get_currency
+
+    def compile_currency_id(self, get_currency):
+        get_variable = self.scope_manager.get_variable
+        name = get_currency.id
+        slot = get_currency.slot
+
+        def run_get_currency_id():
+            variable = get_variable(name, slot)
+            if isinstance(variable, CurrencyVariable):
+                return variable.currency_id
+            raise GetCurrencyError(name)
+        return run_get_currency_id
+
+    def compile_Condition(self, condition):  # andCond, { orOp, andCond } ;
+        and_conds = [self.compile(and_cond) for and_cond in condition.and_conds]
+
+        def run_condition():
+            for and_cond in and_conds:
+                if and_cond():
+                    return True
+            return False
+        return run_condition
+
+    def compile_AndCond(self, and_cond):  # equalityCond, { andOp, equalityCond } ;
+        equality_conds = [self.compile(equality_cond) for equality_cond in and_cond.equality_conds]
+
+        def run_and_cond():
+            result = True
+            for equality_cond in equality_conds:
+                if not equality_cond():
+                    result = False
+            return result
+        return run_and_cond
+
+    def compile_EqualityCond(self, equality_cond):  # relationalCond, [ equalOp, relationalCond ] ;
+        first = self.compile(equality_cond.relational_cond1)
+        if equality_cond.equal_op is None:
+            return first
+        second = self.compile(equality_cond.relational_cond2)
+        equal = equality_cond.equal_op == TokenTypes.EQUAL
+        return self.compile_comparison(first, second, lambda a, b: (a == b) == equal)
+
+    def compile_RelationalCond(self, relational_cond):  # primaryCond, [ relationOp, primaryCond ];
+        first = self.compile(relational_cond.primary_cond1)
+        if relational_cond.relation_op is None:
+            return first
+        second = self.compile(relational_cond.primary_cond2)
+        compare = {
+            TokenTypes.GREATER_THAN: lambda a, b: a > b,
+            TokenTypes.LESS_THAN: lambda a, b: a < b,
+            TokenTypes.GREATER_OR_EQUAL: lambda a, b: a >= b,
+            TokenTypes.LESS_OR_EQUAL: lambda a, b: a <= b
+        }[relational_cond.relation_op]
+        return self.compile_comparison(first, second, compare)
+
+    @staticmethod
+    def compile_comparison(first, second, compare):
+        def run_comparison():
+            unary_op = isinstance(first(), tuple)  # the visitor evaluates the first operand twice
+            result1 = first()
+            if isinstance(result1, tuple):
+                result1 = result1[1]
+            result2 = second()
+            if isinstance(result1, CurrencyVariable) and isinstance(result2, CurrencyVariable):
+                result2 = result2.exchanged(result1.currency_id)
+            return compare(result1.value, result2.value) is not unary_op
+        return run_comparison
+
+    def compile_PrimaryCond(self, primary_cond):  # [ unaryOp ], ( parenthCond | expression ) ;
+        unary_op = primary_cond.unary_op
+        if primary_cond.parenth_cond is not None:
+            parenth_cond = self.compile(primary_cond.parenth_cond)
+            return lambda: bool(parenth_cond()) is not bool(unary_op)
+        expression = self.compile(primary_cond.expression)
+        if unary_op:
+            return lambda: (unary_op, expression())
+        return expression
+
+    def compile_ParenthCond(self, parenth_cond):
+        return self.compile(parenth_cond.condition)
@@ -1,19 +1,37 @@
-import copy
-from .scope import ScopeManager
+from .scope import ScopeManager, Scope
+from .resolver import Resolver
+from .memo import MemoCache, MISSING
+from .closure_compiler import ClosureCompiler
 from .utils import *
 from ..lexer.token_types import TokenTypes
+from ..source.currencies import Currencies
+from ..source.rate_table import RateTable
 from ..exceptions.exceptions import MainNotDeclaredError, CurrencyNotDefinedError, InvalidVariableTypeError, \
     GetCurrencyError, DivisionZeroError, CurrencyUsedForDecimalVariableError, IllicitOperationError
 
 
 class Interpreter:
-    def __init__(self, parser):
+    def __init__(self, parser, mode="visitor", numeric=None, memo=None):
         self.parser = parser
+        self.mode = mode
+        self.numeric = numeric  # backend turning number literals into values, None for plain floats
+        self.memo = memo if memo is not None else MemoCache()  # may be shared by runs of the same program
         self.scope_manager = ScopeManager()
+        self.constants = {}  # number literal -> its value, built once as values are never changed
+        if mode == "closure":
+            ClosureCompiler(self).install()
 
-    def interpret(self):
-        self.parser.parse_program()
-        self.parser.program.accept(self)
+    def interpret(self, program=None):
+        if program is None:
+            self.parser.parse_program()
+            program = self.parser.program
+        Resolver().resolve(program)
+        previous = Currencies.pin(Currencies.pinned.snapshot or Currencies.current())  # one version of the rates per run
+        self.memo.use_snapshot(Currencies.pinned.snapshot)
+        try:
+            program.accept(self)
+        finally:
+            Currencies.pin(previous)
 
     def visit_program(self, program):
         main_declared = False
@@ -23,6 +41,8 @@ class Interpreter:
                 main_declared = True
         if not main_declared:
             raise MainNotDeclaredError()
+        if program.main_slots is not None:
+            self.scope_manager.current_scope = Scope('main', slots=program.main_slots)
         for function_def in program.function_defs:
             if function_def.signature.id == "main":
                 function_def.block.accept(self)
@@ -40,7 +60,7 @@ class Interpreter:
         if_statement.condition.accept(self)
         if self.scope_manager.last_result:
             if_statement.block1.accept(self)
-        else:
+        elif if_statement.block2 is not None:
             if_statement.block2.accept(self)
 
     def visit_while_statement(self, while_statement):
@@ -62,9 +82,9 @@ class Interpreter:
                     raise CurrencyUsedForDecimalVariableError()
                 else:
                     variable = DecimalVariable(name, self.scope_manager.last_result.value)
-                    self.scope_manager.add_variable(name, variable)
+                    self.scope_manager.add_variable(name, variable, init_statement.signature.slot)
             else:
-                self.scope_manager.add_variable(name, DecimalVariable(name))
+                self.scope_manager.add_variable(name, DecimalVariable(name), init_statement.signature.slot)
         elif init_statement.signature.type == TokenTypes.CURRENCY:
             if init_statement.expression is not None:
                 init_statement.expression.accept(self)
@@ -72,17 +92,19 @@ class Interpreter:
                     raise CurrencyNotDefinedError(name)
                 variable = CurrencyVariable(name, self.scope_manager.last_result.value,
                                             self.scope_manager.last_result.currency)
-                self.scope_manager.add_variable(name, variable)
+                self.scope_manager.add_variable(name, variable, init_statement.signature.slot)
             else:
-                self.scope_manager.add_variable(name, CurrencyVariable(name))
+                self.scope_manager.add_variable(name, CurrencyVariable(name), init_statement.signature.slot)
         else:
             raise InvalidVariableTypeError(name)
 
     def visit_assign_statement(self, assign_statement):
         name = assign_statement.id
         assign_statement.expression.accept(self)
-        self.scope_manager.last_result.name = name
-        self.scope_manager.update_variable(name, self.scope_manager.last_result)
+        value = self.scope_manager.last_result
+        if value.name != name:
+            value = value.with_value(value.value, name)
+        self.scope_manager.update_variable(name, value, assign_statement.slot)
 
     def visit_print_statement(self, print_statement):
         print_string = ''
@@ -103,112 +125,147 @@ class Interpreter:
         for expression in function_call.arguments.expressions:
             expression.accept(self)
             arguments.append(self.scope_manager.last_result)
-        self.execute_function(function, arguments)
+        self.execute_function(function, arguments, function_call.typed)
 
     def visit_expression(self, expression):  # multiplExpr, { additiveOp, multiplExpr } ;
         expression.multipl_exprs[0].accept(self)
         result = self.scope_manager.last_result
+        if expression.type is not None and expression.additive_ops:  # operands of one type, see type_inference
+            cur = expression.type == TokenTypes.CURRENCY
+            for additive_op, multipl_expr in zip(expression.additive_ops, expression.multipl_exprs[1:]):
+                multipl_expr.accept(self)
+                operand = self.scope_manager.last_result
+                if cur:
+                    operand = operand.exchanged(result.currency_id)
+                if additive_op == TokenTypes.PLUS:
+                    result = result.with_value(result.value + operand.value)
+                else:
+                    result = result.with_value(result.value - operand.value)
+            self.scope_manager.last_result = result
+            return
         for additive_op, multipl_expr in zip(expression.additive_ops, expression.multipl_exprs[1:]):
             multipl_expr.accept(self)
-            if isinstance(self.scope_manager.last_result, DecimalVariable):
+            operand = self.scope_manager.last_result
+            if isinstance(operand, DecimalVariable):
                 if isinstance(result, DecimalVariable):
                     if additive_op == TokenTypes.PLUS:
-                        result.value += self.scope_manager.last_result.value
+                        result = result.with_value(result.value + operand.value)
                     elif additive_op == TokenTypes.MINUS:
-                        result.value -= self.scope_manager.last_result.value
+                        result = result.with_value(result.value - operand.value)
                     self.scope_manager.last_result = result
                 elif isinstance(result, CurrencyVariable):
                     raise IllicitOperationError()
-            elif isinstance(self.scope_manager.last_result, CurrencyVariable):
+            elif isinstance(operand, CurrencyVariable):
                 if isinstance(result, CurrencyVariable):
-                    self.scope_manager.last_result.exchange(result.currency)
+                    operand = operand.exchanged(result.currency_id)
                     if additive_op == TokenTypes.PLUS:
-                        result.value += self.scope_manager.last_result.value
+                        result = result.with_value(result.value + operand.value)
                     elif additive_op == TokenTypes.MINUS:
-                        result.value -= self.scope_manager.last_result.value
+                        result = result.with_value(result.value - operand.value)
                     self.scope_manager.last_result = result
                 elif isinstance(result, DecimalVariable):
                     raise IllicitOperationError()
 
     def visit_multipl_expr(self, multipl_expr):  # primaryExpr, { multiplOp, primaryExpr } ;
-        currency = None
         multipl_expr.primary_exprs[0].accept(self)
-        if isinstance(self.scope_manager.last_result, CurrencyVariable):
-            currency = self.scope_manager.last_result.currency
-        result = self.scope_manager.last_result
+        result = operand = self.scope_manager.last_result
+        if multipl_expr.type == TokenTypes.DECIMAL:  # only dec operands, see type_inference
+            for multipl_op, primary_expr in zip(multipl_expr.multipl_ops, multipl_expr.primary_exprs[1:]):
+                primary_expr.accept(self)
+                operand = self.scope_manager.last_result
+                if multipl_op == TokenTypes.MULTIPLY:
+                    result = result.with_value(result.value * operand.value)
+                else:
+                    if operand.value == 0:
+                        raise DivisionZeroError()
+                    result = result.with_value(result.value / operand.value)
+            if operand is not result:
+                result = operand.with_value(result.value)
+            self.scope_manager.last_result = result
+            return
         for multipl_op, primary_expr in zip(multipl_expr.multipl_ops, multipl_expr.primary_exprs[1:]):
             primary_expr.accept(self)
+            operand = self.scope_manager.last_result
             if multipl_op == TokenTypes.MULTIPLY:
-                if isinstance(self.scope_manager.last_result, DecimalVariable):
-                    result.value *= self.scope_manager.last_result.value
+                if isinstance(operand, DecimalVariable):
+                    result = result.with_value(result.value * operand.value)
                     if isinstance(result, CurrencyVariable):
                         self.scope_manager.last_result = result
                         return
-                elif isinstance(self.scope_manager.last_result, CurrencyVariable):
+                elif isinstance(operand, CurrencyVariable):
                     if isinstance(result, CurrencyVariable):
                         raise IllicitOperationError()
                     elif isinstance(result, DecimalVariable):
-                        self.scope_manager.last_result.value *= result.value
+                        self.scope_manager.last_result = operand.with_value(operand.value * result.value)
                         return
             elif multipl_op == TokenTypes.DIVIDE:
-                if self.scope_manager.last_result.value == 0:
+                if operand.value == 0:
                     raise DivisionZeroError()
-                if isinstance(self.scope_manager.last_result, DecimalVariable):
-                    result.value /= self.scope_manager.last_result.value
+                if isinstance(operand, DecimalVariable):
+                    result = result.with_value(result.value / operand.value)
                     if isinstance(result, CurrencyVariable):
                         self.scope_manager.last_result = result
                         return
-                elif isinstance(self.scope_manager.last_result, CurrencyVariable):
+                elif isinstance(operand, CurrencyVariable):
                     raise IllicitOperationError()
-        if currency is not None:
-            self.scope_manager.last_result.currency = currency
-        self.scope_manager.last_result.value = result.value
+        if operand is not result:  # the product of dec operations is named after the last operand
+            result = operand.with_value(result.value)
+        self.scope_manager.last_result = result
 
     def visit_primary_expr(self, primary_expr):  # [ “-” ], [currency | getCurrency], ( number | id |
         # parenthExpr | functionCall ), [currency | getCurrency] ;
-        currencies = self.check_primary_expr_currency(primary_expr)
-        minus = False
-        if primary_expr.minus:
-            minus = True
         if primary_expr.number is not None:
+            constant = self.constants.get(primary_expr)
+            if constant is None:
+                constant = self.number_constant(primary_expr, self.check_primary_expr_currency(primary_expr))
+                if primary_expr.get_currency1 is None and primary_expr.get_currency2 is None:
+                    self.constants[primary_expr] = constant
+            self.scope_manager.last_result = constant
+            return
+        variable = None
+        if primary_expr.id is not None:
+            variable = self.scope_manager.get_variable(primary_expr.id, primary_expr.slot)
+        currencies = self.check_primary_expr_currency(primary_expr, variable)
+        if primary_expr.id is not None:
+            value = variable
             if currencies:
-                if minus is False:
-                    self.scope_manager.last_result = CurrencyVariable('', primary_expr.number, currencies[0])
-                else:
-                    self.scope_manager.last_result = CurrencyVariable('', -primary_expr.number, currencies[0])
-            else:
-                if minus is False:
-                    self.scope_manager.last_result = DecimalVariable('', primary_expr.number)
-                else:
-                    self.scope_manager.last_result = DecimalVariable('', -primary_expr.number)
-        elif primary_expr.id is not None:
-            variable = self.scope_manager.get_variable(primary_expr.id)
-            var = copy.copy(variable)
-            if currencies:
-                for currency in currencies[1:]:  # first is variable own currency
-                    var.exchange(currency)
-            self.scope_manager.last_result = var
-            if minus is True:
-                self.scope_manager.last_result.value *= -1
+                value = self.exchanged(value, currencies[1:])  # first is variable own currency
         elif primary_expr.parenth_expr is not None:
             primary_expr.parenth_expr.accept(self)
-            if currencies:
-                for currency in currencies:
-                    self.scope_manager.last_result.exchange(currency)
-            if minus is True:
-                self.scope_manager.last_result.value *= -1
-        elif primary_expr.function_call is not None:
+            value = self.exchanged(self.scope_manager.last_result, currencies)
+        else:
             primary_expr.function_call.accept(self)
-            if minus is True:
-                self.scope_manager.last_result.value *= -1
+            value = self.scope_manager.last_result
+        if primary_expr.minus:
+            negated = value.value * -1
+            value = value.with_value(negated)
+        self.scope_manager.last_result = value
 
-    def check_primary_expr_currency(self, primary_expr):
+    def number_constant(self, primary_expr, currencies):
+        number = primary_expr.number
+        if self.numeric is not None:
+            number = self.numeric.number(number)
+        if primary_expr.minus:
+            number = -number
+        if currencies:
+            return CurrencyVariable('', number, currencies[0])
+        return DecimalVariable('', number)
+
+    @staticmethod
+    def exchanged(value, currencies):
+        for currency in currencies:
+            if not isinstance(value, CurrencyVariable):
+                fail_decimal_conversion(value)
+            value = value.exchanged(RateTable.intern(currency))
+        return value
+
+    def check_primary_expr_currency(self, primary_expr, variable=None):
         currencies = []
         if primary_expr is not None:
             if primary_expr.id is not None or primary_expr.parenth_expr is not None:
                 if primary_expr.id is not None:
-                    _id = primary_expr.id
-                    variable = self.scope_manager.get_variable(_id)
+                    if variable is None:
+                        variable = self.scope_manager.get_variable(primary_expr.id, primary_expr.slot)
                     if isinstance(variable, CurrencyVariable):
                         currencies.append(variable.currency)
             if primary_expr.currency1 is not None or primary_expr.get_currency1 is not None:
@@ -264,7 +321,7 @@ class Interpreter:
             equality_condition.relational_cond2.accept(self)
             result2 = self.scope_manager.last_result
             if isinstance(result1, CurrencyVariable) and isinstance(result2, CurrencyVariable):
-                result2.exchange(result1.currency)
+                result2 = result2.exchanged(result1.currency_id)
             if equality_condition.equal_op == TokenTypes.EQUAL:
                 if result1.value == result2.value and unary_op is False \
                         or result1.value != result2.value and unary_op is True:
@@ -297,7 +354,7 @@ class Interpreter:
             relational_cond.primary_cond2.accept(self)
             result2 = self.scope_manager.last_result
             if isinstance(result1, CurrencyVariable) and isinstance(result2, CurrencyVariable):
-                result2.exchange(result1.currency)
+                result2 = result2.exchanged(result1.currency_id)
             if relational_cond.relation_op == TokenTypes.GREATER_THAN:
                 if result1.value > result2.value and unary_op is False \
                         or result1.value <= result2.value and unary_op is True:
@@ -334,20 +391,29 @@ class Interpreter:
         parenth_cond.condition.accept(self)
 
     def visit_get_currency(self, get_currency):
-        variable = self.scope_manager.get_variable(get_currency.id)
+        variable = self.scope_manager.get_variable(get_currency.id, get_currency.slot)
         if isinstance(variable, CurrencyVariable):
             self.scope_manager.last_result = variable.currency
         else:
             raise GetCurrencyError(get_currency.id)
 
-    def execute_function(self, function, arguments):
-        check_arguments(function, arguments)
+    def execute_function(self, function, arguments, typed=False):  # typed: the arguments are known to match
+        key = self.memo.key(function, arguments) if function.pure and self.memo.size else None
+        if key is not None:
+            result = self.memo.get(key)
+            if result is not MISSING:
+                self.scope_manager.last_result = result
+                return
+        if not typed:
+            check_arguments(function, arguments)
         self.scope_manager.create_new_scope_and_switch(function)
         self.add_arguments_to_function_scope(function, arguments)
         function.block.accept(self)
         check_returned_type(function, self.scope_manager.return_result)
         self.scope_manager.switch_to_parent_context()
+        if key is not None:
+            self.memo.put(key, self.scope_manager.last_result)
 
     def add_arguments_to_function_scope(self, function, arguments):
         for argument, parameter_signature in zip(arguments, function.parameters.signatures):
-            self.scope_manager.add_variable(parameter_signature.id, argument)
+            self.scope_manager.add_variable(parameter_signature.id, argument, parameter_signature.slot)
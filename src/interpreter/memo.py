@@ -0,0 +1,48 @@
+from collections import OrderedDict
+from .variables import CurrencyVariable, DecimalVariable
+
+
+MISSING = object()
+
+
+class MemoCache:  # least recently used results of pure function calls, for one version of the rates
+    def __init__(self, size=1024):
+        self.size = size
+        self.results = OrderedDict()
+        self.version = None  # of the rate snapshot the results were computed with
+        self.hits = 0
+        self.misses = 0
+
+    def use_snapshot(self, snapshot):
+        version = snapshot.version if snapshot is not None else None
+        if version != self.version:
+            self.results.clear()
+            self.version = version
+
+    @staticmethod
+    def key(function, arguments):  # None when an argument is not a value, which the call reports as an error
+        key = [function]
+        for argument in arguments:
+            if isinstance(argument, CurrencyVariable):
+                currency_id = argument.currency_id
+            elif isinstance(argument, DecimalVariable):
+                currency_id = None
+            else:
+                return None
+            value = argument.value
+            key.append((type(value), value if value else str(value), currency_id))  # zeros by text: -0.0 prints
+        return tuple(key)
+
+    def get(self, key):
+        result = self.results.get(key, MISSING)
+        if result is MISSING:
+            self.misses += 1
+        else:
+            self.hits += 1
+            self.results.move_to_end(key)
+        return result
+
+    def put(self, key, result):
+        self.results[key] = result
+        if len(self.results) > self.size:
+            self.results.popitem(last=False)
@@ -0,0 +1,149 @@
+import decimal
+from decimal import Decimal
+
+
+def rounded_division(numerator, denominator):  # integer division rounding half to even, like round()
+    quotient, remainder = divmod(numerator, denominator)
+    doubled = 2 * remainder
+    if denominator < 0:
+        doubled, denominator = -doubled, -denominator
+    if doubled > denominator or (doubled == denominator and quotient % 2):
+        quotient += 1
+    return quotient
+
+
+class FixedValue(int):  # an amount as an integer number of minor units; scale is set by each fixed_type subclass
+    __slots__ = ()
+    scale = 100
+
+    def __add__(self, other):
+        return type(self)(int.__add__(self, other))
+
+    def __sub__(self, other):
+        return type(self)(int.__sub__(self, other))
+
+    def __neg__(self):
+        return type(self)(int.__neg__(self))
+
+    def __mul__(self, other):
+        if isinstance(other, FixedValue):
+            return type(self)(rounded_division(int(self) * int(other), self.scale))
+        if isinstance(other, float):  # an exchange rate, multiplied exactly before rounding
+            numerator, denominator = other.as_integer_ratio()
+            return type(self)(rounded_division(int(self) * numerator, denominator))
+        return type(self)(int.__mul__(self, other))
+
+    __rmul__ = __mul__
+
+    def __truediv__(self, other):
+        return type(self)(rounded_division(int(self) * self.scale, int(other)))
+
+    def __str__(self):
+        digits = len(str(self.scale)) - 1
+        whole, fraction = divmod(abs(int(self)), self.scale)
+        sign = '-' if self < 0 else ''
+        return f"{sign}{whole}.{fraction:0{digits}}" if digits else f"{sign}{whole}"
+
+    __repr__ = __str__
+
+
+FIXED_TYPES = {}
+
+
+def fixed_type(minor_units):
+    if minor_units < 0:  # the scale would not be a whole number of units
+        raise ValueError(f"minor units must not be negative: {minor_units}")
+    fixed = FIXED_TYPES.get(minor_units)
+    if fixed is None:
+        fixed = FIXED_TYPES[minor_units] = type(f'FixedValue{minor_units}', (FixedValue,),
+                                                {'__slots__': (), 'scale': 10 ** minor_units})
+    return fixed
+
+
+CONTEXT = decimal.Context(prec=28, rounding=decimal.ROUND_HALF_EVEN)
+RATES = {}  # float exchange rate -> Decimal with the same shortest representation
+
+
+def as_decimal(value):
+    if isinstance(value, float):
+        rate = RATES.get(value)
+        if rate is None:
+            rate = RATES[value] = Decimal(repr(value))
+        return rate
+    return value
+
+
+class DecimalValue(Decimal):  # Decimal computed in one shared context, accepting float exchange rates
+    __slots__ = ()
+
+    def __add__(self, other):
+        return DecimalValue(CONTEXT.add(self, other))
+
+    def __sub__(self, other):
+        return DecimalValue(CONTEXT.subtract(self, other))
+
+    def __neg__(self):
+        return DecimalValue(CONTEXT.minus(self))
+
+    def __mul__(self, other):
+        return DecimalValue(CONTEXT.multiply(self, as_decimal(other)))
+
+    __rmul__ = __mul__
+
+    def __truediv__(self, other):
+        return DecimalValue(CONTEXT.divide(self, other))
+
+    def __str__(self):  # fixed-point without trailing zeros, whole numbers with '.0' like floats
+        if not self.is_finite():
+            return Decimal.__str__(self)
+        text = format(CONTEXT.normalize(self), 'f')
+        return text if '.' in text else text + '.0'
+
+
+class FloatNumeric:  # the default: values are Python floats
+    name = 'float'
+
+    def number(self, value):
+        return value
+
+
+class FixedNumeric:
+    name = 'fixed'
+
+    def __init__(self, minor_units=2):
+        self.minor_units = minor_units
+        self.type = fixed_type(minor_units)
+        self.numbers = {}
+
+    def number(self, value):  # a float literal of the program, rounded to whole minor units
+        number = self.numbers.get(value)
+        if number is None:
+            scaled = Decimal(repr(value)).scaleb(self.minor_units)
+            number = self.numbers[value] = self.type(int(scaled.to_integral_value(decimal.ROUND_HALF_EVEN)))
+        return number
+
+
+class DecimalNumeric:
+    name = 'decimal'
+
+    def __init__(self):
+        self.numbers = {}
+
+    def number(self, value):
+        number = self.numbers.get(value)
+        if number is None:
+            number = self.numbers[value] = DecimalValue(repr(value))
+        return number
+
+
+NUMERICS = {
+    'float': FloatNumeric,
+    'fixed': FixedNumeric,
+    'decimal': DecimalNumeric
+}
+
+
+def numeric_backend(name, minor_units=2):
+    if name == 'fixed':
+        return FixedNumeric(minor_units)
+    return NUMERICS[name]()
@@ -0,0 +1,154 @@
+from .type_inference import TypeInference
+from ..exceptions.exceptions import UndeclaredError, OverwriteError
+
+
+def mark_pure_functions(program):  # pure: prints nothing and calls only pure functions, so its result can be reused
+    functions = {function_def.signature.id: function_def for function_def in program.function_defs}  # last one wins
+    pure = {name for name, function_def in functions.items() if not function_def.prints}
+    changed = True
+    while changed:  # drop the callers of impure or undefined functions until nothing changes
+        changed = False
+        for name in list(pure):
+            if not functions[name].calls <= pure:
+                pure.discard(name)
+                changed = True
+    for function_def in program.function_defs:
+        function_def.pure = function_def.signature.id in pure and functions[function_def.signature.id] is function_def
+
+
+class Resolver:  # gives every variable of a function a slot in its frame, reporting declaration errors before the run
+    def __init__(self):
+        self.slots = {}  # name -> slot in the frame of the function being resolved
+        self.declared = set()  # names declared earlier in the text of the function
+        self.dominating = set()  # names declared earlier in the current block or in the blocks around it
+        self.calls = set()  # names of the functions called by the function being resolved
+        self.prints = False
+
+    def resolve(self, program):
+        if program.main_slots is not None:  # already resolved
+            return program
+        main = ({}, set(), set())  # the 'main' functions run one after another in one scope
+        for function_def in program.function_defs:
+            if function_def.signature.id == 'main':
+                self.slots, self.declared, self.dominating = main
+            else:
+                self.slots, self.declared, self.dominating = {}, set(), set()
+                for signature in function_def.parameters.signatures:
+                    self.declare(signature)
+            self.calls, self.prints = set(), False
+            function_def.block.accept(self)
+            function_def.slots = self.slots
+            function_def.calls = self.calls
+            function_def.prints = self.prints
+        mark_pure_functions(program)
+        TypeInference(program).infer(program)
+        program.main_slots = main[0]
+        return program
+
+    def declare(self, signature):
+        name = signature.id
+        if name in self.dominating:  # the earlier declaration always runs first
+            raise OverwriteError(name)
+        self.dominating.add(name)
+        self.declared.add(name)
+        signature.slot = self.slots.setdefault(name, len(self.slots))
+
+    def use(self, name, node):
+        if name not in self.declared:
+            raise UndeclaredError(name)
+        node.slot = self.slots[name]
+
+    def nested(self, block):  # declarations in a block that may not run do not dominate the code after it
+        dominating = self.dominating
+        self.dominating = set(dominating)
+        block.accept(self)
+        self.dominating = dominating
+
+    def visit_block(self, block):
+        for statement in block.statements:
+            statement.accept(self)
+
+    def visit_if_statement(self, if_statement):
+        if_statement.condition.accept(self)
+        self.nested(if_statement.block1)
+        if if_statement.block2 is not None:
+            self.nested(if_statement.block2)
+
+    def visit_while_statement(self, while_statement):
+        while_statement.condition.accept(self)
+        self.nested(while_statement.block)
+
+    def visit_return_statement(self, return_statement):
+        return_statement.expression.accept(self)
+
+    def visit_init_statement(self, init_statement):
+        if init_statement.expression is not None:
+            init_statement.expression.accept(self)
+        self.declare(init_statement.signature)
+
+    def visit_assign_statement(self, assign_statement):
+        assign_statement.expression.accept(self)
+        self.use(assign_statement.id, assign_statement)
+
+    def visit_print_statement(self, print_statement):
+        self.prints = True
+        for printable in print_statement.printables:
+            if not isinstance(printable, str):
+                printable.accept(self)
+
+    def visit_function_call(self, function_call):
+        self.calls.add(function_call.id)
+        for expression in function_call.arguments.expressions:
+            expression.accept(self)
+
+    def visit_expression(self, expression):
+        for multipl_expr in expression.multipl_exprs:
+            multipl_expr.accept(self)
+
+    def visit_multipl_expr(self, multipl_expr):
+        for primary_expr in multipl_expr.primary_exprs:
+            primary_expr.accept(self)
+
+    def visit_primary_expr(self, primary_expr):
+        if primary_expr.id is not None:
+            self.use(primary_expr.id, primary_expr)
+        for get_currency in (primary_expr.get_currency1, primary_expr.get_currency2):
+            if get_currency is not None:
+                get_currency.accept(self)
+        if primary_expr.parenth_expr is not None:
+            primary_expr.parenth_expr.accept(self)
+        elif primary_expr.function_call is not None:
+            primary_expr.function_call.accept(self)
+
+    def visit_parenth_expr(self, parenth_expr):
+        parenth_expr.expression.accept(self)
+
+    def visit_get_currency(self, get_currency):
+        self.use(get_currency.id, get_currency)
+
+    def visit_condition(self, condition):
+        for and_cond in condition.and_conds:
+            and_cond.accept(self)
+
+    def visit_and_cond(self, and_cond):
+        for equality_cond in and_cond.equality_conds:
+            equality_cond.accept(self)
+
+    def visit_equality_cond(self, equality_cond):
+        equality_cond.relational_cond1.accept(self)
+        if equality_cond.relational_cond2 is not None:
+            equality_cond.relational_cond2.accept(self)
+
+    def visit_relational_cond(self, relational_cond):
+        relational_cond.primary_cond1.accept(self)
+        if relational_cond.primary_cond2 is not None:
+            relational_cond.primary_cond2.accept(self)
+
+    def visit_primary_cond(self, primary_cond):
+        if primary_cond.parenth_cond is not None:
+            primary_cond.parenth_cond.accept(self)
+        else:
+            primary_cond.expression.accept(self)
+
+    def visit_parenth_cond(self, parenth_cond):
+        parenth_cond.condition.accept(self)
@@ -4,23 +4,37 @@ from .variables import *
 from typing import Optional, Tuple
 
 
-class Scope:
-    def __init__(self, name: str, parent=None):
+class Scope:  # a frame of values indexed by slot; a slot holds None until its variable is declared
+    def __init__(self, name: str, parent=None, slots=None):
         self.name = name
         self.parent = parent
-        self.symbols = {}
+        self.slots = {} if slots is None else slots  # name -> slot, assigned by the resolver for a function
+        self.values = [None] * len(self.slots)
+
+    @property
+    def symbols(self):
+        return {name: self.values[slot] for name, slot in self.slots.items() if self.values[slot] is not None}
+
+    def slot(self, name):
+        slot = self.slots.get(name)
+        if slot is None:  # a name the resolver did not see, e.g. in a scope built by hand
+            slot = len(self.values)
+            self.slots = {**self.slots, name: slot}
+            self.values.append(None)
+        return slot
 
     def add_symbol(self, name, value):
-        self.symbols[name] = value
+        self.values[self.slot(name)] = value
 
     def get_symbol(self, name):
-        if name not in self.symbols.keys():
+        slot = self.slots.get(name)
+        if slot is None or self.values[slot] is None:
             raise UndeclaredError(name)
-        symbol = self.symbols[name]
-        return symbol
+        return self.values[slot]
 
     def copy_symbols_from(self, source):
-        self.symbols.update(source)
+        for name, value in source.items():
+            self.add_symbol(name, value)
 
 
 class ScopeManager:
@@ -30,24 +44,36 @@ class ScopeManager:
         self.last_result: Optional[CurrencyVariable, DecimalVariable, bool, str, Tuple, int, float] = None
         self.return_result: Optional[CurrencyVariable, DecimalVariable, bool, str, Tuple, int, float] = None
 
-    def add_variable(self, name, variable):
-        if name in self.current_scope.symbols.keys():
+    def add_variable(self, name, variable, slot=None):
+        values = self.current_scope.values
+        if slot is None:
+            slot = self.current_scope.slot(name)
+        if values[slot] is not None:
             raise OverwriteError(name)
-        self.current_scope.add_symbol(name, variable)
+        values[slot] = variable
 
-    def update_variable(self, name, variable):
-        if name not in self.current_scope.symbols.keys():
+    def update_variable(self, name, variable, slot=None):
+        values = self.current_scope.values
+        if slot is None:
+            slot = self.current_scope.slots.get(name)
+            if slot is None:
+                raise UndeclaredError(name)
+        current = values[slot]
+        if current is None:
             raise UndeclaredError(name)
-        if isinstance(self.current_scope.symbols[name], CurrencyVariable) \
-                and self.current_scope.symbols[name].currency is None \
-                and isinstance(variable, DecimalVariable):
+        if isinstance(current, CurrencyVariable) and current.currency is None and isinstance(variable, DecimalVariable):
             raise CurrencyNotDefinedOrChangeVariableTypeError(name)
-        if not isinstance(variable, type(self.current_scope.symbols[name])):
+        if not isinstance(variable, type(current)):
             raise ChangeVariableTypeError(name)
-        self.current_scope.symbols[name] = variable
+        values[slot] = variable
 
-    def get_variable(self, name):
-        return self.current_scope.get_symbol(name)
+    def get_variable(self, name, slot=None):
+        if slot is None:
+            return self.current_scope.get_symbol(name)
+        variable = self.current_scope.values[slot]
+        if variable is None:
+            raise UndeclaredError(name)
+        return variable
 
     def add_function(self, name, function):
         self.global_scope.add_symbol(name, function)
@@ -56,7 +82,7 @@ class ScopeManager:
         return self.global_scope.get_symbol(name)
 
     def create_new_scope_and_switch(self, function):
-        function_scope = Scope(function.signature.id, self.current_scope)
+        function_scope = Scope(function.signature.id, self.current_scope, function.slots)
         self.current_scope = function_scope
 
     def switch_to_parent_context(self):
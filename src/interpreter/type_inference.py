@@ -0,0 +1,154 @@
+from ..lexer.token_types import TokenTypes
+
+
+DEC, CUR = TokenTypes.DECIMAL, TokenTypes.CURRENCY
+UNSET = object()  # the currency of a cur variable before any value stored in it is known
+
+
+def nodes_of(node):  # the node and every node below it, in no particular order
+    pending = [node]
+    while pending:
+        node = pending.pop()
+        yield node
+        for value in vars(node).values():
+            if type(value) is list:
+                pending.extend(item for item in value if hasattr(item, 'accept'))
+            elif hasattr(value, 'accept'):
+                pending.append(value)
+
+
+def join(currency, other):
+    if currency is UNSET:
+        return other
+    if other is UNSET or other == currency:
+        return currency
+    return None
+
+
+class TypeInference:  # sets the type of the value of every expression, and its currency when every run agrees, so the
+    # engines can leave out the checks of the operands; an expression whose type is not proven keeps them
+    def __init__(self, program):
+        self.functions = {function_def.signature.id: function_def for function_def in program.function_defs}
+        self.types = {}  # name -> type of the variable, None for a name declared with both types
+        self.currencies = {}  # name -> currency of every value of the cur variable, None when they may differ
+        self.inferred = {}  # id of a node -> its (type, currency) with the current currencies of the variables
+        self.annotating = False
+
+    def infer(self, program):
+        for function_def in program.function_defs:
+            if function_def.signature.id != 'main':
+                self.infer_scope([function_def])
+        self.infer_scope([function_def for function_def in program.function_defs
+                          if function_def.signature.id == 'main'])  # the 'main' functions run in one scope
+
+    def infer_scope(self, function_defs):
+        self.types, self.currencies = {}, {}
+        stores = []  # (name, expression) of every declaration and assignment, None for an empty declaration
+        for function_def in function_defs:
+            for signature in function_def.parameters.signatures:
+                self.declare(signature)
+                self.currencies[signature.id] = None  # any currency the callers pass
+            for node in nodes_of(function_def.block):
+                if type(node).__name__ == 'InitStatement':
+                    self.declare(node.signature)
+                    stores.append((node.signature.id, node.expression))
+                elif type(node).__name__ == 'AssignStatement':
+                    stores.append((node.id, node.expression))
+        for name, _type in self.types.items():
+            if _type == CUR:
+                self.currencies.setdefault(name, UNSET)
+        while True:  # the currencies only move from UNSET to one currency to None, so this ends
+            changed = True
+            while changed:
+                changed = False
+                self.inferred = {}
+                for name, expression in stores:
+                    if self.types.get(name) != CUR:
+                        continue
+                    _type, currency = self.infer_node(expression) if expression is not None else (CUR, None)
+                    if _type == DEC:  # storing a dec in a cur variable fails
+                        continue
+                    currency = join(self.currencies[name], currency if _type == CUR else None)
+                    if currency != self.currencies[name]:
+                        self.currencies[name] = currency
+                        changed = True
+            unset = [name for name, currency in self.currencies.items() if currency is UNSET]
+            if not unset:
+                break
+            for name in unset:  # only stored from each other, the values are of no known currency
+                self.currencies[name] = None
+        self.inferred = {}
+        self.annotating = True
+        for function_def in function_defs:
+            for node in nodes_of(function_def.block):
+                if type(node).__name__ == 'Expression':
+                    self.infer_node(node)
+                elif type(node).__name__ == 'FunctionCall':
+                    self.infer_call(node)
+        self.annotating = False
+
+    def declare(self, signature):
+        _type = signature.type if signature.type in (DEC, CUR) else None
+        self.types[signature.id] = _type if self.types.get(signature.id, _type) == _type else None
+
+    def infer_node(self, node):  # (type, currency) of the values of an expression, (None, None) when not proven
+        result = self.inferred.get(id(node))
+        if result is None:
+            result = self.inferred[id(node)] = getattr(self, 'infer_' + type(node).__name__)(node)
+            if self.annotating:
+                node.type, node.currency = result
+        return result
+
+    def infer_call(self, function_call):
+        function_def = self.functions.get(function_call.id)
+        if function_def is None:
+            return
+        signatures = function_def.parameters.signatures
+        expressions = function_call.arguments.expressions
+        function_call.typed = len(signatures) == len(expressions) \
+            and all(signature.type in (DEC, CUR) and self.infer_node(expression)[0] == signature.type
+                    for signature, expression in zip(signatures, expressions))
+
+    def infer_Expression(self, expression):  # multiplExpr, { additiveOp, multiplExpr } ;
+        results = [self.infer_node(multipl_expr) for multipl_expr in expression.multipl_exprs]
+        _type, currency = results[0]
+        if any(operand_type != _type for operand_type, _ in results[1:]):  # adding a dec and a cur fails
+            return None, None
+        return _type, currency  # added values are converted to the currency of the first one
+
+    def infer_MultiplExpr(self, multipl_expr):  # primaryExpr, { multiplOp, primaryExpr } ;
+        results = [self.infer_node(primary_expr) for primary_expr in multipl_expr.primary_exprs]
+        _type, currency = results[0]
+        for multipl_op, (operand_type, operand_currency) in zip(multipl_expr.multipl_ops, results[1:]):
+            if _type is None or operand_type is None \
+                    or operand_type == CUR and (_type == CUR or multipl_op == TokenTypes.DIVIDE):
+                return None, None
+            if operand_type == CUR:  # a cur product ends the chain
+                return CUR, operand_currency
+            if _type == CUR:
+                return CUR, currency
+        return _type, currency
+
+    def infer_PrimaryExpr(self, primary_expr):  # [ “-” ], [currency | getCurrency], ( number | id |
+        # parenthExpr | functionCall ), [currency | getCurrency] ;
+        currencies = [currency for currency, get_currency in ((primary_expr.currency1, primary_expr.get_currency1),
+                                                              (primary_expr.currency2, primary_expr.get_currency2))
+                      if currency is not None or get_currency is not None]  # None for a currency read at run time
+        if primary_expr.number is not None:
+            return (CUR, currencies[0]) if currencies else (DEC, None)
+        if primary_expr.id is not None:
+            _type = self.types.get(primary_expr.id)
+            if _type == DEC:  # the first conversion of a dec variable is skipped, a second one fails
+                return (DEC, None) if len(currencies) < 2 else (None, None)
+            if _type == CUR:
+                return CUR, currencies[-1] if currencies else self.currencies[primary_expr.id]
+            return None, None
+        if primary_expr.parenth_expr is not None:
+            _type, currency = self.infer_node(primary_expr.parenth_expr.expression)
+            if not currencies:
+                return _type, currency
+            return (CUR, currencies[-1]) if _type == CUR else (None, None)  # converting a dec fails
+        function_def = self.functions.get(primary_expr.function_call.id)
+        if function_def is not None and function_def.signature.type in (DEC, CUR):  # checked when it returns
+            return function_def.signature.type, None
+        return None, None
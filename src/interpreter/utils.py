@@ -10,6 +10,11 @@ def check_returned_type(function, function_result):
         raise InvalidReturnedTypeError(function.signature.type, type(function_result))
 
 
+def fail_decimal_conversion(value):  # a dec value has no currency to convert; every engine raises what the
+    # visitor raised when it called the missing exchange method of the value
+    raise AttributeError(f"'{type(value).__name__}' object has no attribute 'exchange'")
+
+
 def check_arguments(function, arguments):
     check_arguments_number(function, arguments)
     check_arguments_types(function, arguments)
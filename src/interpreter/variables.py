@@ -1,23 +1,58 @@
 from typing import Union
 from ..source.currencies import Currencies
+from ..source.rate_table import RateTable
 
 
-class CurrencyVariable:
-    def __init__(self, name: str, value: Union[int, float] = None, currency: str = None):
+class CurrencyVariable:  # the visitor and closure engines never change a value once built, so reads share it
+    __slots__ = ('name', 'value', 'currency_id')
+
+    def __init__(self, name: str, value: Union[int, float] = None, currency: str = None, currency_id: int = None):
         self.name = name
         self.value = value  # amount without currency
-        self.currency = currency
+        if currency_id is None:
+            currency_id = RateTable.ids.get(currency)
+            if currency_id is None:
+                currency_id = RateTable.intern(currency)
+        self.currency_id = currency_id
+
+    @property
+    def currency(self):
+        return RateTable.codes[self.currency_id]
+
+    @currency.setter
+    def currency(self, currency: str):
+        self.currency_id = RateTable.intern(currency)
 
     def exchange(self, new_currency: str):
-        if self.currency == new_currency:
+        self.exchange_id(RateTable.intern(new_currency))
+
+    def exchange_id(self, new_currency_id: int):
+        if self.currency_id == new_currency_id:
             return
-        rate = Currencies.currencies[self.currency][new_currency]
-        self.value *= rate
-        self.currency = new_currency
+        self.value *= self.rate(new_currency_id)
+        self.currency_id = new_currency_id
+
+    def exchanged(self, new_currency_id: int):  # the value in another currency, as a new variable
+        if self.currency_id == new_currency_id:
+            return self
+        return CurrencyVariable(self.name, self.value * self.rate(new_currency_id), currency_id=new_currency_id)
+
+    def rate(self, new_currency_id: int):
+        table = Currencies.pinned.table
+        if table is None or table.size != len(RateTable.codes):
+            table = Currencies.table()
+        return table.rows[self.currency_id][new_currency_id]
+
+    def with_value(self, value, name=None):
+        return CurrencyVariable(self.name if name is None else name, value, currency_id=self.currency_id)
 
 
 class DecimalVariable:
+    __slots__ = ('name', 'value')
+
     def __init__(self, name: str, value: Union[int, float] = None):
         self.name = name
         self.value = value
 
+    def with_value(self, value, name=None):
+        return DecimalVariable(self.name if name is None else name, value)
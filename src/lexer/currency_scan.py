@@ -0,0 +1,31 @@
+from .fast_tokenizer import TOKEN_PATTERN
+
+
+def referenced_currencies(text, currencies):  # codes named in the program outside strings and comments
+    return referenced_currencies_in_chunks([text], currencies)
+
+
+def referenced_currencies_in_file(file, currencies, chunk_size=1 << 16):  # without reading the whole program at once
+    return referenced_currencies_in_chunks(iter(lambda: file.read(chunk_size), ''), currencies)
+
+
+def referenced_currencies_in_chunks(chunks, currencies):
+    # a value only ever gets a currency from a literal, so these are also all that get_currency can return
+    referenced = set()
+    text = ''
+    chunks = iter(chunks)
+    chunk = next(chunks, '')
+    while chunk:
+        text += chunk
+        chunk = next(chunks, '')
+        position = 0
+        length = len(text)
+        while position < length:
+            match = TOKEN_PATTERN.match(text, position)
+            if match.end() == length and chunk:  # the token may go on in the next chunk
+                break
+            if match.lastgroup == 'word' and match.group('word') in currencies:
+                referenced.add(match.group('word'))
+            position = max(match.end(), position + 1)  # characters the lexer would reject are skipped here
+        text = text[position:]
+    return referenced
@@ -0,0 +1,119 @@
+import re
+from .token import Token
+from .tokens import Tokens
+from .token_types import TokenTypes
+from ..exceptions.exceptions import InvalidTokenError, TokenTooLongError, StringTooLongError
+
+
+TOKEN_PATTERN = re.compile(r'''
+    [\t\n\x0b\x0c\r\x1c-\x1f ]*
+    (?:
+        (?P<comment>\#[^\n]*)
+        | (?P<word>[A-Za-z][A-Za-z0-9_]*)
+        | (?P<number>(?:[1-9][0-9]*|0)(?:\.[0-9]*)?)
+        | (?P<string>"[^"]*"?)
+        | (?P<operator>==|!=|>=|<=|[(){}+\-*/=><,;.!&|])
+    )?
+''', re.VERBOSE)
+
+
+class FastTokenizer:
+    def __init__(self, text, fallback, token_max_length=50, string_max_length=1000):
+        self.text = text
+        self.fallback = fallback  # builds one token with the reference lexer: position -> (token, next position)
+        self.token_max_length = token_max_length
+        self.string_max_length = string_max_length
+        self.operators = dict(Tokens.single_operators, **Tokens.double_operators)
+
+    def tokens(self):
+        text = self.text
+        length = len(text)
+        match_token = TOKEN_PATTERN.match
+        operators = self.operators
+        position = 0
+        line = 1
+        line_start = -1
+        comment_position = None  # the reference lexer reports a token after a comment at the comment's position
+        while True:
+            match = match_token(text, position)
+            kind = match.lastgroup
+            start = match.start(kind) if kind else match.end()
+            end = match.end()
+            if start != position:
+                newlines = text.count('\n', position, start)
+                if newlines:
+                    line += newlines
+                    line_start = text.rfind('\n', position, start)
+                position = start
+            if comment_position is None:
+                token_position = (line, position - line_start)
+            else:
+                token_position = comment_position
+            if kind == 'operator':
+                yield Token(operators[match.group(kind)], *token_position)
+            elif kind == 'word' and (end >= length or text[end].isascii()):
+                yield self.build_word(match.group(kind), token_position)
+            elif kind == 'comment':
+                comment_position = token_position
+                position = end
+                continue
+            elif position >= length:
+                yield Token(TokenTypes.EOT, *token_position)
+                return
+            elif kind is None and text[position].isascii():
+                raise InvalidTokenError(line, position - line_start + 1)
+            elif kind == 'number' and (end >= length or text[end].isascii()):
+                yield self.build_number(match.group(kind), position, token_position)
+            elif kind == 'string':
+                yield self.build_string(match.group(kind), position, token_position)
+                newlines = text.count('\n', position, end)
+                if newlines:
+                    line += newlines
+                    line_start = text.rfind('\n', position, end)
+            else:
+                try:
+                    token, end = self.fallback(position)
+                except TokenTooLongError:
+                    if comment_position is None or not text[position].isalpha():
+                        raise
+                    raise TokenTooLongError(*comment_position) from None  # a word reports the token position
+                if comment_position is not None:
+                    token.line, token.column = comment_position
+                yield token
+                if token.type == TokenTypes.EOT:
+                    return
+                newlines = text.count('\n', position, end)
+                if newlines:
+                    line += newlines
+                    line_start = text.rfind('\n', position, end)
+            comment_position = None
+            position = end
+
+    def build_word(self, word, token_position):
+        if len(word) > self.token_max_length:
+            raise TokenTooLongError(*token_position)
+        token_type = Tokens.keywords.get(word)
+        if token_type is None:
+            return Token(TokenTypes.IDENTIFIER, *token_position, word)
+        if token_type == TokenTypes.CURRENCY_TYPE:
+            return Token(token_type, *token_position, word)
+        return Token(token_type, *token_position)
+
+    def build_number(self, number, position, token_position):
+        if len(number) > self.token_max_length:
+            for index in range(self.token_max_length, len(number)):
+                if number[index] != '.':
+                    raise TokenTooLongError(*self.source_position(position + index))
+        return Token(TokenTypes.NUMBER, *token_position, number)
+
+    def build_string(self, string, position, token_position):
+        closed = len(string) > 1 and string[-1] == '"'
+        if not closed or len(string) - 2 >= self.string_max_length:
+            raise StringTooLongError(*self.source_position(position + self.string_max_length))
+        return Token(TokenTypes.STRING, *token_position, string)
+
+    def source_position(self, index):  # line and column of a source that has just read the character at index
+        end = min(index, len(self.text))
+        if index < len(self.text) and self.text[index] == '\n':
+            return self.text.count('\n', 0, end) + 2, 1
+        return self.text.count('\n', 0, end) + 1, index - self.text.rfind('\n', 0, end) + 1
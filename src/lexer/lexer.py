@@ -1,15 +1,26 @@
+import io
 from .token import Token
 from .tokens import Tokens
 from .token_types import TokenTypes
+from .fast_tokenizer import FastTokenizer
+from ..source.source import BufferedSource
 from ..exceptions.exceptions import *
 
 
 class Lexer:
-    def __init__(self, source, currencies=None):
+    def __init__(self, source, currencies=None, engine="reference"):
         self.__source = source
         self.__currencies = currencies
-        self.__source.move_carr_one_pos()
-        self.__char = self.__source.character
+        self.__engine = engine
+        self.__fast_tokens = None
+        self.__fast_text = None
+        self.__fallback_source = None
+        if engine == "fast":
+            self.__fast_text = self.__source.read_remaining()
+            self.__fast_tokens = FastTokenizer(self.__fast_text, self.build_fallback_token).tokens()
+        else:
+            self.__source.move_carr_one_pos()
+            self.__char = self.__source.character
         self.token = None
         self.line = None
         self.column = None
@@ -17,11 +28,26 @@ class Lexer:
         self.__STRING_MAX_LENGTH = 1000
 
     def get_next_token(self):
+        if self.__fast_tokens is not None:
+            self.token = next(self.__fast_tokens, self.token)
+            self.line = self.token.line
+            self.column = self.token.column
+            return
         self.skip_spaces()
         self.line = self.__source.line
         self.column = self.__source.column - 1
         self.build_token()
 
+    def tokens(self):
+        if self.__fast_tokens is not None:
+            yield from self.__fast_tokens
+            return
+        while True:
+            self.get_next_token()
+            yield self.token
+            if self.token.type == TokenTypes.EOT:
+                return
+
     def build_token(self):
         if self.is_eof():
             self.token = Token(TokenTypes.EOT, self.line, self.column)
@@ -65,7 +91,6 @@ class Lexer:
     def build_number(self):
         number = self.read_number()
         self.token = Token(TokenTypes.NUMBER, self.line, self.column, number)
-        self.token.set_numerical_value()
 
     def read_number(self):
         chars = []
@@ -120,19 +145,12 @@ class Lexer:
         return False
 
     def try_to_build_double_operator(self):
-        for double_operator in Tokens.double_operators.keys():
-            if self.__char == double_operator[0]:
-                position = self.__source.source_stream.tell()
-                self.__source.move_carr_one_pos()
-                second_char = self.__source.character
-                if second_char == double_operator[1]:
-                    operator = double_operator
-                    self.__char = second_char
-                    self.token = Token(Tokens.double_operators[operator], self.line, self.column)
-                    self.get_next_char()
-                    return True
-                else:
-                    self.__source.source_stream.seek(position)
+        operator = self.__char + self.__source.peek()
+        if operator in Tokens.double_operators:
+            self.get_next_char()
+            self.token = Token(Tokens.double_operators[operator], self.line, self.column)
+            self.get_next_char()
+            return True
         return False
 
     def skip_spaces(self):
@@ -149,3 +167,11 @@ class Lexer:
 
     def is_eof(self):
         return self.__char == ''
+
+    def build_fallback_token(self, position):  # tokens the fast engine cannot classify (non-ASCII input)
+        if self.__fallback_source is None:
+            self.__fallback_source = BufferedSource(io.StringIO(self.__fast_text))
+        self.__fallback_source.seek(position)
+        lexer = Lexer(self.__fallback_source)
+        lexer.get_next_token()
+        return lexer.token, self.__fallback_source.position
@@ -0,0 +1,52 @@
+from array import array
+from .token import Token
+from .token_types import TokenTypes
+
+
+TOKEN_TYPES = {token_type.value: token_type for token_type in TokenTypes}
+
+
+class TokenArray:  # struct of arrays: one int column per token field, values interned in a shared table
+    def __init__(self):
+        self.types = array('i')
+        self.lines = array('i')
+        self.columns = array('i')
+        self.values = array('i')  # index into value_table, -1 for tokens without a value
+        self.value_table = []
+        self.__value_ids = {}
+
+    @classmethod
+    def from_tokens(cls, tokens):
+        token_array = cls()
+        for token in tokens:
+            token_array.append(token)
+        return token_array
+
+    def append(self, token):
+        self.types.append(token.type.value)
+        self.lines.append(token.line)
+        self.columns.append(token.column)
+        if token.value is None:
+            self.values.append(-1)
+        else:
+            value_id = self.__value_ids.get(token.value)
+            if value_id is None:
+                value_id = len(self.value_table)
+                self.value_table.append(token.value)
+                self.__value_ids[token.value] = value_id
+            self.values.append(value_id)
+
+    def __len__(self):
+        return len(self.types)
+
+    def __getitem__(self, index):
+        value_id = self.values[index]
+        value = self.value_table[value_id] if value_id >= 0 else None
+        return Token(TOKEN_TYPES[self.types[index]], self.lines[index], self.columns[index], value)
+
+    def __iter__(self):
+        for index in range(len(self.types)):
+            yield self[index]
+
+    def tokens(self):
+        return iter(self)
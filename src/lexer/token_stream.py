@@ -0,0 +1,38 @@
+class TokenStream:
+    def __init__(self, tokens, capacity=8):
+        self.__tokens = iter(tokens)
+        self.__buffer = [None] * capacity  # ring buffer of tokens read ahead of the current one
+        self.__capacity = capacity
+        self.__head = 0
+        self.__size = 0
+        self.token = None
+        self.advance()
+
+    @property
+    def line(self):
+        return self.token.line
+
+    @property
+    def column(self):
+        return self.token.column
+
+    def advance(self):
+        if self.__size:
+            self.token = self.__buffer[self.__head]
+            self.__buffer[self.__head] = None
+            self.__head = (self.__head + 1) % self.__capacity
+            self.__size -= 1
+        else:
+            self.token = next(self.__tokens, self.token)
+        return self.token
+
+    def peek(self, k=1):
+        if k == 0:
+            return self.token
+        if k > self.__capacity:
+            raise ValueError(f"Cannot look ahead more than {self.__capacity} tokens")
+        while self.__size < k:
+            last = self.__buffer[(self.__head + self.__size - 1) % self.__capacity] if self.__size else self.token
+            self.__buffer[(self.__head + self.__size) % self.__capacity] = next(self.__tokens, last)
+            self.__size += 1
+        return self.__buffer[(self.__head + k - 1) % self.__capacity]
@@ -0,0 +1,102 @@
+from .nodes import rebuilt, walk
+from ..parser.grammar import FunctionCall, GetCurrency, PrimaryExpr, IfStatement, WhileStatement, ReturnStatement
+from ..interpreter.interpreter import Interpreter
+from ..lexer.token_types import TokenTypes
+
+
+class DeadCodeEliminator:  # drops the statements and functions no run can reach
+    def __init__(self, program, numeric=None):
+        self.functions = {function_def.signature.id: function_def for function_def in program.function_defs}
+        self.interpreter = Interpreter(None, numeric=numeric)  # evaluates the conditions made of literals
+        self.uses_rates = False  # whether a pruned branch depends on the pinned rates
+        self.removed = []  # the removed statements, conditions and functions, counted only when reported
+        self.removed_nodes = 0  # nodes removed on their own, outside of these trees
+
+    def eliminate(self, program):
+        function_defs = [rebuilt(function_def, block=self.eliminate_block(function_def.block))
+                         for function_def in program.function_defs]
+        return rebuilt(program, function_defs=self.reachable(function_defs, self.calls))
+
+    def reachable(self, function_defs, calls):  # the functions run by 'main' and by the functions it calls
+        functions = {function_def.signature.id: function_def for function_def in function_defs}  # last one wins
+        if 'main' not in functions:  # the run fails before calling anything
+            return function_defs
+        reached = {'main'}
+        pending = [function_def for function_def in function_defs if function_def.signature.id == 'main']
+        while pending:
+            for name in calls(pending.pop()):
+                if name not in reached:
+                    reached.add(name)
+                    if name in functions:
+                        pending.append(functions[name])
+        kept = []
+        for function_def in function_defs:
+            name = function_def.signature.id
+            if name == 'main' or name in reached and functions[name] is function_def:
+                kept.append(function_def)
+            else:
+                self.removed.append(function_def)
+        return kept
+
+    @staticmethod
+    def calls(function_def):  # names of the functions called by the code left in the function
+        return {node.id for node in walk(function_def.block) if type(node) is FunctionCall}
+
+    def eliminate_block(self, block):
+        statements = []
+        for statement in block.statements:
+            statements.extend(self.eliminate_statement(statement, not statements))
+        for index, statement in enumerate(statements):
+            if self.stops(statement):  # the statements after it never run
+                self.removed.extend(statements[index + 1:])
+                statements = statements[:index + 1]
+                break
+        return rebuilt(block, statements=statements)
+
+    def eliminate_statement(self, statement, first=False):  # the statements replacing it in its block
+        if type(statement) is IfStatement:
+            value = self.condition_value(statement.condition)
+            kept, dropped = (statement.block1, statement.block2) if value else (statement.block2, statement.block1)
+            if first and (kept is None or not kept.statements):  # once a return is pending, a block runs only its
+                value = None  # first statement, so the first statement stays one
+            if value is None:
+                block2 = statement.block2
+                return [rebuilt(statement, block1=self.eliminate_block(statement.block1),
+                                block2=self.eliminate_block(block2) if block2 is not None else None)]
+            if kept is None:
+                self.removed.append(statement)
+                return []
+            self.removed.append(statement.condition)
+            if dropped is not None:
+                self.removed.append(dropped)
+            self.removed_nodes += 2  # the statement and the kept block, whose statements take their place
+            return self.eliminate_block(kept).statements  # blocks have no scope of their own
+        if type(statement) is WhileStatement:
+            return [rebuilt(statement, block=self.eliminate_block(statement.block))]
+        return [statement]
+
+    def stops(self, statement):  # whether running the statement always ends its function
+        if type(statement) is ReturnStatement:
+            for node in walk(statement.expression):  # returning the result of a void call does not end it
+                if type(node) is FunctionCall:
+                    function_def = self.functions.get(node.id)
+                    if function_def is None or function_def.signature.type == TokenTypes.VOID:
+                        return False
+            return True
+        if type(statement) is IfStatement and statement.block2 is not None:
+            return any(self.stops(nested) for nested in statement.block1.statements) \
+                and any(self.stops(nested) for nested in statement.block2.statements)
+        return False
+
+    def condition_value(self, condition):  # None for a condition that depends on the run or fails
+        for node in walk(condition):
+            if type(node) is GetCurrency or type(node) is PrimaryExpr and (node.id is not None
+                                                                            or node.function_call is not None):
+                return None
+            if type(node) is PrimaryExpr and (node.currency1 is not None or node.currency2 is not None):
+                self.uses_rates = True
+        try:
+            condition.accept(self.interpreter)
+        except Exception:  # raised again when the condition runs
+            return None
+        return bool(self.interpreter.scope_manager.last_result)
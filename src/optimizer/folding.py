@@ -0,0 +1,128 @@
+import math
+from .nodes import Transformer, rebuilt
+from ..parser.grammar import PrimaryExpr, MultiplExpr, Expression
+from ..lexer.token_types import TokenTypes
+from ..interpreter.variables import CurrencyVariable, DecimalVariable
+from ..source.rate_table import RateTable
+
+
+def literal(value):  # a number literal evaluating to the value
+    if isinstance(value, CurrencyVariable):
+        return PrimaryExpr(number=value.value, currency1=value.currency)
+    return PrimaryExpr(number=value.value)
+
+
+class ConstantFolder(Transformer):  # evaluates the parts of expressions made of number literals, like the visitor
+    def __init__(self):
+        self.uses_rates = False  # whether a folded value depends on the pinned rates
+        self.folded = 0  # operations done while optimizing instead of at run time
+
+    @staticmethod
+    def value(node):  # the value of a number literal, None for anything computed at run time
+        if type(node) is Expression:
+            if node.additive_ops:
+                return None
+            node = node.multipl_exprs[0]
+        if type(node) is MultiplExpr:
+            if node.multipl_ops:
+                return None
+            node = node.primary_exprs[0]
+        if node.number is None or node.get_currency1 is not None or node.get_currency2 is not None:
+            return None
+        number = -node.number if node.minus else node.number
+        currency = node.currency1 if node.currency1 is not None else node.currency2
+        if currency is not None:  # only the first currency of a literal is used
+            return CurrencyVariable('', number, currency)
+        return DecimalVariable('', number)
+
+    def exchanged(self, value, currency_id):  # None when the currencies are not connected by the rates
+        if value.currency_id != currency_id:
+            self.uses_rates = True
+            try:
+                return value.exchanged(currency_id)
+            except KeyError:
+                return None
+        return value
+
+    def transform_Expression(self, expression):  # multiplExpr, { additiveOp, multiplExpr } ;
+        multipl_exprs = [self.transform(multipl_expr) for multipl_expr in expression.multipl_exprs]
+        result = self.value(multipl_exprs[0])
+        folded = 0
+        if result is not None:
+            for additive_op, multipl_expr in zip(expression.additive_ops, multipl_exprs[1:]):
+                operand = self.value(multipl_expr)
+                if operand is None or type(operand) is not type(result):  # an illicit operation is left to fail
+                    break
+                if isinstance(operand, CurrencyVariable):
+                    operand = self.exchanged(operand, result.currency_id)
+                    if operand is None:
+                        break
+                if additive_op == TokenTypes.PLUS:
+                    value = result.value + operand.value
+                else:
+                    value = result.value - operand.value
+                if not math.isfinite(value):  # has no literal
+                    break
+                result = result.with_value(value)
+                folded += 1
+        if not folded:
+            return rebuilt(expression, multipl_exprs=multipl_exprs)
+        self.folded += folded
+        return Expression([MultiplExpr([literal(result)], [])] + multipl_exprs[folded + 1:],
+                          expression.additive_ops[folded:])
+
+    def transform_MultiplExpr(self, multipl_expr):  # primaryExpr, { multiplOp, primaryExpr } ;
+        primary_exprs = [self.transform(primary_expr) for primary_expr in multipl_expr.primary_exprs]
+        result = self.value(primary_exprs[0])
+        folded = 0
+        if result is not None:
+            for multipl_op, primary_expr in zip(multipl_expr.multipl_ops, primary_exprs[1:]):
+                operand = self.value(primary_expr)
+                if operand is None:
+                    break
+                if multipl_op == TokenTypes.MULTIPLY:
+                    if isinstance(operand, CurrencyVariable):
+                        if isinstance(result, CurrencyVariable):  # illicit, left to fail at run time
+                            break
+                        product = operand.with_value(operand.value * result.value)
+                    else:
+                        product = result.with_value(result.value * operand.value)
+                else:
+                    if operand.value == 0 or isinstance(operand, CurrencyVariable):  # left to fail at run time
+                        break
+                    product = result.with_value(result.value / operand.value)
+                if not math.isfinite(product.value):
+                    break
+                result = product
+                folded += 1
+                if isinstance(result, CurrencyVariable):  # the operands after a cur result are never evaluated
+                    self.folded += folded
+                    return MultiplExpr([literal(result)], [])
+        if not folded:
+            return rebuilt(multipl_expr, primary_exprs=primary_exprs)
+        self.folded += folded
+        return MultiplExpr([literal(result)] + primary_exprs[folded + 1:], multipl_expr.multipl_ops[folded:])
+
+    def transform_PrimaryExpr(self, primary_expr):  # [ “-” ], [currency | getCurrency], ( number | id |
+        # parenthExpr | functionCall ), [currency | getCurrency] ;
+        if primary_expr.function_call is not None:
+            return rebuilt(primary_expr, function_call=self.transform(primary_expr.function_call))
+        if primary_expr.parenth_expr is None:
+            return primary_expr
+        parenth_expr = primary_expr.parenth_expr
+        expression = self.transform(parenth_expr.expression)
+        value = self.value(expression)
+        if value is not None and primary_expr.get_currency1 is None and primary_expr.get_currency2 is None:
+            currencies = [currency for currency in (primary_expr.currency1, primary_expr.currency2)
+                          if currency is not None]
+            if currencies and isinstance(value, DecimalVariable):  # converting a dec fails at run time
+                value = None
+            for currency in currencies:  # each conversion in turn, rounding like the run would
+                if value is not None:
+                    value = self.exchanged(value, RateTable.intern(currency))
+            if value is not None and math.isfinite(value.value):
+                if primary_expr.minus:
+                    value = value.with_value(value.value * -1)
+                self.folded += 1
+                return literal(value)
+        return rebuilt(primary_expr, parenth_expr=rebuilt(parenth_expr, expression=expression))
@@ -0,0 +1,239 @@
+from .nodes import Transformer, rebuilt, walk
+from ..parser.grammar import Signature, PrimaryExpr, MultiplExpr, Expression, WhileStatement, ReturnStatement, \
+    InitStatement, AssignStatement
+from ..lexer.token_types import TokenTypes
+from ..interpreter.variables import CurrencyVariable
+from ..source.rate_table import RateTable
+
+
+DEC, CUR = TokenTypes.DECIMAL, TokenTypes.CURRENCY
+
+
+def trivial(node):  # a literal or a plain read, no slower than reading a temporary
+    if type(node) is Expression and not node.additive_ops:
+        node = node.multipl_exprs[0]
+    if type(node) is MultiplExpr and not node.multipl_ops:
+        node = node.primary_exprs[0]
+    if type(node) is not PrimaryExpr or node.number is not None:
+        return type(node) is PrimaryExpr
+    return node.id is not None and not node.minus and node.currency1 is None and node.currency2 is None \
+        and node.get_currency1 is None and node.get_currency2 is None
+
+
+def movable(program):  # whether statements added before loops and at the top of functions never change the run
+    mains = [function_def for function_def in program.function_defs if function_def.signature.id == 'main']
+    for function_def in program.function_defs:
+        for node in walk(function_def.block):
+            if type(node) is InitStatement and node.expression is None:  # reading the variable fails
+                return False
+            if type(node) is WhileStatement and any(type(nested) is ReturnStatement for nested in walk(node.block)):
+                return False  # a pending return makes every block run only its first statement
+        if len(mains) > 1 and function_def.signature.id == 'main' \
+                and any(type(node) is ReturnStatement for node in walk(function_def.block)):
+            return False  # the return stays pending in the next 'main'
+    return True
+
+
+class LoopInvariantMover(Transformer):  # computes before a loop the parts of its expressions no iteration changes
+    def __init__(self, program, numeric=None):
+        self.enabled = movable(program)
+        self.numeric = numeric  # backend of the run, whose rounding may make a divisor literal zero
+        self.codes = {currency for node in walk(program) if type(node) is PrimaryExpr
+                      for currency in (node.currency1, node.currency2) if currency is not None}
+        self.connected = None  # whether the rates convert between every two currencies of the program
+        self.uses_rates = False  # whether a moved expression was proven not to fail with the pinned rates
+        self.hoisted = 0  # expressions moved out of loops
+        self.temps = 0
+        self.slots = {}  # name -> slot in the frame of the function being rewritten, with the temporaries
+        self.declarations = []  # the temporaries of that function, declared at its top
+        self.types = {}  # name -> type of the variables declared on every path to the current statement
+        self.invariants = None  # name -> type of the variables the loop being moved out of never assigns
+        self.preheader = []  # the assignments of the temporaries, run before that loop
+        self.temp_types = {}  # name -> type of the temporaries
+
+    def move(self, program):
+        if not self.enabled:
+            return program
+        main_slots = dict(program.main_slots)
+        main_types = {}  # the 'main' functions run one after another in one scope
+        rewritten = []
+        for function_def in program.function_defs:
+            main = function_def.signature.id == 'main'
+            if main:
+                self.slots, self.types = main_slots, main_types
+            else:
+                self.slots = dict(function_def.slots)
+                self.types = {signature.id: signature.type for signature in function_def.parameters.signatures
+                              if signature.type in (DEC, CUR)}
+            self.declarations = []
+            statements = self.statements(function_def.block)
+            rewritten.append((function_def, self.declarations + statements, self.slots))
+        if len(main_slots) == len(program.main_slots):
+            main_slots = program.main_slots
+        function_defs = []
+        for function_def, statements, slots in rewritten:
+            if function_def.signature.id == 'main':
+                slots = main_slots
+            elif len(slots) == len(function_def.slots):
+                slots = function_def.slots
+            function_defs.append(rebuilt(function_def, block=rebuilt(function_def.block, statements=statements),
+                                         slots=slots))
+        return rebuilt(program, function_defs=function_defs, main_slots=main_slots)
+
+    def statements(self, block):  # the statements of the block, each loop preceded by its preheader
+        statements = []
+        for statement in block.statements:
+            if type(statement) is WhileStatement and self.invariants is None:
+                statements.extend(self.move_loop(statement))
+            else:
+                statement = self.transform(statement)
+                statements.append(statement)
+                if type(statement) is InitStatement and statement.signature.type in (DEC, CUR):
+                    self.types[statement.signature.id] = statement.signature.type
+        return statements
+
+    def transform_block(self, block):
+        if block is None:
+            return None
+        types = self.types
+        self.types = dict(types)  # declarations in a block that may not run do not hold after it
+        statements = self.statements(block)
+        self.types = types
+        return rebuilt(block, statements=statements)
+
+    def move_loop(self, while_statement):  # the assignments of the temporaries, then the loop reading them
+        assigned = {node.id for node in walk(while_statement.block) if type(node) is AssignStatement} \
+            | {node.signature.id for node in walk(while_statement.block) if type(node) is InitStatement}
+        self.invariants = {name: _type for name, _type in self.types.items() if name not in assigned}
+        self.preheader = preheader = []
+        condition = self.transform(while_statement.condition)
+        block = self.transform_block(while_statement.block)  # also out of the loops nested in it
+        self.invariants = None
+        types = self.types
+        self.types = dict(types)
+        for assign_statement in preheader:  # assigned before any loop nested in this one starts
+            self.types[assign_statement.id] = self.temp_types[assign_statement.id]
+        block = self.transform_block(block)  # out of the nested loops only, what their enclosing loop changes
+        self.types = types
+        return preheader + [rebuilt(while_statement, condition=condition, block=block)]
+
+    def hoist(self, node, _type):  # a read of the temporary computing the node before the loop
+        name = str(self.temps)  # not an identifier, so no variable of the program has the name
+        self.temps += 1
+        self.hoisted += 1
+        slot = self.slots[name] = len(self.slots)
+        signature = Signature(_type, name)
+        signature.slot = slot
+        self.declarations.append(InitStatement(signature))
+        if type(node) is PrimaryExpr:
+            node = MultiplExpr([node], [])
+        if type(node) is MultiplExpr:
+            node = Expression([node], [])
+        assign_statement = AssignStatement(name, node)
+        assign_statement.slot = slot
+        self.temp_types[name] = _type
+        self.preheader.append(assign_statement)
+        primary_expr = PrimaryExpr(_id=name)
+        primary_expr.slot = slot
+        return primary_expr
+
+    def converts(self):  # whether no conversion between the currencies of the program fails with the pinned rates
+        self.uses_rates = True
+        if self.connected is None:
+            ids = [RateTable.intern(code) for code in sorted(self.codes)]
+            try:
+                for currency_id in ids:
+                    for other_id in ids:
+                        CurrencyVariable('', 1.0, currency_id=currency_id).exchanged(other_id)
+                self.connected = True
+            except KeyError:
+                self.connected = False
+        return self.connected
+
+    def literal(self, number):  # the value of a number literal in the run, None for no literal
+        if number is None or self.numeric is None:
+            return number
+        return self.numeric.number(number)
+
+    def type_of(self, node):  # the type of an expression giving the same value on every iteration without failing,
+        # None for any other
+        if type(node) is Expression:
+            types = {self.type_of(multipl_expr) for multipl_expr in node.multipl_exprs}
+            if len(types) != 1 or None in types:  # adding a dec to a cur fails
+                return None
+            _type = types.pop()
+            if _type == CUR and node.additive_ops and not self.converts():
+                return None
+            return _type
+        if type(node) is MultiplExpr:
+            _type = self.type_of(node.primary_exprs[0])
+            for multipl_op, primary_expr in zip(node.multipl_ops, node.primary_exprs[1:]):
+                if _type is None:
+                    return None
+                if multipl_op == TokenTypes.MULTIPLY:
+                    operand = self.type_of(primary_expr)
+                    if operand is None or _type == CUR and operand == CUR:
+                        return None
+                    if operand == CUR or _type == CUR:  # the operands after a cur product are never evaluated
+                        return CUR
+                elif not self.literal(primary_expr.number) or primary_expr.currency1 is not None \
+                        or primary_expr.currency2 is not None or primary_expr.get_currency1 is not None \
+                        or primary_expr.get_currency2 is not None:  # only a non-zero dec literal surely divides
+                    return None
+                elif _type == CUR:
+                    return CUR
+            return _type
+        if node.function_call is not None or node.get_currency1 is not None or node.get_currency2 is not None:
+            return None  # even a pure function may fail
+        converted = node.currency1 is not None or node.currency2 is not None
+        if node.number is not None:  # only the first currency of a literal is used
+            return CUR if converted else DEC
+        if node.id is not None:
+            _type = self.invariants.get(node.id)
+        else:
+            _type = self.type_of(node.parenth_expr.expression)
+        if converted and (_type != CUR or not self.converts()):  # converting a dec fails or is skipped
+            return None
+        return _type
+
+    def transform_Expression(self, expression):  # multiplExpr, { additiveOp, multiplExpr } ;
+        if self.invariants is None:
+            return super().transform_Expression(expression)
+        _type = self.type_of(expression)
+        if _type is not None:
+            if trivial(expression):
+                return expression
+            return Expression([MultiplExpr([self.hoist(expression, _type)], [])], [])
+        multipl_exprs, additive_ops = expression.multipl_exprs, expression.additive_ops
+        for count in range(len(multipl_exprs) - 1, 1, -1):  # the longest invariant sum its operands start with
+            prefix = Expression(multipl_exprs[:count], additive_ops[:count - 1])
+            _type = self.type_of(prefix)
+            if _type is not None:
+                return Expression([MultiplExpr([self.hoist(prefix, _type)], [])]
+                                  + [self.transform(multipl_expr) for multipl_expr in multipl_exprs[count:]],
+                                  additive_ops[count - 1:])
+        return super().transform_Expression(expression)
+
+    def transform_MultiplExpr(self, multipl_expr):  # primaryExpr, { multiplOp, primaryExpr } ;
+        if self.invariants is None:
+            return super().transform_MultiplExpr(multipl_expr)
+        _type = self.type_of(multipl_expr)
+        if _type is not None:
+            if trivial(multipl_expr):
+                return multipl_expr
+            return MultiplExpr([self.hoist(multipl_expr, _type)], [])
+        primary_exprs, multipl_ops = multipl_expr.primary_exprs, multipl_expr.multipl_ops
+        for count in range(len(primary_exprs) - 1, 1, -1):  # a dec product, which the rest goes on from
+            prefix = MultiplExpr(primary_exprs[:count], multipl_ops[:count - 1])
+            if self.type_of(prefix) == DEC:
+                return MultiplExpr([self.hoist(prefix, DEC)]
+                                   + [self.transform(primary_expr) for primary_expr in primary_exprs[count:]],
+                                   multipl_ops[count - 1:])
+        return super().transform_MultiplExpr(multipl_expr)
+
+    def transform_PrimaryExpr(self, primary_expr):
+        if self.invariants is not None and not trivial(primary_expr):
+            _type = self.type_of(primary_expr)
+            if _type is not None:
+                return self.hoist(primary_expr, _type)
+        return super().transform_PrimaryExpr(primary_expr)
@@ -0,0 +1,123 @@
+import copy
+from ..parser.grammar import Node, Signature, Parameters, Arguments, Block, IfStatement, WhileStatement, \
+    ReturnStatement, InitStatement, AssignStatement, PrintStatement
+
+
+NODE_TYPES = (Node, Signature, Parameters, Arguments, Block, IfStatement, WhileStatement, ReturnStatement,
+              InitStatement, AssignStatement, PrintStatement)
+
+
+def rebuilt(node, **fields):  # the node itself when no field changed, otherwise a copy with the new fields
+    for name, value in fields.items():
+        old = getattr(node, name)
+        if isinstance(value, list):
+            if len(value) != len(old) or any(new is not item for new, item in zip(value, old)):
+                break
+        elif value is not old:
+            break
+    else:
+        return node
+    node = copy.copy(node)
+    for name, value in fields.items():
+        setattr(node, name, value)
+    return node
+
+
+def walk(node):  # the node and every node below it, in no particular order
+    pending = [node]
+    while pending:
+        node = pending.pop()
+        yield node
+        for value in vars(node).values():
+            if type(value) is list:
+                pending.extend(item for item in value if isinstance(item, NODE_TYPES))
+            elif isinstance(value, NODE_TYPES):
+                pending.append(value)
+
+
+def size(node):
+    return sum(1 for _ in walk(node))
+
+
+class Transformer:  # rebuilds a tree, copying only the nodes below which something changed
+    def transform(self, node):
+        return getattr(self, 'transform_' + type(node).__name__)(node)
+
+    def transform_block(self, block):  # None for a missing else block
+        if block is None:
+            return None
+        return rebuilt(block, statements=[self.transform(statement) for statement in block.statements])
+
+    def transform_FunctionDef(self, function_def):
+        return rebuilt(function_def, block=self.transform_block(function_def.block))
+
+    def transform_IfStatement(self, if_statement):
+        return rebuilt(if_statement, condition=self.transform(if_statement.condition),
+                       block1=self.transform_block(if_statement.block1),
+                       block2=self.transform_block(if_statement.block2))
+
+    def transform_WhileStatement(self, while_statement):
+        return rebuilt(while_statement, condition=self.transform(while_statement.condition),
+                       block=self.transform_block(while_statement.block))
+
+    def transform_ReturnStatement(self, return_statement):
+        return rebuilt(return_statement, expression=self.transform(return_statement.expression))
+
+    def transform_InitStatement(self, init_statement):
+        if init_statement.expression is None:
+            return init_statement
+        return rebuilt(init_statement, expression=self.transform(init_statement.expression))
+
+    def transform_AssignStatement(self, assign_statement):
+        return rebuilt(assign_statement, expression=self.transform(assign_statement.expression))
+
+    def transform_PrintStatement(self, print_statement):
+        return rebuilt(print_statement, printables=[
+            printable if isinstance(printable, str) else self.transform(printable)
+            for printable in print_statement.printables])
+
+    def transform_FunctionCall(self, function_call):
+        arguments = function_call.arguments
+        return rebuilt(function_call, arguments=rebuilt(arguments, expressions=[
+            self.transform(expression) for expression in arguments.expressions]))
+
+    def transform_Condition(self, condition):
+        return rebuilt(condition, and_conds=[self.transform(and_cond) for and_cond in condition.and_conds])
+
+    def transform_AndCond(self, and_cond):
+        return rebuilt(and_cond, equality_conds=[self.transform(equality_cond)
+                                                 for equality_cond in and_cond.equality_conds])
+
+    def transform_EqualityCond(self, equality_cond):
+        relational_cond2 = equality_cond.relational_cond2
+        return rebuilt(equality_cond, relational_cond1=self.transform(equality_cond.relational_cond1),
+                       relational_cond2=self.transform(relational_cond2) if relational_cond2 is not None else None)
+
+    def transform_RelationalCond(self, relational_cond):
+        primary_cond2 = relational_cond.primary_cond2
+        return rebuilt(relational_cond, primary_cond1=self.transform(relational_cond.primary_cond1),
+                       primary_cond2=self.transform(primary_cond2) if primary_cond2 is not None else None)
+
+    def transform_Expression(self, expression):
+        return rebuilt(expression, multipl_exprs=[self.transform(multipl_expr)
+                                                  for multipl_expr in expression.multipl_exprs])
+
+    def transform_MultiplExpr(self, multipl_expr):
+        return rebuilt(multipl_expr, primary_exprs=[self.transform(primary_expr)
+                                                    for primary_expr in multipl_expr.primary_exprs])
+
+    def transform_PrimaryExpr(self, primary_expr):
+        if primary_expr.function_call is not None:
+            return rebuilt(primary_expr, function_call=self.transform(primary_expr.function_call))
+        if primary_expr.parenth_expr is not None:
+            parenth_expr = primary_expr.parenth_expr
+            return rebuilt(primary_expr, parenth_expr=rebuilt(parenth_expr,
+                                                              expression=self.transform(parenth_expr.expression)))
+        return primary_expr
+
+    def transform_PrimaryCond(self, primary_cond):
+        if primary_cond.parenth_cond is not None:
+            parenth_cond = primary_cond.parenth_cond
+            return rebuilt(primary_cond, parenth_cond=rebuilt(parenth_cond,
+                                                              condition=self.transform(parenth_cond.condition)))
+        return rebuilt(primary_cond, expression=self.transform(primary_cond.expression))
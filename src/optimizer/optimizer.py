@@ -0,0 +1,53 @@
+from .folding import ConstantFolder
+from .dead_code import DeadCodeEliminator
+from .loop_invariants import LoopInvariantMover
+from .nodes import rebuilt, size
+from ..source.currencies import Currencies
+
+
+class OptimizedProgram:  # a program rewritten for one optimization level, numeric backend and version of the rates
+    def __init__(self, level, version, program, folded=0, removed=(), removed_nodes=0, hoisted=0, numeric=None):
+        self.level = level
+        self.numeric = numeric  # name and minor units of the backend, None for floats
+        self.version = version  # None when the rewriting did not depend on the rates
+        self.program = program
+        self.folded = folded  # operations computed before the run
+        self.removed_trees = removed  # parts of the parsed program no run reaches
+        self.removed_nodes = removed_nodes
+        self.hoisted = hoisted  # expressions computed once before a loop instead of on every iteration
+
+    @property
+    def removed(self):  # nodes of the code no run reaches
+        return self.removed_nodes + sum(size(node) for node in self.removed_trees)
+
+
+class Optimizer:  # rewrites a resolved program to one printing the same and raising the same errors with less work
+    def __init__(self, level=1, numeric=None):
+        self.level = level  # 0 runs the program as parsed
+        self.numeric = numeric if numeric is not None and numeric.name != 'float' else None
+        self.backend = None if self.numeric is None else (numeric.name, getattr(numeric, 'minor_units', None))
+
+    def optimize(self, program):  # the program for the pinned rates, built once per version of the rates
+        if not self.level:
+            return program
+        cached = program.optimized
+        snapshot = Currencies.pinned.snapshot
+        version = snapshot.version if snapshot is not None else None
+        if cached is not None and cached.level == self.level and cached.numeric == self.backend \
+                and cached.version in (None, version):
+            return cached.program
+        folder = ConstantFolder()
+        eliminator = DeadCodeEliminator(program, self.numeric)
+        function_defs = eliminator.reachable(program.function_defs, lambda function_def: function_def.calls)
+        if self.numeric is None:  # literals are folded to floats
+            function_defs = [folder.transform(function_def) for function_def in function_defs]
+        optimized = rebuilt(program, function_defs=function_defs)
+        optimized = eliminator.eliminate(optimized)  # calls only in dead code leave more functions unreachable
+        mover = LoopInvariantMover(optimized, self.numeric)
+        optimized = mover.move(optimized)
+        if optimized is not program:
+            optimized.optimized = None  # copied from the program with the program optimized for older rates
+        uses_rates = folder.uses_rates or eliminator.uses_rates or mover.uses_rates
+        program.optimized = OptimizedProgram(self.level, version if uses_rates else None, optimized, folder.folded,
+                                             eliminator.removed, eliminator.removed_nodes, mover.hoisted, self.backend)
+        return optimized
@@ -9,6 +9,8 @@ class Node:
 
 
 class Signature:  # type, id ;
+    slot = None  # set by the resolver
+
     def __init__(self, _type, _id):
         self.type = _type
         self.id = _id
@@ -33,6 +35,9 @@ class Block:  # { statement };
 
 
 class FunctionDef(Node):  # signature, “(”, parameters, “)”, “{“, block, “}” ;
+    slots = None  # name -> slot of the parameters and local variables, set by the resolver
+    pure = False  # whether calls with the same arguments always return the same value, set by the resolver
+
     def __init__(self, signature: Signature, parameters: Parameters, block: Block):
         self.signature = signature
         self.parameters = parameters
@@ -43,6 +48,9 @@ class FunctionDef(Node):  # signature, “(”, parameters, “)”, “{“, bl
 
 
 class Program(Node):
+    main_slots = None  # slots of the scope shared by the 'main' functions, set by the resolver
+    optimized = None  # the program rewritten by the optimizer, with the rates it was rewritten for
+
     def __init__(self, function_defs: List[FunctionDef]):
         self.function_defs = function_defs
 
@@ -51,6 +59,8 @@ class Program(Node):
 
 
 class FunctionCall(Node):  # id, “(“, arguments, “)”;
+    typed = False  # whether the arguments always match the parameters of the function, set by the type inference
+
     def __init__(self, _id: str, arguments: Arguments):
         self.id = _id
         self.arguments = arguments
@@ -60,6 +70,8 @@ class FunctionCall(Node):  # id, “(“, arguments, “)”;
 
 
 class GetCurrency(Node):  # id, “.”, “getCurrency()” ;
+    slot = None
+
     def __init__(self, _id: str):
         self.id = _id
 
@@ -77,6 +89,10 @@ class ParenthExpr(Node):  # “(”, expression, “)” ;
 
 class PrimaryExpr(Node):  # [ “-” ], [currency | getCurrency], ( number | id | parenthExpr | functionCall ),
     # [currency | getCurrency] ;
+    slot = None
+    type = None  # DECIMAL or CURRENCY when every value of the expression has the type, set by the type inference
+    currency = None  # the currency of every cur value of the expression, when one is proven
+
     def __init__(self, minus: bool = False, currency1: str = None, get_currency1: GetCurrency = None,
                  number: Union[int, float] = None, _id: str = None, parenth_expr: ParenthExpr = None,
                  function_call: FunctionCall = None, currency2: str = None, get_currency2: GetCurrency = None):
@@ -95,6 +111,9 @@ class PrimaryExpr(Node):  # [ “-” ], [currency | getCurrency], ( number | id
 
 
 class MultiplExpr(Node):  # primaryExpr, { multiplOp, primaryExpr } ;
+    type = None  # DECIMAL only when every operand is a dec
+    currency = None
+
     def __init__(self, primary_exprs: List[PrimaryExpr], multipl_ops: List):
         self.primary_exprs = primary_exprs
         self.multipl_ops = multipl_ops
@@ -104,6 +123,9 @@ class MultiplExpr(Node):  # primaryExpr, { multiplOp, primaryExpr } ;
 
 
 class Expression(Node):  # multiplExpr, { additiveOp, multiplExpr } ;
+    type = None  # DECIMAL or CURRENCY only when every operand has that type
+    currency = None
+
     def __init__(self, multipl_exprs: List[MultiplExpr], additive_ops: List):
         self.multipl_exprs = multipl_exprs
         self.additive_ops = additive_ops
@@ -203,6 +225,8 @@ class InitStatement:  # signature, [ assignmentOp, expression ], “;” ;
 
 
 class AssignStatement:  # id, assignmentOp, expression, “;” ;
+    slot = None
+
     def __init__(self, _id: str, expression: Expression):
         self.id = _id
         self.expression = expression
@@ -1,12 +1,15 @@
 from ..exceptions.exceptions import SyntaxxError
+from ..lexer.token_stream import TokenStream
 from .grammar import *
 
 
 class Parser:
     def __init__(self, lexer):
-        self.__lexer = lexer
+        if isinstance(lexer, TokenStream):
+            self.__tokens = lexer
+        else:
+            self.__tokens = TokenStream(lexer.tokens())
         self.program = None
-        self.__lexer.get_next_token()
         self.__function_data_types = [TokenTypes.DECIMAL, TokenTypes.CURRENCY, TokenTypes.VOID]
         self.__relation_ops = [TokenTypes.GREATER_THAN, TokenTypes.LESS_THAN, TokenTypes.GREATER_OR_EQUAL,
                                TokenTypes.LESS_OR_EQUAL]
@@ -22,32 +25,32 @@ class Parser:
     def parse_function_def(self):  # signature, “(”, parameters, “)”, “{“, block, “}” ;
         signature = self.parse_signature()
         if signature:
-            self.__lexer.get_next_token()
-            if self.__lexer.token.type == TokenTypes.OP_BRACKET:
-                self.__lexer.get_next_token()
+            self.__tokens.advance()
+            if self.__tokens.token.type == TokenTypes.OP_BRACKET:
+                self.__tokens.advance()
                 parameters = self.parse_parameters()
                 if parameters:
-                    if self.__lexer.token.type == TokenTypes.CL_BRACKET:
-                        self.__lexer.get_next_token()
-                        if self.__lexer.token.type == TokenTypes.OP_CURLY_BRACKET:
-                            self.__lexer.get_next_token()
+                    if self.__tokens.token.type == TokenTypes.CL_BRACKET:
+                        self.__tokens.advance()
+                        if self.__tokens.token.type == TokenTypes.OP_CURLY_BRACKET:
+                            self.__tokens.advance()
                             block = self.parse_block()
                             if block:
-                                if self.__lexer.token.type == TokenTypes.CL_CURLY_BRACKET:
-                                    self.__lexer.get_next_token()
+                                if self.__tokens.token.type == TokenTypes.CL_CURLY_BRACKET:
+                                    self.__tokens.advance()
                                     return FunctionDef(signature, parameters, block)
-            raise SyntaxxError(self.__lexer.line, self.__lexer.column)
+            raise SyntaxxError(self.__tokens.line, self.__tokens.column)
         return None
 
     def parse_signature(self):  # type, id ;
-        token_type = self.__lexer.token.type
+        token_type = self.__tokens.token.type
         if token_type in self.__function_data_types:
             _type = token_type
-            self.__lexer.get_next_token()
-            if self.__lexer.token.type == TokenTypes.IDENTIFIER:
-                _id = self.__lexer.token.value
+            self.__tokens.advance()
+            if self.__tokens.token.type == TokenTypes.IDENTIFIER:
+                _id = self.__tokens.token.value
                 return Signature(_type, _id)
-            raise SyntaxxError(self.__lexer.line, self.__lexer.column)
+            raise SyntaxxError(self.__tokens.line, self.__tokens.column)
         return None
 
     def parse_parameters(self):  # [ signature, { “,”, signature } ];
@@ -55,15 +58,15 @@ class Parser:
         signature = self.parse_signature()
         if signature:
             signatures.append(signature)
-            self.__lexer.get_next_token()
-            while self.__lexer.token.type == TokenTypes.COMMA:
-                self.__lexer.get_next_token()
+            self.__tokens.advance()
+            while self.__tokens.token.type == TokenTypes.COMMA:
+                self.__tokens.advance()
                 signature = self.parse_signature()
                 if signature:
                     signatures.append(signature)
-                    self.__lexer.get_next_token()
+                    self.__tokens.advance()
                 else:
-                    raise SyntaxxError(self.__lexer.line, self.__lexer.column)
+                    raise SyntaxxError(self.__tokens.line, self.__tokens.column)
         return Parameters(signatures)
 
     def parse_arguments(self):  # [ expression { “,”, expression } ] ;
@@ -71,13 +74,13 @@ class Parser:
         expression = self.parse_expression()
         if expression:
             expressions.append(expression)
-            while self.__lexer.token.type == TokenTypes.COMMA:
-                self.__lexer.get_next_token()
+            while self.__tokens.token.type == TokenTypes.COMMA:
+                self.__tokens.advance()
                 expression = self.parse_expression()
                 if expression:
                     expressions.append(expression)
                 else:
-                    raise SyntaxxError(self.__lexer.line, self.__lexer.column)
+                    raise SyntaxxError(self.__tokens.line, self.__tokens.column)
         return Arguments(expressions)
 
     def parse_block(self):  # { statement };
@@ -105,11 +108,11 @@ class Parser:
         statement = self.parse_assign_statement_or_function_call()
         if statement:
             if isinstance(statement, FunctionCall):
-                if self.__lexer.token.type == TokenTypes.SEMICOLON:
-                    self.__lexer.get_next_token()
+                if self.__tokens.token.type == TokenTypes.SEMICOLON:
+                    self.__tokens.advance()
                     return statement
                 else:
-                    raise SyntaxxError(self.__lexer.line, self.__lexer.column)
+                    raise SyntaxxError(self.__tokens.line, self.__tokens.column)
             return statement
         statement = self.parse_print_statement()
         if statement:
@@ -117,139 +120,139 @@ class Parser:
         return None
 
     def parse_if_statement(self):  # “if”, “(”, condition, “)”, “{“, block, “}“, [“else”, “{”, block, “}” ];
-        if self.__lexer.token.type == TokenTypes.IF:
-            self.__lexer.get_next_token()
-            if self.__lexer.token.type == TokenTypes.OP_BRACKET:
-                self.__lexer.get_next_token()
+        if self.__tokens.token.type == TokenTypes.IF:
+            self.__tokens.advance()
+            if self.__tokens.token.type == TokenTypes.OP_BRACKET:
+                self.__tokens.advance()
                 condition = self.parse_condition()
                 if condition:
-                    if self.__lexer.token.type == TokenTypes.CL_BRACKET:
-                        self.__lexer.get_next_token()
-                        if self.__lexer.token.type == TokenTypes.OP_CURLY_BRACKET:
-                            self.__lexer.get_next_token()
+                    if self.__tokens.token.type == TokenTypes.CL_BRACKET:
+                        self.__tokens.advance()
+                        if self.__tokens.token.type == TokenTypes.OP_CURLY_BRACKET:
+                            self.__tokens.advance()
                             block1 = self.parse_block()
                             if block1:
-                                if self.__lexer.token.type == TokenTypes.CL_CURLY_BRACKET:
-                                    self.__lexer.get_next_token()
-                                    if self.__lexer.token.type == TokenTypes.ELSE:
-                                        self.__lexer.get_next_token()
-                                        if self.__lexer.token.type == TokenTypes.OP_CURLY_BRACKET:
-                                            self.__lexer.get_next_token()
+                                if self.__tokens.token.type == TokenTypes.CL_CURLY_BRACKET:
+                                    self.__tokens.advance()
+                                    if self.__tokens.token.type == TokenTypes.ELSE:
+                                        self.__tokens.advance()
+                                        if self.__tokens.token.type == TokenTypes.OP_CURLY_BRACKET:
+                                            self.__tokens.advance()
                                             block2 = self.parse_block()
                                             if block2:
-                                                if self.__lexer.token.type == TokenTypes.CL_CURLY_BRACKET:
-                                                    self.__lexer.get_next_token()
+                                                if self.__tokens.token.type == TokenTypes.CL_CURLY_BRACKET:
+                                                    self.__tokens.advance()
                                                     return IfStatement(condition, block1, block2)
-                                        raise SyntaxxError(self.__lexer.line, self.__lexer.column)
+                                        raise SyntaxxError(self.__tokens.line, self.__tokens.column)
                                     return IfStatement(condition, block1)
-            raise SyntaxxError(self.__lexer.line, self.__lexer.column)
+            raise SyntaxxError(self.__tokens.line, self.__tokens.column)
         return None
 
     def parse_while_statement(self):  # “while”, “(“, condition, “)”, “{“, block, “}“ ;
-        if self.__lexer.token.type == TokenTypes.WHILE:
-            self.__lexer.get_next_token()
-            if self.__lexer.token.type == TokenTypes.OP_BRACKET:
-                self.__lexer.get_next_token()
+        if self.__tokens.token.type == TokenTypes.WHILE:
+            self.__tokens.advance()
+            if self.__tokens.token.type == TokenTypes.OP_BRACKET:
+                self.__tokens.advance()
                 condition = self.parse_condition()
                 if condition:
-                    if self.__lexer.token.type == TokenTypes.CL_BRACKET:
-                        self.__lexer.get_next_token()
-                        if self.__lexer.token.type == TokenTypes.OP_CURLY_BRACKET:
-                            self.__lexer.get_next_token()
+                    if self.__tokens.token.type == TokenTypes.CL_BRACKET:
+                        self.__tokens.advance()
+                        if self.__tokens.token.type == TokenTypes.OP_CURLY_BRACKET:
+                            self.__tokens.advance()
                             block = self.parse_block()
                             if block:
-                                if self.__lexer.token.type == TokenTypes.CL_CURLY_BRACKET:
-                                    self.__lexer.get_next_token()
+                                if self.__tokens.token.type == TokenTypes.CL_CURLY_BRACKET:
+                                    self.__tokens.advance()
                                     return WhileStatement(condition, block)
-            raise SyntaxxError(self.__lexer.line, self.__lexer.column)
+            raise SyntaxxError(self.__tokens.line, self.__tokens.column)
         return None
 
     def parse_return_statement(self):  # “return”, expression, “;” ;
-        if self.__lexer.token.type == TokenTypes.RETURN:
-            self.__lexer.get_next_token()
+        if self.__tokens.token.type == TokenTypes.RETURN:
+            self.__tokens.advance()
             expression = self.parse_expression()
             if expression:
-                if self.__lexer.token.type == TokenTypes.SEMICOLON:
-                    self.__lexer.get_next_token()
+                if self.__tokens.token.type == TokenTypes.SEMICOLON:
+                    self.__tokens.advance()
                     return ReturnStatement(expression)
-            raise SyntaxxError(self.__lexer.line, self.__lexer.column)
+            raise SyntaxxError(self.__tokens.line, self.__tokens.column)
         return None
 
     def parse_init_statement(self):  # signature, [ assignmentOp, expression ], “;” ;
         signature = self.parse_signature()
         if signature:
-            self.__lexer.get_next_token()
-            if self.__lexer.token.type == TokenTypes.ASSIGNMENT:
-                self.__lexer.get_next_token()
+            self.__tokens.advance()
+            if self.__tokens.token.type == TokenTypes.ASSIGNMENT:
+                self.__tokens.advance()
                 expression = self.parse_expression()
                 if expression:
-                    if self.__lexer.token.type == TokenTypes.SEMICOLON:
-                        self.__lexer.get_next_token()
+                    if self.__tokens.token.type == TokenTypes.SEMICOLON:
+                        self.__tokens.advance()
                         return InitStatement(signature, expression)
-                raise SyntaxxError(self.__lexer.line, self.__lexer.column)
+                raise SyntaxxError(self.__tokens.line, self.__tokens.column)
             else:
-                if self.__lexer.token.type == TokenTypes.SEMICOLON:
-                    self.__lexer.get_next_token()
+                if self.__tokens.token.type == TokenTypes.SEMICOLON:
+                    self.__tokens.advance()
                     return InitStatement(signature)
-            raise SyntaxxError(self.__lexer.line, self.__lexer.column)
+            raise SyntaxxError(self.__tokens.line, self.__tokens.column)
         return None
 
     def parse_print_statement(self):  # “print”, “(“, printable { “,”, printable }, “)”, ";" ;
-        if self.__lexer.token.type == TokenTypes.PRINT:
-            self.__lexer.get_next_token()
-            if self.__lexer.token.type == TokenTypes.OP_BRACKET:
-                self.__lexer.get_next_token()
+        if self.__tokens.token.type == TokenTypes.PRINT:
+            self.__tokens.advance()
+            if self.__tokens.token.type == TokenTypes.OP_BRACKET:
+                self.__tokens.advance()
                 printables = []
-                if self.__lexer.token.type == TokenTypes.STRING:
-                    printable = self.__lexer.token.value
-                    self.__lexer.get_next_token()
+                if self.__tokens.token.type == TokenTypes.STRING:
+                    printable = self.__tokens.token.value
+                    self.__tokens.advance()
                 else:
                     printable = self.parse_expression()
                 if printable:
                     printables.append(printable)
-                    while self.__lexer.token.type == TokenTypes.COMMA:
-                        self.__lexer.get_next_token()
-                        if self.__lexer.token.type == TokenTypes.STRING:
-                            printable = self.__lexer.token.value
-                            self.__lexer.get_next_token()
+                    while self.__tokens.token.type == TokenTypes.COMMA:
+                        self.__tokens.advance()
+                        if self.__tokens.token.type == TokenTypes.STRING:
+                            printable = self.__tokens.token.value
+                            self.__tokens.advance()
                         else:
                             printable = self.parse_expression()
                         if printable:
                             printables.append(printable)
                         else:
-                            raise SyntaxxError(self.__lexer.line, self.__lexer.column)
-                    if self.__lexer.token.type == TokenTypes.CL_BRACKET:
-                        self.__lexer.get_next_token()
-                        if self.__lexer.token.type == TokenTypes.SEMICOLON:
-                            self.__lexer.get_next_token()
+                            raise SyntaxxError(self.__tokens.line, self.__tokens.column)
+                    if self.__tokens.token.type == TokenTypes.CL_BRACKET:
+                        self.__tokens.advance()
+                        if self.__tokens.token.type == TokenTypes.SEMICOLON:
+                            self.__tokens.advance()
                             return PrintStatement(printables)
-            raise SyntaxxError(self.__lexer.line, self.__lexer.column)
+            raise SyntaxxError(self.__tokens.line, self.__tokens.column)
         return None
 
     def parse_assign_statement(self, _id):  # id, assignmentOp, expression, “;” ;
-        if self.__lexer.token.type == TokenTypes.ASSIGNMENT:
-            self.__lexer.get_next_token()
+        if self.__tokens.token.type == TokenTypes.ASSIGNMENT:
+            self.__tokens.advance()
             expression = self.parse_expression()
             if expression:
-                if self.__lexer.token.type == TokenTypes.SEMICOLON:
-                    self.__lexer.get_next_token()
+                if self.__tokens.token.type == TokenTypes.SEMICOLON:
+                    self.__tokens.advance()
                     return AssignStatement(_id, expression)
         return None
 
     def parse_function_call(self, _id):  # id, “(“, arguments, “)”;
-        if self.__lexer.token.type == TokenTypes.OP_BRACKET:
-            self.__lexer.get_next_token()
+        if self.__tokens.token.type == TokenTypes.OP_BRACKET:
+            self.__tokens.advance()
             arguments = self.parse_arguments()
             if arguments:
-                if self.__lexer.token.type == TokenTypes.CL_BRACKET:
-                    self.__lexer.get_next_token()
+                if self.__tokens.token.type == TokenTypes.CL_BRACKET:
+                    self.__tokens.advance()
                     return FunctionCall(_id, arguments)
         return None
 
     def parse_assign_statement_or_function_call(self):
-        if self.__lexer.token.type == TokenTypes.IDENTIFIER:
-            _id = self.__lexer.token.value
-            self.__lexer.get_next_token()
+        if self.__tokens.token.type == TokenTypes.IDENTIFIER:
+            _id = self.__tokens.token.value
+            self.__tokens.advance()
             statement = self.parse_assign_statement(_id)
             if statement:
                 return statement
@@ -262,13 +265,13 @@ class Parser:
         and_cond = self.parse_and_cond()
         if and_cond:
             and_conds.append(and_cond)
-            while self.__lexer.token.type == TokenTypes.OR:
-                self.__lexer.get_next_token()
+            while self.__tokens.token.type == TokenTypes.OR:
+                self.__tokens.advance()
                 and_cond = self.parse_and_cond()
                 if and_cond:
                     and_conds.append(and_cond)
                 else:
-                    raise SyntaxxError(self.__lexer.line, self.__lexer.column)
+                    raise SyntaxxError(self.__tokens.line, self.__tokens.column)
             return Condition(and_conds)
         return None
 
@@ -277,64 +280,64 @@ class Parser:
         equality_cond = self.parse_equality_cond()
         if equality_cond:
             equality_conds.append(equality_cond)
-            while self.__lexer.token.type == TokenTypes.AND:
-                self.__lexer.get_next_token()
+            while self.__tokens.token.type == TokenTypes.AND:
+                self.__tokens.advance()
                 equality_cond = self.parse_equality_cond()
                 if equality_cond:
                     equality_conds.append(equality_cond)
                 else:
-                    raise SyntaxxError(self.__lexer.line, self.__lexer.column)
+                    raise SyntaxxError(self.__tokens.line, self.__tokens.column)
             return AndCond(equality_conds)
         return None
 
     def parse_equality_cond(self):  # relationalCond, [ equalOp, relationalCond ] ;
         relational_cond1 = self.parse_relational_cond()
         if relational_cond1:
-            if self.__lexer.token.type == TokenTypes.EQUAL or self.__lexer.token.type == TokenTypes.NOT_EQUAL:
-                equal_op = self.__lexer.token.type
-                self.__lexer.get_next_token()
+            if self.__tokens.token.type == TokenTypes.EQUAL or self.__tokens.token.type == TokenTypes.NOT_EQUAL:
+                equal_op = self.__tokens.token.type
+                self.__tokens.advance()
                 relational_cond2 = self.parse_relational_cond()
                 if relational_cond2:
                     return EqualityCond(relational_cond1, equal_op, relational_cond2)
-                raise SyntaxxError(self.__lexer.line, self.__lexer.column)
+                raise SyntaxxError(self.__tokens.line, self.__tokens.column)
             return EqualityCond(relational_cond1)
         return None
 
     def parse_relational_cond(self):  # primaryCond, [ relationOp, primaryCond ];
         primary_cond1 = self.parse_primary_cond()
         if primary_cond1:
-            if self.__lexer.token.type in self.__relation_ops:
-                relation_op = self.__lexer.token.type
-                self.__lexer.get_next_token()
+            if self.__tokens.token.type in self.__relation_ops:
+                relation_op = self.__tokens.token.type
+                self.__tokens.advance()
                 primary_cond2 = self.parse_primary_cond()
                 if primary_cond2:
                     return RelationalCond(primary_cond1, relation_op, primary_cond2)
-                raise SyntaxxError(self.__lexer.line, self.__lexer.column)
+                raise SyntaxxError(self.__tokens.line, self.__tokens.column)
             return RelationalCond(primary_cond1)
         return None
 
     def parse_primary_cond(self):  # [ unaryOp ], ( parenthCond | expression ) ;
         unary_op = False
-        if self.__lexer.token.type == TokenTypes.NOT:
+        if self.__tokens.token.type == TokenTypes.NOT:
             unary_op = True
-            self.__lexer.get_next_token()
+            self.__tokens.advance()
         parenth_cond = self.parse_parenth_cond()
         if parenth_cond:
-            self.__lexer.get_next_token()
+            self.__tokens.advance()
             return PrimaryCond(unary_op, parenth_cond=parenth_cond)
         expression = self.parse_expression()
         if expression:
             return PrimaryCond(unary_op, expression=expression)
-        raise SyntaxxError(self.__lexer.line, self.__lexer.column)
+        raise SyntaxxError(self.__tokens.line, self.__tokens.column)
 
     def parse_parenth_cond(self):  # “(“, condition, “)” ;
-        if self.__lexer.token.type == TokenTypes.OP_BRACKET:
-            self.__lexer.get_next_token()
+        if self.__tokens.token.type == TokenTypes.OP_BRACKET:
+            self.__tokens.advance()
             condition = self.parse_condition()
             if condition:
-                if self.__lexer.token.type == TokenTypes.CL_BRACKET:
+                if self.__tokens.token.type == TokenTypes.CL_BRACKET:
                     return ParenthCond(condition)
-            raise SyntaxxError(self.__lexer.line, self.__lexer.column)
+            raise SyntaxxError(self.__tokens.line, self.__tokens.column)
         return None
 
     def parse_expression(self):  # multiplExpr, { additiveOp, multiplExpr } ;
@@ -343,14 +346,14 @@ class Parser:
         multipl_expr = self.parse_multipl_expr()
         if multipl_expr:
             multipl_exprs.append(multipl_expr)
-            while self.__lexer.token.type == TokenTypes.PLUS or self.__lexer.token.type == TokenTypes.MINUS:
-                additive_ops.append(self.__lexer.token.type)
-                self.__lexer.get_next_token()
+            while self.__tokens.token.type == TokenTypes.PLUS or self.__tokens.token.type == TokenTypes.MINUS:
+                additive_ops.append(self.__tokens.token.type)
+                self.__tokens.advance()
                 multipl_expr = self.parse_multipl_expr()
                 if multipl_expr:
                     multipl_exprs.append(multipl_expr)
                 else:
-                    raise SyntaxxError(self.__lexer.line, self.__lexer.column)
+                    raise SyntaxxError(self.__tokens.line, self.__tokens.column)
             return Expression(multipl_exprs, additive_ops)
         return None
 
@@ -360,14 +363,14 @@ class Parser:
         primary_expr = self.parse_primary_expr()
         if primary_expr:
             primary_exprs.append(primary_expr)
-            while self.__lexer.token.type == TokenTypes.MULTIPLY or self.__lexer.token.type == TokenTypes.DIVIDE:
-                multipl_ops.append(self.__lexer.token.type)
-                self.__lexer.get_next_token()
+            while self.__tokens.token.type == TokenTypes.MULTIPLY or self.__tokens.token.type == TokenTypes.DIVIDE:
+                multipl_ops.append(self.__tokens.token.type)
+                self.__tokens.advance()
                 primary_expr = self.parse_primary_expr()
                 if primary_expr:
                     primary_exprs.append(primary_expr)
                 else:
-                    raise SyntaxxError(self.__lexer.line, self.__lexer.column)
+                    raise SyntaxxError(self.__tokens.line, self.__tokens.column)
             return MultiplExpr(primary_exprs, multipl_ops)
         return None
 
@@ -384,30 +387,30 @@ class Parser:
         parenth_expr = None
         function_call = None
         id_first = False
-        if self.__lexer.token.type == TokenTypes.MINUS:
+        if self.__tokens.token.type == TokenTypes.MINUS:
             minus = True
-            self.__lexer.get_next_token()
-        if self.__lexer.token.type == TokenTypes.CURRENCY_TYPE:
-            currency1 = self.__lexer.token.value
-            self.__lexer.get_next_token()
-        elif self.__lexer.token.type == TokenTypes.IDENTIFIER:
-            _id = self.__lexer.token.value
+            self.__tokens.advance()
+        if self.__tokens.token.type == TokenTypes.CURRENCY_TYPE:
+            currency1 = self.__tokens.token.value
+            self.__tokens.advance()
+        elif self.__tokens.token.type == TokenTypes.IDENTIFIER:
+            _id = self.__tokens.token.value
             get_currency1 = self.parse_get_currency()
             if get_currency1:
                 _id = None
-                self.__lexer.get_next_token()
+                self.__tokens.advance()
             else:
                 function_call = self.parse_function_call(_id)
                 if function_call:
                     _id = None
                 else:
                     id_first = True
-        if self.__lexer.token.type == TokenTypes.NUMBER:
-            number = self.__lexer.token.numerical_value
-            self.__lexer.get_next_token()
-        elif self.__lexer.token.type == TokenTypes.IDENTIFIER:
-            _id2 = self.__lexer.token.value
-            self.__lexer.get_next_token()
+        if self.__tokens.token.type == TokenTypes.NUMBER:
+            number = self.__tokens.token.numerical_value
+            self.__tokens.advance()
+        elif self.__tokens.token.type == TokenTypes.IDENTIFIER:
+            _id2 = self.__tokens.token.value
+            self.__tokens.advance()
             function_call2 = self.parse_function_call(_id2)
             if function_call2:
                 _id2 = None
@@ -423,55 +426,55 @@ class Parser:
                 return None
         alternatives = [number, _id, parenth_expr, function_call]
         if len([x for x in alternatives if x is not None]) > 1:
-            raise SyntaxxError(self.__lexer.line, self.__lexer.column)
+            raise SyntaxxError(self.__tokens.line, self.__tokens.column)
         currency2 = None
-        if self.__lexer.token.type == TokenTypes.CURRENCY_TYPE:
-            currency2 = self.__lexer.token.value
-            self.__lexer.get_next_token()
-        elif self.__lexer.token.type == TokenTypes.IDENTIFIER:
+        if self.__tokens.token.type == TokenTypes.CURRENCY_TYPE:
+            currency2 = self.__tokens.token.value
+            self.__tokens.advance()
+        elif self.__tokens.token.type == TokenTypes.IDENTIFIER:
             get_currency2 = self.parse_get_currency()
-            self.__lexer.get_next_token()
+            self.__tokens.advance()
         if id_first is True and _id3 is not None:
             _id = _id3
-            if self.__lexer.token.type == TokenTypes.DOT:
-                self.__lexer.get_next_token()
-                if self.__lexer.token.type == TokenTypes.GET_CURRENCY:
-                    self.__lexer.get_next_token()
-                    if self.__lexer.token.type == TokenTypes.OP_BRACKET:
-                        self.__lexer.get_next_token()
-                        if self.__lexer.token.type == TokenTypes.CL_BRACKET:
+            if self.__tokens.token.type == TokenTypes.DOT:
+                self.__tokens.advance()
+                if self.__tokens.token.type == TokenTypes.GET_CURRENCY:
+                    self.__tokens.advance()
+                    if self.__tokens.token.type == TokenTypes.OP_BRACKET:
+                        self.__tokens.advance()
+                        if self.__tokens.token.type == TokenTypes.CL_BRACKET:
                             get_currency2 = GetCurrency(_id2)
-                            self.__lexer.get_next_token()
+                            self.__tokens.advance()
                         else:
-                            raise SyntaxxError(self.__lexer.line, self.__lexer.column)
+                            raise SyntaxxError(self.__tokens.line, self.__tokens.column)
                     else:
-                        raise SyntaxxError(self.__lexer.line, self.__lexer.column)
+                        raise SyntaxxError(self.__tokens.line, self.__tokens.column)
                 else:
-                    raise SyntaxxError(self.__lexer.line, self.__lexer.column)
+                    raise SyntaxxError(self.__tokens.line, self.__tokens.column)
         return PrimaryExpr(minus, currency1, get_currency1, number, _id, parenth_expr, function_call, currency2,
                            get_currency2)
 
     def parse_parenth_expr(self):  # “(”, expression, “)” ;
-        if self.__lexer.token.type == TokenTypes.OP_BRACKET:
-            self.__lexer.get_next_token()
+        if self.__tokens.token.type == TokenTypes.OP_BRACKET:
+            self.__tokens.advance()
             expression = self.parse_expression()
             if expression:
-                if self.__lexer.token.type == TokenTypes.CL_BRACKET:
-                    self.__lexer.get_next_token()
+                if self.__tokens.token.type == TokenTypes.CL_BRACKET:
+                    self.__tokens.advance()
                     return ParenthExpr(expression)
-            raise SyntaxxError(self.__lexer.line, self.__lexer.column)
+            raise SyntaxxError(self.__tokens.line, self.__tokens.column)
         return None
 
     def parse_get_currency(self):  # id, “.”, “getCurrency()” ;
-        if self.__lexer.token.type == TokenTypes.IDENTIFIER:
-            _id = self.__lexer.token.value
-            self.__lexer.get_next_token()
-            if self.__lexer.token.type == TokenTypes.DOT:
-                self.__lexer.get_next_token()
-                if self.__lexer.token.type == TokenTypes.GET_CURRENCY:
-                    self.__lexer.get_next_token()
-                    if self.__lexer.token.type == TokenTypes.OP_BRACKET:
-                        self.__lexer.get_next_token()
-                        if self.__lexer.token.type == TokenTypes.CL_BRACKET:
+        if self.__tokens.token.type == TokenTypes.IDENTIFIER:
+            _id = self.__tokens.token.value
+            self.__tokens.advance()
+            if self.__tokens.token.type == TokenTypes.DOT:
+                self.__tokens.advance()
+                if self.__tokens.token.type == TokenTypes.GET_CURRENCY:
+                    self.__tokens.advance()
+                    if self.__tokens.token.type == TokenTypes.OP_BRACKET:
+                        self.__tokens.advance()
+                        if self.__tokens.token.type == TokenTypes.CL_BRACKET:
                             return GetCurrency(_id)
         return None
@@ -0,0 +1,55 @@
+from array import array
+from collections.abc import Mapping
+from types import MappingProxyType
+
+
+class CompactRates(Mapping):  # rates as flat columns of target ids and float64 rates, one range per currency
+    def __init__(self):
+        self.codes = []
+        self.ids = {}
+        self.targets = array('i')
+        self.rates = array('d')
+        self.ranges = {}  # currency code -> (start, end) of its rates in the columns
+        self.current = None  # currency whose rates are being added and where they start
+
+    def code_id(self, code):
+        code_id = self.ids.get(code)
+        if code_id is None:
+            code_id = self.ids[code] = len(self.codes)
+            self.codes.append(code)
+        return code_id
+
+    def start(self, currency):  # rates added until end() belong to the currency, replacing any earlier ones
+        self.current = (currency, len(self.rates))
+
+    def add(self, rates):  # target -> rate
+        start = len(self.rates)
+        try:
+            self.rates.extend(rates.values())
+        except TypeError:
+            del self.rates[start:]
+            raise
+        self.targets.extend(map(self.code_id, rates))
+
+    def end(self):
+        currency, start = self.current
+        self.ranges[currency] = (start, len(self.rates))
+
+    def edges(self):  # (currency, target, rate) for every quoted pair
+        codes, targets, rates = self.codes, self.targets, self.rates
+        for currency, (start, end) in self.ranges.items():
+            for index in range(start, end):
+                yield currency, codes[targets[index]], rates[index]
+
+    def __getitem__(self, currency):
+        start, end = self.ranges[currency]
+        return MappingProxyType({self.codes[self.targets[index]]: self.rates[index] for index in range(start, end)})
+
+    def __contains__(self, currency):
+        return currency in self.ranges
+
+    def __iter__(self):
+        return iter(self.ranges)
+
+    def __len__(self):
+        return len(self.ranges)
@@ -1,2 +1,44 @@
+import threading
+from .rate_snapshot import RateSnapshot
+
+
+class PinnedSnapshot(threading.local):  # the snapshot a running program reads its rates from, per thread
+    snapshot = None
+    table = None
+
+
 class Currencies:
     currencies = {}
+    snapshot = None  # latest published version of the rates
+    pinned = PinnedSnapshot()
+    lock = threading.Lock()  # a rate watcher thread publishes while runs read the latest snapshot
+
+    @classmethod
+    def current(cls):  # rates assigned to Currencies.currencies directly get a snapshot of their own
+        snapshot = cls.snapshot
+        if snapshot is None or snapshot.currencies is not cls.currencies:
+            with cls.lock:  # not while a publish has set only one of the two
+                snapshot = cls.snapshot
+                if snapshot is None or snapshot.currencies is not cls.currencies:
+                    snapshot = cls.snapshot = RateSnapshot(cls.currencies)
+        return snapshot
+
+    @classmethod
+    def publish(cls, snapshot):  # runs already in progress keep the snapshot they pinned
+        with cls.lock:
+            cls.currencies = snapshot.currencies
+            cls.snapshot = snapshot
+
+    @classmethod
+    def pin(cls, snapshot):  # returns the previously pinned snapshot, to be restored when the run ends
+        previous = cls.pinned.snapshot
+        cls.pinned.snapshot = snapshot
+        cls.pinned.table = snapshot.table() if snapshot is not None else None
+        return previous
+
+    @classmethod
+    def table(cls):
+        table = (cls.pinned.snapshot or cls.current()).table()
+        if cls.pinned.snapshot is not None:
+            cls.pinned.table = table
+        return table
@@ -1,8 +1,29 @@
+import hashlib
 import json
+import os
 from .currencies import Currencies
+from .rate_snapshot import RateSnapshot
+from .rate_stream import JsonRateStream
+from .rate_file import MatrixRates, is_rate_file
+from .indexed_rates import IndexedJsonRates
 
 
 class CurrenciesReader:
-    def __init__(self, file_path):
-        with open(file_path, 'r') as file:
-            Currencies.currencies = json.loads(file.read())
+    STREAMING_SIZE = 16 << 20  # larger files are streamed into a compact table instead of a nested dict
+
+    def __init__(self, file_path, streaming=None, lazy=False):
+        if is_rate_file(file_path) or lazy:  # only the header, or an index of the currencies, is read here
+            rates = MatrixRates(file_path) if is_rate_file(file_path) else IndexedJsonRates(file_path)
+            Currencies.publish(RateSnapshot(rates, rates.digest))
+            return
+        if streaming is None:
+            streaming = os.path.getsize(file_path) >= self.STREAMING_SIZE
+        with open(file_path, 'rb') as file:
+            if streaming:
+                stream = JsonRateStream(file)
+                snapshot = RateSnapshot(stream.read(), stream.digest.hexdigest())
+            else:
+                content = file.read()
+                snapshot = RateSnapshot.freeze(json.loads(content), hashlib.sha256(content).hexdigest(),
+                                               Currencies.snapshot)
+        Currencies.publish(snapshot)
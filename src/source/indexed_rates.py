@@ -0,0 +1,50 @@
+import hashlib
+import json
+import mmap
+import re
+from collections.abc import Mapping
+from types import MappingProxyType
+
+
+OPENING = re.compile(rb'[ \t\n\r]*\{[ \t\n\r]*')
+CLOSING = re.compile(rb'\}[ \t\n\r]*')
+# "currency": {rates} and what follows; no repetition nests another that matches the same text, so a truncated file
+# fails without backtracking through every way to split its rates
+CURRENCY = re.compile(rb'("[^"\\]*(?:\\.[^"\\]*)*")[ \t\n\r]*:[ \t\n\r]*'
+                      rb'(\{[^"}]*(?:"[^"\\]*(?:\\.[^"\\]*)*"[^"}]*)*\})[ \t\n\r]*(,?)[ \t\n\r]*')
+
+
+class IndexedJsonRates(Mapping):  # a memory-mapped rates json file; a currency's rates are decoded when first asked for
+    def __init__(self, path):
+        self.path = path
+        self.ranges = {}  # currency code -> (start, end) of its rates object in the file
+        with open(path, 'rb') as file:
+            self.mapping = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) if file.seek(0, 2) else b''
+        self.digest = hashlib.sha256(self.mapping).hexdigest()
+        match = OPENING.match(self.mapping)
+        if match is None:
+            raise ValueError("Expecting '{': char 0")
+        position = match.end()
+        separator = self.mapping[position:position + 1] != b'}'
+        while separator:
+            match = CURRENCY.match(self.mapping, position)
+            if match is None:
+                raise ValueError(f"Expecting property name and object of rates: char {position}")
+            self.ranges[json.loads(match.group(1))] = match.span(2)
+            position, separator = match.end(), match.group(3)
+        match = CLOSING.match(self.mapping, position)
+        if match is None or match.end() != len(self.mapping):
+            raise ValueError(f"Expecting '}}' and end of file: char {position}")
+
+    def __getitem__(self, currency):
+        start, end = self.ranges[currency]
+        return MappingProxyType(json.loads(self.mapping[start:end]))
+
+    def __contains__(self, currency):
+        return currency in self.ranges
+
+    def __iter__(self):
+        return iter(self.ranges)
+
+    def __len__(self):
+        return len(self.ranges)
@@ -0,0 +1,93 @@
+import hashlib
+import math
+import mmap
+import os
+import struct
+from array import array
+from collections.abc import Mapping
+from types import MappingProxyType
+from .rate_stream import JsonRateStream
+from ..exceptions.exceptions import InvalidRateFileError
+
+
+MAGIC = b'CPLR'
+VERSION = 1
+HEADER = struct.Struct('<4sHHIII32s')  # magic, version, unused, codes, source codes, codes bytes, source digest
+
+
+def is_rate_file(path):
+    with open(path, 'rb') as file:
+        return file.read(len(MAGIC)) == MAGIC
+
+
+def matrix_offset(code_size):  # the float64 matrix starts 8-byte aligned after the code table
+    return (HEADER.size + code_size + 7) // 8 * 8
+
+
+def compile_rates(json_path, rates_path):  # rates json -> .cpr file with a dense matrix, NaN for missing pairs
+    with open(json_path, 'rb') as file:
+        stream = JsonRateStream(file)
+        rates = stream.read()
+    codes = list(rates)  # currencies with rates of their own first, then the ones only quoted as targets
+    ids = {code: index for index, code in enumerate(codes)}
+    for currency, target, rate in rates.edges():
+        if target not in ids:
+            ids[target] = len(codes)
+            codes.append(target)
+    size = len(codes)
+    matrix = array('d', [math.nan]) * (size * size)
+    for currency, target, rate in rates.edges():
+        matrix[ids[currency] * size + ids[target]] = rate
+    code_bytes = '\n'.join(codes).encode()
+    header = HEADER.pack(MAGIC, VERSION, 0, size, len(rates), len(code_bytes), stream.digest.digest())
+    temporary_path = f"{rates_path}.{os.getpid()}.tmp"
+    with open(temporary_path, 'wb') as file:
+        file.write((header + code_bytes).ljust(matrix_offset(len(code_bytes)), b'\0'))
+        matrix.tofile(file)
+    os.replace(temporary_path, rates_path)
+
+
+class MatrixRates(Mapping):  # a memory-mapped .cpr file; rows are read from the matrix only when asked for
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'rb') as file:
+            self.mapping = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        buffer = memoryview(self.mapping)
+        if len(buffer) < HEADER.size:
+            raise InvalidRateFileError(path, "file too short")
+        magic, version, _, size, sources, code_size, digest = HEADER.unpack_from(buffer)
+        if magic != MAGIC or version != VERSION:
+            raise InvalidRateFileError(path, "not a compiled rate file")
+        offset = matrix_offset(code_size)
+        if offset + size * size * 8 != len(buffer):
+            raise InvalidRateFileError(path, "truncated file")
+        self.codes = bytes(buffer[HEADER.size:HEADER.size + code_size]).decode().split('\n') if size else []
+        self.indices = {code: index for index, code in enumerate(self.codes)}
+        self.sources = sources
+        self.size = size
+        self.digest = digest.hex()
+        self.matrix = buffer[offset:].cast('d')
+
+    def row(self, index):  # (target index, rate) of the quoted rates of a currency
+        size = self.size
+        return [(target, rate) for target, rate in enumerate(self.matrix[index * size:(index + 1) * size].tolist())
+                if rate == rate]
+
+    def close(self):
+        self.matrix.release()
+        self.mapping.close()
+
+    def __getitem__(self, currency):
+        if currency not in self:
+            raise KeyError(currency)
+        return MappingProxyType({self.codes[target]: rate for target, rate in self.row(self.indices[currency])})
+
+    def __contains__(self, currency):
+        index = self.indices.get(currency)
+        return index is not None and index < self.sources
+
+    def __iter__(self):
+        return iter(self.codes[:self.sources])
+
+    def __len__(self):
+        return self.sources
@@ -0,0 +1,142 @@
+import datetime
+import json
+import mmap
+import os
+import struct
+from array import array
+from bisect import bisect_left, bisect_right
+from ..exceptions.exceptions import InvalidRateFileError
+
+
+MAGIC = b'CPLH'
+VERSION = 1
+HEADER = struct.Struct('<4sHHIIII')  # magic, version, unused, codes bytes, pairs, rows, dates; padded to 32 bytes
+HEADER_SIZE = 32
+
+
+def read_daily_rates(directory):  # one rates file per day, named like 2024-01-31.json
+    days = {}
+    for name in os.listdir(directory):
+        stem, extension = os.path.splitext(name)
+        if extension != '.json':
+            continue
+        try:
+            day = datetime.date.fromisoformat(stem)
+        except ValueError:
+            continue
+        with open(os.path.join(directory, name), 'r') as file:
+            days[day] = json.loads(file.read())
+    return days
+
+
+def build_history(days):  # {date: currencies} -> bytes of a history file
+    codes = []
+    ids = {}
+    quotes = {}  # (from id, to id) -> [(ordinal, rate)]
+    for day in sorted(days):
+        for currency, rates in days[day].items():
+            for target, rate in rates.items():
+                for code in (currency, target):
+                    if code not in ids:
+                        ids[code] = len(codes)
+                        codes.append(code)
+                quotes.setdefault((ids[currency], ids[target]), []).append((day.toordinal(), rate))
+    rates, dates = array('d'), array('i')
+    pair_from, pair_to, pair_start = array('i'), array('i'), array('i')
+    for (from_id, to_id), series in sorted(quotes.items()):
+        pair_from.append(from_id)
+        pair_to.append(to_id)
+        pair_start.append(len(dates))
+        for ordinal, rate in series:
+            dates.append(ordinal)
+            rates.append(rate)
+    pair_start.append(len(dates))
+    quoted_dates = array('i', sorted({day.toordinal() for day in days}))
+    code_bytes = '\n'.join(codes).encode()
+    header = HEADER.pack(MAGIC, VERSION, 0, len(code_bytes), len(pair_from), len(rates), len(quoted_dates))
+    # float64 column first so that every column stays aligned for memoryview casts
+    return b''.join([header.ljust(HEADER_SIZE, b'\0'), rates.tobytes(), dates.tobytes(), quoted_dates.tobytes(),
+                     pair_from.tobytes(), pair_to.tobytes(), pair_start.tobytes(), code_bytes])
+
+
+def write_history(path, days):
+    temporary_path = f"{path}.{os.getpid()}.tmp"
+    with open(temporary_path, 'wb') as file:
+        file.write(build_history(days))
+    os.replace(temporary_path, path)
+
+
+class RateHistory:  # columnar (date, from, to, rate) store, sorted by pair and date for as-of lookups
+    def __init__(self, source):
+        self.path = source if isinstance(source, (str, os.PathLike)) else '<buffer>'
+        self.mapping = None
+        if isinstance(source, (bytes, bytearray)):
+            buffer = memoryview(source)
+        else:
+            with open(source, 'rb') as file:
+                self.mapping = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+            buffer = memoryview(self.mapping)
+        if len(buffer) < HEADER_SIZE:
+            raise InvalidRateFileError(self.path, "file too short")
+        magic, version, _, code_size, pairs, rows, dates = HEADER.unpack_from(buffer)
+        if magic != MAGIC or version != VERSION:
+            raise InvalidRateFileError(self.path, "not a rate history file")
+        layout = (('d', rows), ('i', rows), ('i', dates), ('i', pairs), ('i', pairs), ('i', pairs + 1))
+        if HEADER_SIZE + sum(length * struct.calcsize(typecode) for typecode, length in layout) + code_size \
+                != len(buffer):
+            raise InvalidRateFileError(self.path, "truncated file")
+        offset = HEADER_SIZE
+        columns = []
+        for typecode, length in layout:
+            end = offset + length * struct.calcsize(typecode)
+            columns.append(buffer[offset:end].cast(typecode))
+            offset = end
+        self.rates, self.dates, self.quoted_dates, self.pair_from, self.pair_to, self.pair_start = columns
+        self.codes = bytes(buffer[offset:]).decode().split('\n') if code_size else []
+        self.ids = {code: currency_id for currency_id, code in enumerate(self.codes)}
+        self.buffer = buffer
+
+    def close(self):
+        for column in (self.rates, self.dates, self.quoted_dates, self.pair_from, self.pair_to, self.pair_start):
+            column.release()
+        self.buffer.release()
+        if self.mapping is not None:
+            self.mapping.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exception):
+        self.close()
+
+    def days(self, start=None, end=None):  # dates with quotes in the file, within [start, end]
+        low = 0 if start is None else bisect_left(self.quoted_dates, start.toordinal())
+        high = len(self.quoted_dates) if end is None else bisect_right(self.quoted_dates, end.toordinal())
+        return [datetime.date.fromordinal(self.quoted_dates[index]) for index in range(low, high)]
+
+    def as_of(self, pair, ordinal):  # row of the latest quote of the pair made on or before the date
+        start, end = self.pair_start[pair], self.pair_start[pair + 1]
+        row = bisect_right(self.dates, ordinal, start, end) - 1
+        return row if row >= start else None
+
+    def rate(self, from_code, to_code, day):
+        from_id, to_id = self.ids.get(from_code), self.ids.get(to_code)
+        if from_id is not None and to_id is not None:
+            low = bisect_left(self.pair_from, from_id)
+            high = bisect_right(self.pair_from, from_id, low)
+            pair = bisect_left(self.pair_to, to_id, low, high)
+            if pair < high and self.pair_to[pair] == to_id:
+                row = self.as_of(pair, day.toordinal())
+                if row is not None:
+                    return self.rates[row]
+        raise KeyError(from_code if from_id is None else to_code)
+
+    def currencies(self, day):  # the rates in force on the date, shaped like a rates json file
+        ordinal = day.toordinal()
+        currencies = {}
+        for pair in range(len(self.pair_from)):
+            row = self.as_of(pair, ordinal)
+            if row is not None:
+                currencies.setdefault(self.codes[self.pair_from[pair]], {})[self.codes[self.pair_to[pair]]] = \
+                    self.rates[row]
+        return currencies
@@ -0,0 +1,30 @@
+import itertools
+from types import MappingProxyType
+from .rate_table import RateTable
+
+
+class RateSnapshot:  # one immutable version of the rates; its table is built on first use
+    versions = itertools.count(1)
+
+    def __init__(self, currencies, digest=None):
+        self.version = next(self.versions)
+        self.digest = digest  # of the file the rates were read from, to skip reloading unchanged files
+        self.currencies = currencies
+        self.rate_table = None
+
+    @classmethod
+    def freeze(cls, currencies, digest=None, previous=None):  # currencies whose rates did not change are shared
+        old = previous.currencies if previous is not None else {}
+        frozen = {}
+        for currency, rates in currencies.items():
+            old_rates = old.get(currency)
+            frozen[currency] = old_rates if old_rates == rates else MappingProxyType(dict(rates))
+        return cls(MappingProxyType(frozen), digest)
+
+    def table(self):
+        table = self.rate_table
+        if table is None:
+            table = self.rate_table = RateTable(self.currencies)
+        elif table.size != len(RateTable.codes):  # codes interned since only get rows without rates
+            table.extend()
+        return table
@@ -0,0 +1,100 @@
+import codecs
+import hashlib
+import json
+import re
+from .compact_rates import CompactRates
+
+
+WHITESPACE = re.compile(r'[ \t\n\r]*')
+STRING = re.compile(r'"(?:[^"\\]|\\.)*"')
+DECODER = json.JSONDecoder()
+
+
+class JsonRateStream:  # reads a rates json file chunk by chunk, holding at most one currency's rates as a dict
+    def __init__(self, file, chunk_size=1 << 16):
+        self.file = file
+        self.chunk_size = chunk_size
+        self.buffer = ''
+        self.position = 0
+        self.consumed = 0  # characters dropped from the front of the buffer, for error offsets
+        self.digest = hashlib.sha256()
+        self.decoder = codecs.getincrementaldecoder('utf-8')()  # characters may be split between chunks
+
+    def fill(self):
+        chunk = self.file.read(self.chunk_size)
+        if not chunk:
+            return False
+        if isinstance(chunk, bytes):
+            self.digest.update(chunk)
+            chunk = self.decoder.decode(chunk)
+        else:
+            self.digest.update(chunk.encode())
+        self.consumed += self.position
+        self.buffer = self.buffer[self.position:] + chunk
+        self.position = 0
+        return True
+
+    def error(self, expected):
+        return ValueError(f"Expecting {expected}: char {self.consumed + self.position}")
+
+    def peek(self):  # next character that is not whitespace, '' at the end of the file
+        while True:
+            self.position = WHITESPACE.match(self.buffer, self.position).end()
+            if self.position < len(self.buffer):
+                return self.buffer[self.position]
+            if not self.fill():
+                return ''
+
+    def expect(self, character):
+        if self.peek() != character:
+            raise self.error(f"'{character}'")
+        self.position += 1
+
+    def key(self):
+        self.peek()
+        match = STRING.match(self.buffer, self.position)
+        while match is None and self.fill():  # the string may continue in the next chunk
+            match = STRING.match(self.buffer, self.position)
+        if match is None:
+            raise self.error('property name enclosed in double quotes')
+        self.position = match.end()
+        return json.loads(match.group())
+
+    def read_rates(self, rates, currency):  # the object of one currency is decoded at once by the json module
+        self.peek()
+        while True:
+            if len(self.buffer) - self.position < self.chunk_size:
+                self.fill()
+            try:
+                row, self.position = DECODER.raw_decode(self.buffer, self.position)
+                break
+            except json.JSONDecodeError as error:
+                if not self.fill():  # not an object that continues in the next chunk
+                    raise self.error(f"rates of {currency} ({error.msg})")
+        if not isinstance(row, dict):
+            raise self.error(f"rates of {currency}")
+        rates.start(currency)
+        try:
+            rates.add(row)
+        except TypeError:
+            raise self.error(f"numbers as rates of {currency}")
+        rates.end()
+
+    def read(self, rates=None):  # fills and returns a CompactRates table
+        if rates is None:
+            rates = CompactRates()
+        self.expect('{')
+        if self.peek() == '}':
+            self.position += 1
+        else:
+            while True:
+                currency = self.key()
+                self.expect(':')
+                self.read_rates(rates, currency)
+                if self.peek() != ',':
+                    break
+                self.position += 1
+            self.expect('}')
+        if self.peek() != '':
+            raise self.error('end of file')
+        return rates
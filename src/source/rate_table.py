@@ -0,0 +1,103 @@
+import threading
+
+
+class RateRow(dict):  # rates from one currency by target id; a missing one is resolved by the table and remembered
+    __slots__ = ('table', 'currency_id')
+
+    def __init__(self, table, currency_id, rates=()):
+        super().__init__(rates)
+        self.table = table
+        self.currency_id = currency_id
+
+    def __missing__(self, to_id):
+        return self.table.rate(self.currency_id, to_id)
+
+
+class RateTable:  # sparse rate graph; pairs without a quoted rate are triangulated on first use and memoized
+    codes = [None]  # id -> currency code, shared by all tables so ids stay valid when rates are reloaded
+    ids = {None: 0}  # id 0 stands for a currency variable without a currency
+    lock = threading.Lock()
+
+    def __init__(self, currencies, cache_size=65536):
+        self.source = currencies
+        self.cache_size = cache_size
+        self.memoized = {}  # (from id, to id) of triangulated rates in rows, oldest first
+        for currency in currencies:
+            self.intern(currency)
+        self.size = 0
+        self.rows = []  # from id -> {to id: rate}, filled as pairs are first converted
+        self.edges = []  # from id -> quoted rates by target id, read from the source when first searched
+        self.rows_lock = threading.Lock()  # runs pinned to the same snapshot share the table
+        self.extend()
+
+    def extend(self):  # rows for currencies interned after the table was built
+        with self.rows_lock:  # another thread may have added them since the size was checked
+            for currency_id in range(len(self.rows), len(self.codes)):
+                self.rows.append(RateRow(self, currency_id, {currency_id: 1.0} if currency_id else ()))
+                self.edges.append(None)
+            self.size = len(self.rows)
+
+    @classmethod
+    def intern(cls, code):
+        currency_id = cls.ids.get(code)
+        if currency_id is None:
+            with cls.lock:  # snapshots may be built by a rate watcher thread
+                currency_id = cls.ids.get(code)
+                if currency_id is None:
+                    cls.codes.append(code)
+                    currency_id = cls.ids[code] = len(cls.codes) - 1
+        return currency_id
+
+    def quoted(self, currency_id):  # rates quoted from the currency in the rates file, by target id
+        edges = self.edges[currency_id]
+        if edges is None:
+            code = self.codes[currency_id]
+            rates = self.source[code].items() if code in self.source else ()
+            edges = self.edges[currency_id] = {self.intern(target): rate for target, rate in rates}
+            if self.size != len(self.codes):
+                self.extend()
+        return edges
+
+    def rate(self, from_id, to_id):
+        if self.size != len(self.codes):
+            self.extend()
+        rate = self.rows[from_id].get(to_id)
+        if rate is None:
+            rate = self.quoted(from_id).get(to_id)
+            if rate is not None:
+                self.rows[from_id][to_id] = rate
+        if rate is None:
+            rate = self.best_path_rate(from_id, to_id)
+            if rate is None:  # raise like the nested dict lookup of the rates file would
+                from_code = self.codes[from_id]
+                raise KeyError(from_code if from_code not in self.source else self.codes[to_id])
+            self.memoize(from_id, to_id, rate)
+        return rate
+
+    def best_path_rate(self, from_id, to_id):  # fewest conversions first, then the highest rate among them
+        layer = {from_id: 1.0}  # currencies first reached after the same number of conversions -> best rate
+        reached = {from_id}
+        while layer:
+            best = None
+            for currency_id, rate in layer.items():
+                edge_rate = self.quoted(currency_id).get(to_id)
+                if edge_rate is not None and (best is None or rate * edge_rate > best):
+                    best = rate * edge_rate
+            if best is not None:
+                return best
+            next_layer = {}
+            for currency_id, rate in layer.items():
+                for target_id, edge_rate in self.quoted(currency_id).items():
+                    if target_id not in reached and rate * edge_rate > next_layer.get(target_id, -1.0):
+                        next_layer[target_id] = rate * edge_rate
+            reached.update(next_layer)
+            layer = next_layer
+        return None
+
+    def memoize(self, from_id, to_id, rate):
+        if len(self.memoized) >= self.cache_size:
+            oldest = next(iter(self.memoized), None)  # pop: runs pinned to the same snapshot share the table
+            if oldest is not None and self.memoized.pop(oldest, False) is None:
+                self.rows[oldest[0]].pop(oldest[1], None)
+        self.memoized[from_id, to_id] = None
+        self.rows[from_id][to_id] = rate
@@ -0,0 +1,53 @@
+import hashlib
+import json
+import os
+import threading
+from .currencies import Currencies
+from .rate_snapshot import RateSnapshot
+
+
+class RateWatcher:  # polls a rates file and publishes a new snapshot, built off the running programs, when it changes
+    def __init__(self, file_path, interval=1.0):
+        self.file_path = file_path
+        self.interval = interval
+        self.stamp = None  # modification time and size of the last file read
+        self.error = None  # the last file that could not be read or parsed is skipped until it changes again
+        self.stopped = threading.Event()
+        self.thread = None
+
+    def check(self):  # returns the published snapshot, or None when the rates did not change
+        stat = os.stat(self.file_path)
+        stamp = (stat.st_mtime_ns, stat.st_size)
+        if stamp == self.stamp:
+            return None
+        with open(self.file_path, 'rb') as file:
+            content = file.read()
+        self.stamp = stamp
+        digest = hashlib.sha256(content).hexdigest()
+        current = Currencies.snapshot
+        if current is not None and current.digest == digest:
+            return None
+        snapshot = RateSnapshot.freeze(json.loads(content), digest, current)
+        snapshot.table()  # built here so that the next run does not have to
+        Currencies.publish(snapshot)
+        return snapshot
+
+    def watch(self):
+        while not self.stopped.wait(self.interval):
+            try:
+                self.check()
+                self.error = None
+            except (OSError, ValueError) as error:  # e.g. a file that is still being written; keep the current rates
+                self.error = error
+
+    def start(self):
+        self.stopped.clear()
+        self.thread = threading.Thread(target=self.watch, name='currencypl-rate-watcher', daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.stopped.set()
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
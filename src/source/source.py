@@ -1,3 +1,7 @@
+import mmap
+import os
+
+
 class Source:
     def __init__(self, source_stream):
         self.source_stream = source_stream
@@ -5,9 +9,24 @@ class Source:
     def move_carr_one_pos(self):
         pass
 
+    def peek(self, n=1):
+        pass
+
+    def read_remaining(self):
+        pass
+
     def get_position(self):
         pass
 
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exception):
+        self.close()
+
 
 class FileSource(Source):
     def __init__(self, file_source):
@@ -26,5 +45,112 @@ class FileSource(Source):
         else:
             self.column += 1
 
+    def peek(self, n=1):
+        position = self.source_stream.tell()
+        characters = self.source_stream.read(n)
+        self.source_stream.seek(position)
+        return characters[n - 1:n]
+
+    def read_remaining(self):
+        return self.source_stream.read()
+
+    def get_position(self):
+        return self.line, self.column
+
+
+class BufferedSource(Source):
+    def __init__(self, file_source):
+        super(BufferedSource, self).__init__(file_source)
+        self.buffer = file_source.read()
+        self.position = -1
+        self.line = 1
+        self.line_start = -1
+        self.character = None
+
+    @property
+    def column(self):
+        return self.position - self.line_start + 1
+
+    def move_carr_one_pos(self):
+        self.position += 1
+        if self.position < len(self.buffer):
+            self.character = self.buffer[self.position]
+            if self.character == '\n':
+                self.line += 1
+                self.line_start = self.position
+        else:
+            self.character = ''
+
+    def peek(self, n=1):
+        index = self.position + n
+        if index < len(self.buffer):
+            return self.buffer[index]
+        return ''
+
+    def read_remaining(self):
+        return self.buffer[self.position + 1:]
+
+    def seek(self, position):
+        self.position = position - 1
+        self.line = self.buffer.count('\n', 0, position) + 1
+        self.line_start = self.buffer.rfind('\n', 0, position)
+        self.character = None
+
+    def get_position(self):
+        return self.line, self.column
+
+
+class MmapSource(Source):
+    def __init__(self, file_source):
+        super(MmapSource, self).__init__(file_source)
+        if os.fstat(file_source.fileno()).st_size > 0:
+            self.buffer = mmap.mmap(file_source.fileno(), 0, access=mmap.ACCESS_READ)
+        else:
+            self.buffer = b''
+        self.byte_position = 0
+        self.line = 1
+        self.column = 1
+        self.character = None
+
+    def move_carr_one_pos(self):
+        self.character, width = self.decode_at(self.byte_position)
+        self.byte_position += width
+        if self.character == '\n':
+            self.line += 1
+            self.column = 1
+        else:
+            self.column += 1
+
+    def peek(self, n=1):
+        position = self.byte_position
+        character = ''
+        for _ in range(n):
+            character, width = self.decode_at(position)
+            position += width
+        return character
+
+    def decode_at(self, position):
+        if position >= len(self.buffer):
+            return '', 0
+        byte = self.buffer[position]
+        if byte == 0x0D:  # newlines translated like a file opened in text mode
+            return '\n', 2 if self.buffer[position + 1:position + 2] == b'\n' else 1
+        if byte < 0x80:
+            return chr(byte), 1
+        if byte >= 0xF0:
+            width = 4
+        elif byte >= 0xE0:
+            width = 3
+        else:
+            width = 2
+        return self.buffer[position:position + width].decode('utf-8'), width
+
+    def read_remaining(self):
+        return self.buffer[self.byte_position:].decode('utf-8').replace('\r\n', '\n').replace('\r', '\n')
+
     def get_position(self):
         return self.line, self.column
+
+    def close(self):
+        if isinstance(self.buffer, mmap.mmap):
+            self.buffer.close()
@@ -0,0 +1,274 @@
+from ..compiler.opcodes import *
+from ..interpreter.utils import *
+from ..exceptions.exceptions import MainNotDeclaredError, UndeclaredError, OverwriteError, CurrencyNotDefinedError, \
+    InvalidVariableTypeError, GetCurrencyError, DivisionZeroError, CurrencyUsedForDecimalVariableError, \
+    IllicitOperationError, ChangeVariableTypeError, CurrencyNotDefinedOrChangeVariableTypeError, CallDepthError
+
+
+COMPARE_FUNCTIONS = [
+    lambda a, b: a > b,
+    lambda a, b: a < b,
+    lambda a, b: a >= b,
+    lambda a, b: a <= b,
+    lambda a, b: a == b,
+    lambda a, b: a != b
+]
+
+
+MAX_DEPTH = 100000
+
+
+class VirtualMachine:  # stack machine executing a CompiledProgram, one list of slots per function frame
+    def __init__(self, program, max_depth=MAX_DEPTH):
+        self.program = program
+        self.max_depth = max_depth  # calls that may be running at once, kept on a list instead of the Python stack
+
+    def run(self):
+        if self.program.entry is None:
+            raise MainNotDeclaredError()
+        self.execute(self.program.entry, [None] * self.program.entry.frame_size)
+
+    @staticmethod
+    def frame(function, arguments, checked=False):
+        if not checked:
+            check_arguments(function.function_def, arguments)
+        frame = [None] * function.frame_size
+        for slot, argument in zip(function.parameters, arguments):
+            if frame[slot] is not None:
+                raise OverwriteError(function.local_names[slot])
+            frame[slot] = argument
+        return frame
+
+    def execute(self, function, frame):
+        code = function.code
+        constants = function.constants
+        local_names = function.local_names
+        functions = self.program.functions
+        calls = []  # the state of every caller: function, frame, operand stack, return value and pc
+        stack = []
+        push = stack.append
+        pop = stack.pop
+        return_value = None
+        pc = 0
+        while True:
+            opcode = code[pc]
+            argument = code[pc + 1]
+            pc += 2
+            if opcode == LOAD_VAR:
+                variable = frame[argument]
+                if variable is None:
+                    raise UndeclaredError(local_names[argument])
+                if type(variable) is CurrencyVariable:
+                    push(CurrencyVariable(variable.name, variable.value, currency_id=variable.currency_id))
+                else:
+                    push(DecimalVariable(variable.name, variable.value))
+            elif opcode == LOAD_DEC:
+                push(DecimalVariable('', constants[argument]))
+            elif opcode == LOAD_CUR:
+                value, currency_id = constants[argument]
+                push(CurrencyVariable('', value, currency_id=currency_id))
+            elif opcode == LOAD_CONST:
+                push(constants[argument])
+            elif opcode == LOAD_CURRENCY:
+                push(argument)
+            elif opcode == ADD_TYPED:
+                value = pop()
+                if argument:
+                    value.exchange_id(stack[-1].currency_id)
+                stack[-1].value += value.value
+            elif opcode == SUB_TYPED:
+                value = pop()
+                if argument:
+                    value.exchange_id(stack[-1].currency_id)
+                stack[-1].value -= value.value
+            elif opcode == MUL_DEC:
+                value = pop()
+                stack[-1].value *= value.value
+            elif opcode == DIV_DEC:
+                value = pop()
+                if value.value == 0:
+                    raise DivisionZeroError()
+                stack[-1].value /= value.value
+            elif opcode == ADD or opcode == SUB:
+                value = pop()
+                result = stack[-1]
+                if isinstance(value, DecimalVariable):
+                    if isinstance(result, CurrencyVariable):
+                        raise IllicitOperationError()
+                elif isinstance(value, CurrencyVariable):
+                    if isinstance(result, DecimalVariable):
+                        raise IllicitOperationError()
+                    value.exchange_id(result.currency_id)
+                if opcode == ADD:
+                    result.value += value.value
+                else:
+                    result.value -= value.value
+            elif opcode == MUL:
+                value = pop()
+                result = stack[-1]
+                if isinstance(value, DecimalVariable):
+                    result.value *= value.value
+                    if isinstance(result, CurrencyVariable):
+                        pc = argument
+                elif isinstance(value, CurrencyVariable):
+                    if isinstance(result, CurrencyVariable):
+                        raise IllicitOperationError()
+                    value.value *= result.value
+                    stack[-1] = value
+                    pc = argument
+            elif opcode == DIV:
+                value = pop()
+                if value.value == 0:
+                    raise DivisionZeroError()
+                if isinstance(value, CurrencyVariable):
+                    raise IllicitOperationError()
+                result = stack[-1]
+                result.value /= value.value
+                if isinstance(result, CurrencyVariable):
+                    pc = argument
+            elif opcode == COMPARE:
+                result2 = pop()
+                result1 = pop()
+                unary_op = pop()
+                if isinstance(result1, CurrencyVariable) and isinstance(result2, CurrencyVariable):
+                    result2.exchange_id(result1.currency_id)
+                push(COMPARE_FUNCTIONS[argument](result1.value, result2.value) is not unary_op)
+            elif opcode == POP_JUMP_IF_FALSE:
+                if not pop():
+                    pc = argument
+            elif opcode == POP_JUMP_IF_TRUE:
+                if pop():
+                    pc = argument
+            elif opcode == JUMP:
+                pc = argument
+            elif opcode == TO_BOOL:
+                stack[-1] = bool(stack[-1])
+            elif opcode == IS_TUPLE:
+                stack[-1] = isinstance(stack[-1], tuple)
+            elif opcode == UNWRAP:
+                if isinstance(stack[-1], tuple):
+                    stack[-1] = stack[-1][1]
+            elif opcode == STORE:
+                variable = pop()
+                current = frame[argument]
+                if current is None:
+                    raise UndeclaredError(local_names[argument])
+                if isinstance(current, CurrencyVariable) and current.currency_id == 0 \
+                        and isinstance(variable, DecimalVariable):
+                    raise CurrencyNotDefinedOrChangeVariableTypeError(local_names[argument])
+                if not isinstance(variable, type(current)):
+                    raise ChangeVariableTypeError(local_names[argument])
+                variable.name = local_names[argument]
+                frame[argument] = variable
+            elif opcode == LOAD_FUNCTION:
+                name = function.names[argument]
+                callee = functions.get(name)
+                if callee is None:
+                    raise UndeclaredError(name)
+                push(callee)
+            elif opcode == CALL or opcode == CALL_TYPED:
+                if argument:
+                    arguments = stack[-argument:]
+                    del stack[-argument:]
+                else:
+                    arguments = []
+                callee = stack[-1]
+                callee_frame = self.frame(callee, arguments, opcode == CALL_TYPED)
+                if len(calls) >= self.max_depth:
+                    raise CallDepthError(self.max_depth)
+                calls.append((function, frame, stack, return_value, pc))
+                function, frame = callee, callee_frame
+                code, constants, local_names = function.code, function.constants, function.local_names
+                stack = []
+                push = stack.append
+                pop = stack.pop
+                return_value = None
+                pc = 0
+            elif opcode == SET_RETURN:
+                return_value = pop()
+            elif opcode == JUMP_IF_RETURNING:
+                if return_value is not None:
+                    pc = argument
+            elif opcode == RET:
+                if not calls:
+                    return return_value
+                check_returned_type(function.function_def, return_value)
+                result = return_value
+                function, frame, stack, return_value, pc = calls.pop()
+                code, constants, local_names = function.code, function.constants, function.local_names
+                push = stack.append
+                pop = stack.pop
+                stack[-1] = result
+            elif opcode == NEGATE:
+                stack[-1].value *= -1
+            elif opcode == EXCHANGE_VAR:
+                currencies = stack[-argument:]
+                del stack[-argument:]
+                variable = stack[-1]
+                if isinstance(variable, CurrencyVariable):
+                    for currency_id in currencies:
+                        variable.exchange_id(currency_id)
+                elif len(currencies) > 1:  # the first currency belongs to the variable itself
+                    fail_decimal_conversion(variable)
+            elif opcode == EXCHANGE:
+                value = pop()
+                currencies = stack[-argument:]
+                del stack[-argument:]
+                for currency_id in currencies:
+                    if isinstance(value, CurrencyVariable):
+                        value.exchange_id(currency_id)
+                    else:
+                        fail_decimal_conversion(value)
+                push(value)
+            elif opcode == GET_CURRENCY:
+                variable = frame[argument]
+                if variable is None:
+                    raise UndeclaredError(local_names[argument])
+                if not isinstance(variable, CurrencyVariable):
+                    raise GetCurrencyError(local_names[argument])
+                push(variable.currency_id)
+            elif opcode == LOAD_NUMBER_IN:
+                stack[-1] = CurrencyVariable('', constants[argument], currency_id=stack[-1])
+            elif opcode == TO_STRING:
+                stack[-1] = str(stack[-1].value)
+            elif opcode == PRINT:
+                print_string = ''.join(stack[-argument:]) if argument else ''
+                del stack[len(stack) - argument:]
+                print(print_string)
+            elif opcode == AND:
+                result = True
+                for value in stack[-argument:]:
+                    if not value:
+                        result = False
+                del stack[-argument:]
+                push(result)
+            elif opcode == NOT:
+                stack[-1] = not stack[-1]
+            elif opcode == MAKE_NOT:
+                stack[-1] = (True, stack[-1])
+            elif opcode == POP:
+                pop()
+            elif opcode == DECLARE_DEC or opcode == DECLARE_CUR or opcode == DECLARE_EMPTY_DEC \
+                    or opcode == DECLARE_EMPTY_CUR:
+                name = local_names[argument]
+                if opcode == DECLARE_DEC:
+                    value = pop()
+                    if isinstance(value, CurrencyVariable):
+                        raise CurrencyUsedForDecimalVariableError()
+                    variable = DecimalVariable(name, value.value)
+                elif opcode == DECLARE_CUR:
+                    value = pop()
+                    if not isinstance(value, CurrencyVariable):
+                        raise CurrencyNotDefinedError(name)
+                    variable = CurrencyVariable(name, value.value, currency_id=value.currency_id)
+                elif opcode == DECLARE_EMPTY_DEC:
+                    variable = DecimalVariable(name)
+                else:
+                    variable = CurrencyVariable(name)
+                if frame[argument] is not None:
+                    raise OverwriteError(name)
+                frame[argument] = variable
+            elif opcode == INVALID_TYPE:
+                raise InvalidVariableTypeError(local_names[argument])
+            else:
+                raise ValueError(f"Unknown opcode: {opcode}")
@@ -0,0 +1,64 @@
+import io
+import pytest
+from ..src.lexer.currency_scan import referenced_currencies, referenced_currencies_in_file
+from ..src.lexer.lexer import Lexer
+from ..src.lexer.tokens import Tokens
+from ..src.lexer.token_types import TokenTypes
+from ..src.parser.parser import Parser
+from ..src.source.source import BufferedSource
+from ..src.source.currencies_reader import CurrenciesReader
+from ..src.source.currencies import Currencies
+from ..src.engines import run_program
+from .programs import PROGRAMS
+
+
+CURRENCIES = {'pln', 'chf', 'gbd', 'usd', 'eur'}
+
+
+def test_scan_finds_named_currencies():
+    text = '''void main() {
+    cur a = 10 eur; # usd in a comment
+    cur b = pln a;
+    cur c = 1 b.get_currency();
+    print("chf ", c, eurx, gbd2);
+}'''
+    assert referenced_currencies(text, CURRENCIES) == {'eur', 'pln'}
+
+
+def test_scan_skips_invalid_characters():
+    assert referenced_currencies('@eur $ "pln', CURRENCIES) == {'eur'}
+    assert referenced_currencies('', CURRENCIES) == set()
+
+
+@pytest.mark.parametrize('chunk_size', [1, 2, 3, 7, 64])
+def test_scan_in_chunks_finds_the_same_currencies(chunk_size):
+    for text in [PROGRAMS['currency_functions'], PROGRAMS['accrual'], 'cur a = 1 eur;# pln\n"usd" chf',
+                 'eureur pln"chf\n usd']:
+        expected = referenced_currencies(text, CURRENCIES)
+        assert referenced_currencies_in_file(io.StringIO(text), CURRENCIES, chunk_size) == expected
+
+
+def parse_with(text, currencies):
+    keywords = dict(Tokens.keywords)
+    try:
+        for currency in list(Tokens.keywords):
+            if Tokens.keywords[currency] == TokenTypes.CURRENCY_TYPE:
+                del Tokens.keywords[currency]
+        for currency in currencies:
+            Tokens.keywords[currency] = TokenTypes.CURRENCY_TYPE
+        parser = Parser(Lexer(BufferedSource(io.StringIO(text))))
+        parser.parse_program()
+        return parser.program
+    finally:
+        Tokens.keywords.clear()
+        Tokens.keywords.update(keywords)
+
+
+def test_scanned_keywords_parse_the_same_programs(capsys):
+    CurrenciesReader("resources/currencies.json")
+    for name in ('readme', 'accrual', 'currency_functions', 'conditions'):
+        text = PROGRAMS[name]
+        run_program(parse_with(text, Currencies.currencies))
+        expected = capsys.readouterr().out
+        run_program(parse_with(text, referenced_currencies(text, set(Currencies.currencies))))
+        assert capsys.readouterr().out == expected
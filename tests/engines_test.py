@@ -0,0 +1,57 @@
+import io
+import pytest
+from .programs import PROGRAMS
+from ..src.lexer.tokens import Tokens
+from ..src.lexer.token_types import TokenTypes
+from ..src.lexer.lexer import Lexer
+from ..src.parser.parser import Parser
+from ..src.source.currencies_reader import CurrenciesReader
+from ..src.source.currencies import Currencies
+from ..src.source.source import BufferedSource
+from ..src.engines import run_program
+from ..src.interpreter.variables import DecimalVariable
+
+
+ENGINES = ['closure', 'vm', 'python']
+
+
+def parse(source_string):
+    CurrenciesReader("resources/currencies.json")
+    for currency in Currencies.currencies:
+        Tokens.keywords[currency] = TokenTypes.CURRENCY_TYPE
+    parser = Parser(Lexer(BufferedSource(io.StringIO(source_string))))
+    parser.parse_program()
+    return parser.program
+
+
+def run(capsys, source_string, engine):
+    program = parse(source_string)
+    try:
+        run_program(program, engine)
+        error = None
+    except Exception as exception:
+        error = (type(exception), str(exception))
+    return capsys.readouterr().out, error
+
+
+@pytest.mark.parametrize('engine', ENGINES)
+@pytest.mark.parametrize('name', PROGRAMS.keys())
+def test_engine_matches_visitor(capsys, name, engine):
+    expected = run(capsys, PROGRAMS[name], 'visitor')
+    assert run(capsys, PROGRAMS[name], engine) == expected
+
+
+def test_programs_produce_output(capsys):
+    output, error = run(capsys, PROGRAMS['factorial'], 'visitor')
+    assert output == 'result: 120.0\n'
+    assert error is None
+
+
+@pytest.mark.parametrize('engine', ['visitor'] + ENGINES)
+@pytest.mark.parametrize('source_string', ['void main() { dec a = 1; print(pln a eur); }',
+                                           'void main() { dec a = 1; print((a) eur); }',
+                                           'void main() { print(pln (2) eur); }'])
+def test_converting_a_dec_fails_in_every_engine(capsys, monkeypatch, source_string, engine):
+    monkeypatch.setattr(DecimalVariable, 'exchange', lambda self, currency: None, raising=False)
+    output, error = run(capsys, source_string, engine)
+    assert error == (AttributeError, "'DecimalVariable' object has no attribute 'exchange'")
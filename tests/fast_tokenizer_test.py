@@ -0,0 +1,100 @@
+import ast
+import io
+import os
+import pytest
+from ..src.lexer.lexer import Lexer
+from ..src.lexer.token import TokenTypes
+from ..src.lexer.tokens import Tokens
+from ..src.source.currencies_reader import CurrenciesReader
+from ..src.source.currencies import Currencies
+from ..src.source.source import FileSource, BufferedSource
+
+
+def lexer_test_corpus():
+    path = os.path.join(os.path.dirname(__file__), 'lexer_test.py')
+    with open(path) as file:
+        tree = ast.parse(file.read())
+    corpus = []
+    for function in tree.body:
+        if not isinstance(function, ast.FunctionDef):
+            continue
+        names = {}
+        for node in ast.walk(function):
+            if isinstance(node, ast.Assign) and isinstance(node.targets[0], ast.Name):
+                names[node.targets[0].id] = node.value
+            if isinstance(node, ast.Call) and getattr(node.func, 'id', None) == 'create_lexer':
+                argument = node.args[0]
+                if isinstance(argument, ast.Constant):
+                    corpus.append(argument.value)
+                elif isinstance(argument, ast.Name):
+                    corpus.append(eval(compile(ast.Expression(names[argument.id]), path, 'eval')))
+    return corpus
+
+
+EXTRA_CORPUS = [
+    "dec a = 5;\n\tcur b = a eur;  # comment\n# second comment\n\n  print(\"a\", b);",
+    "# only a comment",
+    "# comment\n  a",
+    "a<b<=c>d>=e!f!=g=h==i",
+    "0005 0.0.5 12. 120.50",
+    "1" * 50 + ".",
+    "1" * 50 + "." + "1",
+    "0." + "1" * 60,
+    '"abc',
+    '"abc\n' + 'a' * 1200,
+    '"' + 'a' * 999 + '"',
+    '"' + 'a' * 1000 + '"',
+    'a' * 50,
+    "cur zł = 5 pln;",
+    "ąb = 1; a b ½",
+    "a _b",
+    "print(\"zażółć gęślą jaźń\");",
+    "5٣ x٣",
+    "ab\x0bcd\x1ce",
+    "#c\n" + "x" * 51 + "ą",
+    "#c\n" + "x" * 40 + "ą" * 20,
+    "#c\n  " + "1" * 51 + "ą",
+    "#c\n\"" + "ą" * 1001 + "\"",
+]
+
+
+def tokenize(source_string, engine):
+    lexer = Lexer(FileSource(io.StringIO(source_string)), engine=engine)
+    tokens = []
+    try:
+        while True:
+            lexer.get_next_token()
+            token = lexer.token
+            tokens.append((token.type, token.value, token.numerical_value, token.line, token.column,
+                           lexer.line, lexer.column))
+            if token.type == TokenTypes.EOT:
+                break
+    except Exception as error:
+        tokens.append((type(error), str(error)))
+    return tokens
+
+
+@pytest.fixture(autouse=True)
+def currency_keywords():
+    CurrenciesReader("resources/currencies.json")
+    for currency in Currencies.currencies:
+        Tokens.keywords[currency] = TokenTypes.CURRENCY_TYPE
+
+
+def test_corpus_is_collected():
+    assert len(lexer_test_corpus()) > 50
+
+
+@pytest.mark.parametrize('source_string', lexer_test_corpus() + EXTRA_CORPUS)
+def test_fast_engine_matches_reference(source_string):
+    assert tokenize(source_string, "fast") == tokenize(source_string, "reference")
+
+
+def test_fast_engine_repeats_eot():
+    lexer = Lexer(BufferedSource(io.StringIO("a  ")), engine="fast")
+    lexer.get_next_token()
+    lexer.get_next_token()
+    assert lexer.token.type == TokenTypes.EOT
+    lexer.get_next_token()
+    assert lexer.token.type == TokenTypes.EOT
+    assert (lexer.line, lexer.column) == (1, 4)
@@ -0,0 +1,59 @@
+import hashlib
+import json
+import time
+import pytest
+from ..src.source.currencies import Currencies
+from ..src.source.currencies_reader import CurrenciesReader
+from ..src.source.indexed_rates import IndexedJsonRates
+from ..src.source.rate_table import RateTable
+
+
+def write(tmp_path, text):
+    path = tmp_path / "rates.json"
+    path.write_text(text)
+    return str(path)
+
+
+def test_index_matches_json():
+    rates = IndexedJsonRates("resources/currencies.json")
+    with open("resources/currencies.json", 'rb') as file:
+        content = file.read()
+    assert rates == json.loads(content)
+    assert list(rates) == list(json.loads(content))
+    assert rates.digest == hashlib.sha256(content).hexdigest()
+
+
+def test_index_decodes_rates_on_demand(tmp_path):
+    rates = IndexedJsonRates(write(tmp_path, ' {"p\\u0142n" : {"eur": 0.25, "}": 1} , "eur":{} }\n'))
+    assert list(rates) == ["płn", "eur"]
+    assert "usd" not in rates
+    assert rates["płn"] == {"eur": 0.25, "}": 1}
+    assert rates["eur"] == {}
+    with pytest.raises(TypeError):
+        rates["eur"]["pln"] = 1
+
+
+@pytest.mark.parametrize('text', ['', '{', '{"pln": 1}', '{"pln": {}} {}', '{"pln": {"eur": 1}},}', '[]',
+                                  '{"pln": {"eur": {"usd": 1}}}'])
+def test_index_errors(tmp_path, text):
+    with pytest.raises(ValueError):
+        IndexedJsonRates(write(tmp_path, text))
+
+
+def test_truncated_file_fails_at_once(tmp_path):
+    with open("resources/currencies.json") as file:
+        text = file.read()
+    rows = '{' + ', '.join(f'"c{index}": {{"pln": 1.{"1" * 40}, "eur": 2}}' for index in range(3)) + '}'
+    for truncated in (text[:len(text) // 2], rows[:-30]):
+        start = time.perf_counter()
+        with pytest.raises(ValueError):
+            IndexedJsonRates(write(tmp_path, truncated))
+        assert time.perf_counter() - start < 1
+
+
+def test_reader_indexes_lazily():
+    CurrenciesReader("resources/currencies.json", lazy=True)
+    assert isinstance(Currencies.currencies, IndexedJsonRates)
+    table = Currencies.table()
+    assert table.rows[RateTable.intern('eur')][RateTable.intern('usd')] == 20
+    assert table.edges[RateTable.intern('pln')] is None
@@ -11,6 +11,17 @@ import io
 import pytest
 
 
+INTERPRETER_MODES = ['visitor', 'closure']
+settings = {'mode': 'visitor'}
+
+
+@pytest.fixture(autouse=True, params=INTERPRETER_MODES)
+def interpreter_mode(request):
+    settings['mode'] = request.param
+    yield request.param
+    settings['mode'] = 'visitor'
+
+
 def create_interpreter(source_string):
     CurrenciesReader("resources/currencies.json")
     currencies = Currencies.currencies
@@ -18,7 +29,7 @@ def create_interpreter(source_string):
         Tokens.keywords[currency] = TokenTypes.CURRENCY_TYPE
     lexer = Lexer(FileSource(io.StringIO(source_string)))
     parser = Parser(lexer)
-    return Interpreter(parser)
+    return Interpreter(parser, mode=settings['mode'])
 
 
 def set_currencies():
@@ -1273,3 +1284,40 @@ def test_function_not_declared():
                                      '}')
     with pytest.raises(UndeclaredError):
         interpreter.interpret()
+
+
+def test_values_are_shared_not_changed():
+    interpreter = create_interpreter('void main() {'
+                                     'cur a = 10 eur;'
+                                     'cur b = a;'
+                                     'b = b + a;'
+                                     'cur c = - a;'
+                                     'dec d = 2;'
+                                     'dec e = d * 3 - d;'
+                                     '}')
+    interpreter.interpret()
+    symbols = interpreter.scope_manager.current_scope.symbols
+    assert symbols['a'].value == 10 and symbols['a'].currency == 'eur'
+    assert symbols['b'].name == 'b' and symbols['b'].value == 20 and symbols['b'].currency == 'eur'
+    assert symbols['c'].value == -10
+    assert symbols['d'].value == 2
+    assert symbols['e'].value == 4
+
+
+def test_read_shares_variable():
+    interpreter = create_interpreter('a')
+    expression = interpreter.parser.parse_expression()
+    variable = CurrencyVariable('a', 10, 'eur')
+    interpreter.scope_manager.current_scope.add_symbol('a', variable)
+    interpreter.visit_expression(expression)
+    assert interpreter.scope_manager.last_result is variable
+
+
+def test_number_literal_built_once():
+    interpreter = create_interpreter('5 eur')
+    expression = interpreter.parser.parse_expression()
+    interpreter.visit_expression(expression)
+    first = interpreter.scope_manager.last_result
+    interpreter.visit_expression(expression)
+    assert interpreter.scope_manager.last_result is first
+    assert first.value == 5 and first.currency == 'eur'
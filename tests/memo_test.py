@@ -0,0 +1,102 @@
+import pytest
+from .engines_test import parse
+from ..src.engines import run_program
+from ..src.interpreter.resolver import Resolver
+from ..src.interpreter.memo import MemoCache, MISSING
+from ..src.interpreter.variables import CurrencyVariable, DecimalVariable
+from ..src.source.currencies import Currencies
+
+
+FIBONACCI = '''
+dec fib(dec n) {
+    if (n < 2) {
+        return n;
+    }
+    return fib(n - 1) + fib(n - 2);
+}
+
+void main() {
+    print(fib(20));
+}
+'''
+
+CONVERSION = '''
+cur in_eur(cur amount) {
+    return eur amount;
+}
+
+void main() {
+    cur a = 10 pln;
+    print(in_eur(a), " ", in_eur(a));
+}
+'''
+
+
+def pure_functions(source_string):
+    program = Resolver().resolve(parse(source_string))
+    return {function_def.signature.id for function_def in program.function_defs if function_def.pure}
+
+
+def test_purity_analysis():
+    assert pure_functions('dec a(dec x) { return b(x); } dec b(dec x) { return x * 2; } '
+                          'dec c(dec x) { print(x); return x; } dec d(dec x) { return c(x) + a(x); } '
+                          'dec e(dec x) { return missing(x); } void main() { print(a(1)); }') == {'a', 'b'}
+
+
+def test_purity_of_recursion():
+    assert pure_functions('dec even(dec n) { if (n == 0) { return 1; } return odd(n - 1); } '
+                          'dec odd(dec n) { if (n == 0) { return 0; } return even(n - 1); } void main() { }') \
+        == {'even', 'odd', 'main'}
+
+
+def test_purity_uses_last_definition():
+    program = Resolver().resolve(parse('dec f(dec x) { return x; } dec f(dec x) { print(x); return x; } '
+                                       'dec g(dec x) { return f(x); } void main() { }'))
+    assert [function_def.pure for function_def in program.function_defs] == [False, False, False, True]
+
+
+@pytest.mark.parametrize('engine', ['visitor', 'closure'])
+def test_memoized_calls(capsys, engine):
+    memo = MemoCache()
+    run_program(parse(FIBONACCI), engine, memo=memo)
+    assert capsys.readouterr().out == "6765.0\n"
+    assert memo.misses == 21
+    assert memo.hits == 18
+    run_program(parse(FIBONACCI), engine, memo=MemoCache(0))
+    assert capsys.readouterr().out == "6765.0\n"
+
+
+@pytest.mark.parametrize('engine', ['visitor', 'closure'])
+def test_memo_flushed_when_rates_change(capsys, engine):
+    memo = MemoCache()
+    program = parse(CONVERSION)
+    Currencies.currencies = {"pln": {"eur": 0.25}, "eur": {"pln": 4}}
+    run_program(program, engine, memo=memo)
+    assert capsys.readouterr().out == "2.5 2.5\n"
+    assert (memo.hits, memo.misses) == (1, 1)
+    run_program(program, engine, memo=memo)
+    assert (memo.hits, memo.misses) == (3, 1)
+    Currencies.currencies = {"pln": {"eur": 0.2}, "eur": {"pln": 5}}
+    run_program(program, engine, memo=memo)
+    assert capsys.readouterr().out == "2.5 2.5\n2.0 2.0\n"
+    assert (memo.hits, memo.misses) == (4, 2)
+
+
+def test_memo_is_least_recently_used():
+    memo = MemoCache(2)
+    keys = [memo.key('f', [DecimalVariable('', value)]) for value in (1.0, 2.0, 3.0)]
+    memo.put(keys[0], 'one')
+    memo.put(keys[1], 'two')
+    assert memo.get(keys[0]) == 'one'
+    memo.put(keys[2], 'three')
+    assert memo.get(keys[1]) is MISSING
+    assert memo.get(keys[0]) == 'one'
+    assert (memo.hits, memo.misses) == (2, 1)
+
+
+def test_memo_keys():
+    assert MemoCache.key('f', [DecimalVariable('', 0.0)]) != MemoCache.key('f', [DecimalVariable('', -0.0)])
+    assert MemoCache.key('f', [CurrencyVariable('', 1.0, 'eur')]) != MemoCache.key('f', [CurrencyVariable('', 1.0, 'pln')])
+    assert MemoCache.key('f', [CurrencyVariable('', 1.0, 'eur')]) != MemoCache.key('f', [DecimalVariable('', 1.0)])
+    assert MemoCache.key('f', [DecimalVariable('', 1.0)]) == MemoCache.key('f', [DecimalVariable('a', 1.0)])
+    assert MemoCache.key('f', [None]) is None
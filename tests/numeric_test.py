@@ -0,0 +1,144 @@
+import io
+import pytest
+from decimal import Decimal
+from .programs import PROGRAMS
+from ..src.lexer.tokens import Tokens
+from ..src.lexer.token_types import TokenTypes
+from ..src.lexer.lexer import Lexer
+from ..src.parser.parser import Parser
+from ..src.source.currencies_reader import CurrenciesReader
+from ..src.source.currencies import Currencies
+from ..src.source.source import BufferedSource
+from ..src.engines import run_program
+from ..src.exceptions.exceptions import DivisionZeroError
+from ..src.interpreter.numeric import numeric_backend, fixed_type, rounded_division, DecimalValue
+
+
+ACCUMULATION = '''
+void main() {
+    dec i = 0;
+    dec total = 0;
+    cur balance = 0 eur;
+    while (i < 10) {
+        total = total + 0.1;
+        balance = balance + 0.1 eur;
+        i = i + 1;
+    }
+    print(total, " ", balance, " ", total / 3, " ", balance usd);
+    if (total == 1) {
+        print("exact");
+    }
+}
+'''
+
+
+def parse(source_string):
+    CurrenciesReader("resources/currencies.json")
+    for currency in Currencies.currencies:
+        Tokens.keywords[currency] = TokenTypes.CURRENCY_TYPE
+    parser = Parser(Lexer(BufferedSource(io.StringIO(source_string))))
+    parser.parse_program()
+    return parser.program
+
+
+def run(capsys, source_string, engine, numeric):
+    program = parse(source_string)
+    try:
+        run_program(program, engine, numeric)
+        error = None
+    except Exception as exception:
+        error = (type(exception), str(exception))
+    return capsys.readouterr().out, error
+
+
+def test_rounded_division_rounds_half_to_even():
+    assert [rounded_division(n, 2) for n in (1, 3, 5, -1, -3)] == [0, 2, 2, 0, -2]
+    assert rounded_division(2, 3) == 1
+    assert rounded_division(-2, 3) == -1
+    assert rounded_division(7, -2) == -4
+
+
+def test_fixed_values_are_exact():
+    numeric = numeric_backend('fixed')
+    total = numeric.number(0.0)
+    for _ in range(10):
+        total += numeric.number(0.1)
+    assert total == numeric.number(1.0)
+    assert str(numeric.number(0.1) + numeric.number(0.2)) == '0.30'
+    assert str(-numeric.number(0.05)) == '-0.05'
+    assert type(total) is fixed_type(2)
+
+
+def test_fixed_arithmetic_and_rates():
+    numeric = numeric_backend('fixed')
+    assert str(numeric.number(2.5) * numeric.number(1.5)) == '3.75'
+    assert str(numeric.number(1) / numeric.number(3)) == '0.33'
+    assert str(numeric.number(2) / numeric.number(3)) == '0.67'
+    assert str(numeric.number(10) * 0.125) == '1.25'
+    assert str(numeric.number(0.01) * 0.5) == '0.00'  # half a minor unit rounds to even
+    assert str(numeric.number(-3) * -1) == '3.00'
+
+
+def test_fixed_rates_are_exact_for_large_amounts():
+    assert int(fixed_type(0)(2 ** 60 + 1) * 1.0) == 2 ** 60 + 1
+    assert int(fixed_type(8)(10 ** 17 + 1) * 0.5) == (10 ** 17) // 2  # half a minor unit rounds to even
+
+
+def test_fixed_minor_units():
+    assert str(numeric_backend('fixed', 4).number(1 / 3)) == '0.3333'
+    assert str(numeric_backend('fixed', 0).number(2.5)) == '2'
+    assert fixed_type(3) is fixed_type(3)
+    with pytest.raises(ValueError):
+        numeric_backend('fixed', -1)
+
+
+def test_decimal_values():
+    numeric = numeric_backend('decimal')
+    assert numeric.number(0.1) + numeric.number(0.2) == Decimal('0.3')
+    assert numeric.number(3) * 0.1 == Decimal('0.3')
+    assert isinstance(numeric.number(1) / numeric.number(3), DecimalValue)
+    assert numeric.number(0.1) is numeric.number(0.1)
+
+
+def test_decimal_values_print_in_fixed_point():
+    numeric = numeric_backend('decimal')
+    zero = numeric.number(0.1) * numeric.number(0.0)
+    assert str(zero) == '0.0'
+    assert str(numeric.number(1) / numeric.number(0.5)) == str(numeric.number(2) * numeric.number(2) / 2) == '2.0'
+    assert str(numeric.number(1e30) * 1.0) == '1000000000000000000000000000000.0'
+    assert str(numeric.number(0.1) + numeric.number(0.2)) == '0.3'
+    assert str(numeric.number(-0.25) * numeric.number(0.5)) == '-0.125'
+
+
+def test_float_backend_keeps_floats():
+    assert numeric_backend('float').number(0.1) == 0.1
+
+
+@pytest.mark.parametrize('engine', ['visitor', 'closure', 'vm', 'python'])
+def test_accumulation_per_backend(capsys, engine):
+    out, error = run(capsys, ACCUMULATION, engine, numeric_backend('fixed'))
+    usd = f"{Decimal(repr(Currencies.currencies['eur']['usd'])):.2f}"
+    assert error is None
+    assert out == f"1.00 1.00 0.33 {usd}\nexact\n"
+    out, error = run(capsys, ACCUMULATION, engine, numeric_backend('decimal'))
+    assert error is None
+    assert out.startswith("1.0 1.0 0.3333333333333333333333333333 ")
+    assert out.endswith("\nexact\n")
+    out, error = run(capsys, ACCUMULATION, engine, None)
+    assert "exact" not in out
+
+
+@pytest.mark.parametrize('engine', ['visitor', 'closure', 'vm', 'python'])
+@pytest.mark.parametrize('backend', ['fixed', 'decimal'])
+def test_division_by_zero_per_backend(capsys, engine, backend):
+    source_string = 'void main() { dec a = 1; dec b = a / 0; }'
+    out, error = run(capsys, source_string, engine, numeric_backend(backend))
+    assert error is not None and error[0] is DivisionZeroError
+
+
+@pytest.mark.parametrize('engine', ['closure', 'vm', 'python'])
+@pytest.mark.parametrize('backend', ['fixed', 'decimal'])
+@pytest.mark.parametrize('name', PROGRAMS.keys())
+def test_engine_matches_visitor_per_backend(capsys, name, engine, backend):
+    expected = run(capsys, PROGRAMS[name], 'visitor', numeric_backend(backend))
+    assert run(capsys, PROGRAMS[name], engine, numeric_backend(backend)) == expected
@@ -0,0 +1,267 @@
+import pytest
+from .programs import PROGRAMS
+from .engines_test import parse
+from ..src.engines import ENGINES, run_program
+from ..src.interpreter.numeric import numeric_backend
+from ..src.interpreter.resolver import Resolver
+from ..src.optimizer.optimizer import Optimizer
+from ..src.source.currencies import Currencies
+from ..src.exceptions.exceptions import DivisionZeroError, IllicitOperationError
+
+
+def run(capsys, source_string, engine, optimize, numeric=None):
+    program = parse(source_string)
+    try:
+        run_program(program, engine, numeric, optimize=optimize)
+        error = None
+    except Exception as exception:
+        error = (type(exception), str(exception))
+    return capsys.readouterr().out, error
+
+
+def optimized(source_string):
+    program = Resolver().resolve(parse(source_string))
+    previous = Currencies.pin(Currencies.current())
+    try:
+        return Optimizer().optimize(program)
+    finally:
+        Currencies.pin(previous)
+
+
+def main_statement(program, index=0):
+    return program.function_defs[-1].block.statements[index]
+
+
+def primary_exprs(expression):
+    return [primary_expr for multipl_expr in expression.multipl_exprs for primary_expr in multipl_expr.primary_exprs]
+
+
+@pytest.mark.parametrize('engine', ENGINES)
+@pytest.mark.parametrize('name', PROGRAMS.keys())
+def test_optimized_program_matches_parsed(capsys, name, engine):
+    assert run(capsys, PROGRAMS[name], engine, 1) == run(capsys, PROGRAMS[name], engine, 0)
+
+
+@pytest.mark.parametrize('engine', ENGINES)
+@pytest.mark.parametrize('backend', ['fixed', 'decimal'])
+@pytest.mark.parametrize('name', PROGRAMS.keys())
+def test_optimized_program_matches_parsed_per_backend(capsys, name, engine, backend):
+    assert run(capsys, PROGRAMS[name], engine, 1, numeric_backend(backend)) \
+        == run(capsys, PROGRAMS[name], engine, 0, numeric_backend(backend))
+
+
+@pytest.mark.parametrize('backend', ['fixed', 'decimal'])
+def test_optimizes_without_folding_per_backend(backend):
+    for name, removed, hoisted in (('dead_code', True, 0), ('loop_invariants', False, 6)):
+        program = Resolver().resolve(parse(PROGRAMS[name]))
+        previous = Currencies.pin(Currencies.current())
+        try:
+            Optimizer(1, numeric_backend(backend)).optimize(program)
+        finally:
+            Currencies.pin(previous)
+        assert program.optimized.folded == 0
+        assert bool(program.optimized.removed) == removed
+        assert program.optimized.hoisted == hoisted
+        assert program.optimized.numeric[0] == backend
+
+
+def test_keeps_divisions_by_literals_rounded_to_zero(capsys):
+    source_string = 'void main() { dec a = 1; dec i = 0; while (i > 0) { print(a / 0.001); } print("done"); }'
+    assert run(capsys, source_string, 'closure', 1, numeric_backend('fixed')) == ('done\n', None)
+    program = Resolver().resolve(parse(source_string))
+    Optimizer(1, numeric_backend('fixed')).optimize(program)
+    assert program.optimized.hoisted == 0
+    Optimizer(1, numeric_backend('fixed', 3)).optimize(program)
+    assert program.optimized.hoisted == 1
+    assert program.optimized.numeric == ('fixed', 3)
+
+
+def test_folds_arithmetic():
+    program = optimized('void main() { dec a = 2 + 3 * 4 - -(6 / 4); }')
+    [primary_expr] = primary_exprs(main_statement(program).expression)
+    assert (primary_expr.number, primary_expr.currency1, primary_expr.minus) == (15.5, None, False)
+
+
+def test_folds_conversions():
+    program = optimized('void main() { cur a = pln (eur 100 + 5 usd) chf; }')
+    [primary_expr] = primary_exprs(main_statement(program).expression)
+    assert primary_expr.currency1 == 'chf'
+    assert primary_expr.number == (100 + 5 * 16) * 17 * 1
+
+
+def test_folds_constant_prefix_only():
+    program = optimized('void main() { dec a = 1; dec b = 2 * 3 * a * 4 + 1; }')
+    expression = main_statement(program, 1).expression
+    assert [primary_expr.number for primary_expr in primary_exprs(expression)] == [6, None, 4, 1]
+
+
+def test_drops_operands_after_currency_result():
+    program = optimized('void main() { cur a = 3 * 2 eur * 7 / 0; }')
+    [primary_expr] = primary_exprs(main_statement(program).expression)
+    assert (primary_expr.number, primary_expr.currency1) == (6, 'eur')
+
+
+@pytest.mark.parametrize('expression, error', [
+    ('2 * 3 / 0', DivisionZeroError),
+    ('1 + 2 / (2 - 2)', DivisionZeroError),
+    ('1 eur + 2', IllicitOperationError),
+    ('1 eur * 2 eur', IllicitOperationError),
+    ('2 / 1 eur', IllicitOperationError)
+])
+def test_keeps_errors(capsys, expression, error):
+    source_string = f'void main() {{ print("before"); print({expression}); }}'
+    assert run(capsys, source_string, 'visitor', 1)[1][0] is error
+    assert run(capsys, source_string, 'visitor', 1) == run(capsys, source_string, 'visitor', 0)
+
+
+def test_keeps_conversion_of_dec():
+    program = optimized('void main() { dec a = (2 * 3) eur; }')
+    [primary_expr] = primary_exprs(main_statement(program).expression)
+    assert primary_expr.parenth_expr is not None
+    assert primary_exprs(primary_expr.parenth_expr.expression)[0].number == 6
+
+
+def test_program_without_constants_is_not_copied():
+    program = Resolver().resolve(parse(PROGRAMS['factorial']))
+    assert Optimizer().optimize(program) is program
+    assert Optimizer(0).optimize(program) is program
+
+
+def test_optimized_once_per_rates(capsys):
+    program = parse('void main() { print((1 usd) pln, " ", 2 * 3); }')
+    run_program(program)
+    first = program.optimized.program
+    run_program(program)
+    assert program.optimized.program is first
+    Currencies.currencies = {"usd": {"pln": 4}, "pln": {"usd": 0.25}}
+    run_program(program)
+    assert program.optimized.program is not first
+    assert capsys.readouterr().out == '13.0 6.0\n13.0 6.0\n4.0 6.0\n'
+
+
+def test_optimized_for_any_rates_without_conversions(capsys):
+    program = parse('void main() { print(2 * 3); }')
+    run_program(program)
+    first = program.optimized.program
+    Currencies.currencies = {"usd": {"pln": 4}, "pln": {"usd": 0.25}}
+    run_program(program)
+    assert program.optimized.version is None
+    assert program.optimized.program is first
+    assert capsys.readouterr().out == '6.0\n6.0\n'
+
+
+def test_removes_unreachable_functions():
+    program = optimized(PROGRAMS['dead_code'])
+    assert [function_def.signature.id for function_def in program.function_defs] == ['log', 'first', 'main']
+
+
+def test_prunes_constant_conditions():
+    program = optimized(PROGRAMS['dead_code'])
+    statements = program.function_defs[-1].block.statements
+    assert [type(statement).__name__ for statement in statements] == \
+           ['InitStatement', 'InitStatement', 'PrintStatement', 'PrintStatement', 'IfStatement']
+
+
+def test_removes_statements_after_return():
+    program = optimized('''
+dec sign(dec a) {
+    if (a < 0) {
+        return -1;
+        print("never");
+    }
+    else {
+        return 1;
+    }
+    print("never");
+}
+
+void main() {
+    print(sign(1));
+}
+''')
+    block = program.function_defs[0].block
+    assert len(block.statements) == 1
+    assert len(block.statements[0].block1.statements) == 1
+
+
+def test_keeps_pruned_first_statement():
+    program = optimized(PROGRAMS['pending_return'])
+    assert type(main_statement(program)).__name__ == 'IfStatement'
+
+
+def test_keeps_statements_after_returning_void_call():
+    program = optimized(PROGRAMS['dead_code'])
+    assert [type(statement).__name__ for statement in program.function_defs[1].block.statements] == \
+           ['ReturnStatement', 'ReturnStatement']
+
+
+def test_reports_removed_nodes():
+    program = Resolver().resolve(parse('dec unused() { return 1; } void main() { return 1; print("x"); }'))
+    previous = Currencies.pin(Currencies.current())
+    try:
+        Optimizer().optimize(program)
+    finally:
+        Currencies.pin(previous)
+    assert program.optimized.removed == 8 + 1
+    assert program.optimized.folded == 0
+
+
+def test_keeps_functions_without_main():
+    program = optimized(PROGRAMS['no_main'])
+    assert [function_def.signature.id for function_def in program.function_defs] == ['helper']
+
+
+def statement_types(block):
+    return [type(statement).__name__ for statement in block.statements]
+
+
+def test_moves_invariants_out_of_loops():
+    program = optimized(PROGRAMS['loop_invariants'])
+    block = program.function_defs[0].block
+    assert statement_types(block) == ['InitStatement'] * 4 + ['AssignStatement'] * 3 + ['WhileStatement',
+                                                                                         'ReturnStatement']
+    assert [statement.signature.id for statement in block.statements[:3]] == ['0', '1', '2']
+    assert statement_types(block.statements[-2].block) == ['AssignStatement', 'AssignStatement']
+    assert program.function_defs[0].slots == {'debt': 0, 'installment': 1, 'rate': 2, 'months': 3, 'month': 4,
+                                             '0': 5, '1': 6, '2': 7}
+
+
+def test_moves_invariants_of_nested_loops_before_them():
+    program = optimized(PROGRAMS['loop_invariants'])
+    main = program.function_defs[-1]
+    outer = main.block.statements[-3]
+    assert statement_types(main.block)[-5:-3] == ['AssignStatement', 'AssignStatement']
+    assert statement_types(outer.block) == ['AssignStatement', 'AssignStatement', 'WhileStatement',
+                                            'AssignStatement']
+    assert program.main_slots is main.slots
+    assert len(main.slots) == 9
+
+
+def test_keeps_failing_expressions_in_loops():
+    program = optimized(PROGRAMS['loop_invariants'])
+    loop = program.function_defs[-1].block.statements[-1]
+    assert type(loop).__name__ == 'WhileStatement'
+    assert primary_exprs(loop.block.statements[0].printables[0])[0].parenth_expr is not None
+
+
+def test_reports_moved_expressions():
+    program = Resolver().resolve(parse(PROGRAMS['loop_invariants']))
+    previous = Currencies.pin(Currencies.current())
+    try:
+        Optimizer().optimize(program)
+    finally:
+        Currencies.pin(previous)
+    assert program.optimized.hoisted == 6
+
+
+@pytest.mark.parametrize('source_string', [
+    'dec f(dec a) { return a; } void main() { dec a = 1; dec i = 0; while (i < 3) { i = i + f(a); } }',
+    'void main() { dec a = 1; dec i = 0; while (i < 3) { i = i + a * 2; if (i > 4) { return i; } } }',
+    'void main() { dec a = 1; dec i = 0; while (i < 3) { i = i + a * 2; } } void main() { return 1; }',
+    'void main() { dec a = 1; dec b; dec i = 0; while (i < 3) { i = i + a * 2; } }',
+    'void main() { dec a = 1; dec i = 0; while (i < 3) { i = i + a / a; } }',
+    'void main() { cur a = 1 eur; dec i = 0; while (i < 3) { a = a + a * 2; i = i + 1; } }'
+])
+def test_keeps_loops_that_may_change(source_string):
+    program = Resolver().resolve(parse(source_string))
+    assert Optimizer().optimize(program) is program
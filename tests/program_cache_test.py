@@ -0,0 +1,106 @@
+import io
+import os
+from ..src.cache.program_cache import ProgramCache
+from ..src.lexer.lexer import Lexer
+from ..src.lexer.tokens import Tokens
+from ..src.lexer.token_types import TokenTypes
+from ..src.parser.parser import Parser
+from ..src.parser.grammar import *
+from ..src.source.currencies_reader import CurrenciesReader
+from ..src.source.currencies import Currencies
+from ..src.source.source import BufferedSource
+
+
+PROGRAM = '''dec add(dec a, dec b) {
+    return a + b;
+}
+
+void main() {
+    cur a = 5 eur;
+    print("sum: ", add(1, 2), a);
+}
+'''
+
+
+def write_program(tmp_path, text=PROGRAM):
+    CurrenciesReader("resources/currencies.json")
+    for currency in Currencies.currencies:
+        Tokens.keywords[currency] = TokenTypes.CURRENCY_TYPE
+    path = tmp_path / "program.cpl"
+    path.write_text(text)
+    return str(path)
+
+
+def parse(text):
+    parser = Parser(Lexer(BufferedSource(io.StringIO(text))))
+    parser.parse_program()
+    return parser.program
+
+
+def test_cache_miss_then_hit(tmp_path):
+    path = write_program(tmp_path)
+    cache = ProgramCache(path)
+    assert cache.load() is None
+    cache.store(parse(PROGRAM))
+    program = ProgramCache(path).load()
+    assert isinstance(program, Program)
+    assert [function_def.signature.id for function_def in program.function_defs] == ['add', 'main']
+    init_statement = program.function_defs[1].block.statements[0]
+    assert init_statement.expression.multipl_exprs[0].primary_exprs[0].currency2 == 'eur'
+
+
+def test_cache_directory_next_to_program(tmp_path):
+    path = write_program(tmp_path)
+    ProgramCache(path).store(parse(PROGRAM))
+    assert (tmp_path / ProgramCache.DIRECTORY).is_dir()
+
+
+def test_cache_directory_that_is_a_file_is_skipped(tmp_path):
+    path = write_program(tmp_path)
+    (tmp_path / ProgramCache.DIRECTORY).write_text('')
+    cache = ProgramCache(path)
+    cache.store(parse(PROGRAM))
+    assert cache.load() is None
+
+
+def test_cache_not_replaced_leaves_no_temporary_file(tmp_path):
+    path = write_program(tmp_path)
+    cache = ProgramCache(path)
+    os.makedirs(cache.path)  # the cache file cannot replace a directory
+    cache.store(parse(PROGRAM))
+    assert os.listdir(cache.directory) == [os.path.basename(cache.path)]
+
+
+def test_cache_key_depends_on_source(tmp_path):
+    path = write_program(tmp_path)
+    ProgramCache(path).store(parse(PROGRAM))
+    write_program(tmp_path, PROGRAM.replace('add(1, 2)', 'add(1, 3)'))
+    assert ProgramCache(path).load() is None
+
+
+def test_cache_key_depends_on_currencies(tmp_path):
+    path = write_program(tmp_path)
+    key = ProgramCache(path).key
+    Tokens.keywords['btc'] = TokenTypes.CURRENCY_TYPE
+    try:
+        assert ProgramCache(path).key != key
+    finally:
+        del Tokens.keywords['btc']
+    assert ProgramCache(path).key == key
+
+
+def test_corrupted_cache_is_a_miss(tmp_path):
+    path = write_program(tmp_path)
+    cache = ProgramCache(path)
+    cache.store(parse(PROGRAM))
+    with open(cache.path, 'r+b') as file:
+        file.seek(-10, 2)
+        file.write(b'0123456789')
+    assert ProgramCache(path).load() is None
+
+
+def test_cache_key_from_rate_file_currencies(tmp_path):
+    path = write_program(tmp_path)
+    currencies = set(Currencies.currencies)
+    assert ProgramCache(path, currencies=currencies).key == ProgramCache(path).key
+    assert ProgramCache(path, currencies=currencies | {'btc'}).key != ProgramCache(path).key
@@ -0,0 +1,330 @@
+PROGRAMS = {
+    'factorial': '''
+dec factorial(dec a) {
+    if (a > 1) {
+        return factorial(a - 1) * a;
+    }
+    else {
+        return 1;
+    }
+}
+
+void main() {
+    dec result = factorial(5);
+    print("result: ", result);
+}
+''',
+    'readme': '''
+dec add(dec a, dec b) {
+    return a + b;
+}
+
+void main() {
+    cur a = 5 eur;
+    cur b = a pln;
+    dec counter = 0;
+    dec result = 0;
+    while (counter < 6) {
+        if (!result > 50) {
+            print("Result is not bigger than 50");
+        }
+        else {
+            print("Result is bigger than 50");
+        }
+        result = add(10, counter);
+        counter = counter + 1;
+    }
+    cur income = a + b usd;
+    print("Income in USD is: ", income);
+}
+''',
+    'accrual': '''
+cur accrue(cur capital, dec rate, dec periods) {
+    dec i = 0;
+    while (i < periods) {
+        capital = capital + capital * rate;
+        i = i + 1;
+    }
+    return capital;
+}
+
+void main() {
+    cur deposit = 1000 pln;
+    cur fee = 2 eur;
+    cur result = accrue(deposit, 0.01, 12) - fee;
+    print("result: ", result);
+    print("in eur: ", eur result, " in usd: ", result usd);
+    print("converted: ", pln (eur deposit usd + fee / 4) chf);
+}
+''',
+    'conditions': '''
+void main() {
+    dec a = 5;
+    dec b = 3;
+    cur c = 4 eur;
+    cur d = 1 pln;
+    if (a > b & c == d | !a < b) {
+        print("first");
+    }
+    if (!(a == b) & (a != b)) {
+        print("second");
+    }
+    else {
+        print("not second");
+    }
+    if (a <= b) {
+        print("not printed");
+    }
+    if (! a >= 6) {
+        print("third ", -a, " ", -c);
+    }
+    print(a * b / 2 - 1, " ", 2 * c, " ", c * 2 / 4, " ", a - -b);
+}
+''',
+    'return_in_loop': '''
+dec find(dec limit) {
+    dec i = 0;
+    while (i < limit) {
+        i = i + 1;
+        if (i == 3) {
+            return i;
+        }
+    }
+    return 0 - 1;
+}
+
+void log(dec value) {
+    print("log: ", value);
+}
+
+void main() {
+    print("found: ", find(10));
+    log(find(2));
+    dec sum = 0;
+    dec n = 0;
+    while (n < 100) {
+        sum = sum + n * n;
+        n = n + 1;
+    }
+    print("sum: ", sum);
+}
+''',
+    'currency_functions': '''
+cur to_eur(cur amount) {
+    return eur amount;
+}
+
+cur total(cur a, cur b, dec times) {
+    cur result = (a + b) * times;
+    return result;
+}
+
+dec ratio(cur a, cur b) {
+    dec result = 0;
+    if (a > b) {
+        result = 1;
+    }
+    return result;
+}
+
+void main() {
+    cur a = 10 usd;
+    cur b = chf 3;
+    cur c = total(a, b, 2);
+    print(c, " ", to_eur(c), " ", ratio(a, b), " ", ratio(b, a));
+    cur d = a b.get_currency();
+    cur f = 2 d.get_currency();
+    print(d, " ", f);
+    cur e;
+    e = 7 gbd;
+    print(e + a);
+}
+''',
+    'constant_expressions': '''
+dec scale(dec a) {
+    return a * (2 + 3) / 4;
+}
+
+void main() {
+    cur a = 10 pln;
+    print(2 + 3 * 4 - 1, " ", -(6 / 4), " ", 2 * 3 * scale(2));
+    print(pln (eur 100 + 5 usd) chf, " ", (1 eur + 2 eur) usd + a);
+    print(5 eur * 2 / 0, " ", 3 * 2 eur * 7);
+    if (2 * 3 > 1 + 4 & pln (1 usd) == 13) {
+        print(a + (2 eur) pln, " ", eur (a) usd);
+    }
+}
+''',
+    'dead_code': '''
+void log(dec a) {
+    print("log ", a);
+}
+
+dec unused(dec a) {
+    return a * 2;
+}
+
+dec sign(dec a) {
+    if (a < 0) {
+        return -1;
+    }
+    else {
+        return 1;
+    }
+    print("never");
+    return 0;
+}
+
+dec first(dec a) {
+    return log(a);
+    return a + 1;
+    print("never");
+}
+
+void main() {
+    dec a = 3;
+    if (1 > 2) {
+        print("never");
+    }
+    else {
+        dec b = a * 2;
+        print("else ", b);
+    }
+    if (2 * 3 == 6 & 1 eur > 1 usd) {
+        print("then ", sign(-a), " ", sign(a));
+    }
+    print(first(a));
+    if (1 / 0 > 1 | a > 1) {
+        print("kept");
+    }
+}
+''',
+    'pending_return': '''
+void main() {
+    dec i = 0;
+    while (i < 3) {
+        i = i + 1;
+        if (2 > 1) {
+            print("loop ", i);
+        }
+        return i;
+    }
+    print("never");
+}
+
+void main() {
+    if (1 > 2) {
+        print("never");
+    }
+    print("second main");
+}
+''',
+    'loop_invariants': '''
+cur repay(cur debt, cur installment, dec rate, dec months) {
+    dec month = 0;
+    while (month < months * 12 & debt > 0 pln) {
+        debt = debt + debt * (rate / 12) - (installment) pln;
+        month = month + 1;
+    }
+    return debt;
+}
+
+void main() {
+    cur debt = 10000 pln;
+    cur installment = 150 eur;
+    dec rate = 0.07;
+    print("left: ", repay(debt, installment, rate, 2));
+    dec day = 0;
+    dec hour = 0;
+    cur total = 0 usd;
+    while (day < 3) {
+        hour = 0;
+        while (hour < 2) {
+            total = total + rate * 2 * 3 * day * installment + (debt + installment) usd * rate - hour * installment;
+            hour = hour + 1;
+        }
+        day = day + 1;
+    }
+    print("total: ", total);
+    while (day < 0) {
+        print((installment / 0) pln);
+    }
+}
+''',
+    'inferred_types': '''
+cur balance(cur start, cur extra, dec months) {
+    cur total = start + extra;
+    dec i = 0;
+    while (i < months) {
+        total = total + extra * 2 / 4;
+        i = i + 1;
+    }
+    return total;
+}
+
+dec average(dec a, dec b, dec c) {
+    return (a + b + c) / 3 * 2 / 2;
+}
+
+void main() {
+    cur a = 10 eur;
+    cur b = 5 eur;
+    cur c = a + b - 1 eur;
+    cur d = 2 usd;
+    d = d + c;
+    d = 3 pln;
+    print(c, " ", d + a, " ", a + b + c);
+    print(balance(a, d, 3), " ", balance(d, a, 1));
+    print(average(1, 2, 3), " ", average(-4, 1.5, 0) - 1);
+    cur e = a b.get_currency();
+    print(e + c - e, " ", a - e * 2, " ", c * 3 + a / 2 - b);
+}
+''',
+    'division_by_zero': '''
+void main() {
+    dec a = 4;
+    print("before");
+    dec b = a / (a - 4);
+    print("after");
+}
+''',
+    'illicit_operation': '''
+void main() {
+    cur a = 4 eur;
+    dec b = 2;
+    print("before");
+    print(a + b);
+}
+''',
+    'undeclared': '''
+void main() {
+    dec a = 1;
+    print(a);
+    a = b + 1;
+}
+''',
+    'invalid_argument': '''
+dec twice(dec a) {
+    return a * 2;
+}
+
+void main() {
+    cur a = 1 eur;
+    print(twice(a));
+}
+''',
+    'invalid_return': '''
+cur broken(dec a) {
+    return a;
+}
+
+void main() {
+    print(broken(1));
+}
+''',
+    'no_main': '''
+void helper() {
+    print("helper");
+}
+'''
+}
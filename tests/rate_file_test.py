@@ -0,0 +1,76 @@
+import hashlib
+import json
+import pytest
+from ..src.exceptions.exceptions import InvalidRateFileError
+from ..src.engines import run_program
+from ..src.source.currencies import Currencies
+from ..src.source.currencies_reader import CurrenciesReader
+from ..src.source.rate_file import MatrixRates, compile_rates, is_rate_file
+from ..src.source.rate_table import RateTable
+from .engines_test import parse
+
+
+RATES = {"pln": {"eur": 0.25, "usd": 0.3}, "eur": {"pln": 4, "gbp": 0.9}, "usd": {}}
+
+
+def compile_file(tmp_path, rates=RATES):
+    json_path, cpr_path = tmp_path / "rates.json", tmp_path / "rates.cpr"
+    json_path.write_text(json.dumps(rates))
+    compile_rates(str(json_path), str(cpr_path))
+    return str(json_path), str(cpr_path)
+
+
+def test_compiled_file_layout(tmp_path):
+    json_path, cpr_path = compile_file(tmp_path)
+    assert is_rate_file(cpr_path) and not is_rate_file(json_path)
+    rates = MatrixRates(cpr_path)
+    assert rates.codes == ["pln", "eur", "usd", "gbp"]
+    assert list(rates) == ["pln", "eur", "usd"]
+    assert "gbp" not in rates
+    assert rates.matrix.format == 'd' and len(rates.matrix) == 16
+    assert rates.digest == hashlib.sha256(open(json_path, 'rb').read()).hexdigest()
+    assert rates == RATES
+    rates.close()
+
+
+def test_table_reads_matrix_rows_lazily(tmp_path):
+    _, cpr_path = compile_file(tmp_path)
+    table = RateTable(MatrixRates(cpr_path))
+    pln, eur, usd, gbp = (RateTable.intern(code) for code in ("pln", "eur", "usd", "gbp"))
+    assert table.edges[pln] is None
+    assert table.rows[pln][eur] == 0.25
+    assert table.edges[pln] == {eur: 0.25, usd: 0.3}
+    assert table.edges[eur] is None
+    assert table.rate(pln, gbp) == 0.25 * 0.9
+    assert (pln, gbp) in table.memoized
+    with pytest.raises(KeyError) as error:
+        table.rows[usd][pln]
+    assert error.value.args == ('pln',)
+    with pytest.raises(KeyError) as error:
+        table.rate(gbp, pln)
+    assert error.value.args == ('gbp',)
+
+
+def test_reader_accepts_compiled_file(tmp_path, capsys):
+    json_path, cpr_path = compile_file(tmp_path)
+    CurrenciesReader(json_path)
+    digest = Currencies.snapshot.digest
+    program = parse('void main() { cur a = 10 eur; print(a pln, " ", a usd); }')
+    CurrenciesReader(cpr_path)
+    assert isinstance(Currencies.currencies, MatrixRates)
+    assert Currencies.snapshot.digest == digest
+    for engine in ('visitor', 'closure', 'vm', 'python'):
+        run_program(program, engine)
+        assert capsys.readouterr().out == '40.0 12.0\n'
+
+
+def test_rejects_invalid_files(tmp_path):
+    _, cpr_path = compile_file(tmp_path)
+    content = open(cpr_path, 'rb').read()
+    broken_path = tmp_path / "broken.cpr"
+    broken_path.write_bytes(content[:-8])
+    with pytest.raises(InvalidRateFileError):
+        MatrixRates(str(broken_path))
+    broken_path.write_bytes(b'CPLR')
+    with pytest.raises(InvalidRateFileError):
+        MatrixRates(str(broken_path))
@@ -0,0 +1,73 @@
+import json
+import pytest
+from datetime import date
+from ..src.source.rate_history import RateHistory, build_history, write_history, read_daily_rates
+from ..src.exceptions.exceptions import InvalidRateFileError
+
+
+DAYS = {
+    date(2024, 1, 2): {"pln": {"eur": 0.25, "usd": 0.3}, "eur": {"pln": 4}},
+    date(2024, 1, 4): {"pln": {"eur": 0.2}, "eur": {"pln": 5}},
+    date(2024, 1, 5): {"pln": {"eur": 0.3}, "usd": {"pln": 3.5}}
+}
+
+
+def test_history_days():
+    history = RateHistory(build_history(DAYS))
+    assert history.days() == sorted(DAYS)
+    assert history.days(date(2024, 1, 3), date(2024, 1, 4)) == [date(2024, 1, 4)]
+    assert history.days(date(2024, 1, 6), date(2024, 2, 1)) == []
+
+
+def test_history_as_of_rates():
+    history = RateHistory(build_history(DAYS))
+    assert history.rate('pln', 'eur', date(2024, 1, 2)) == 0.25
+    assert history.rate('pln', 'eur', date(2024, 1, 3)) == 0.25
+    assert history.rate('pln', 'eur', date(2024, 1, 4)) == 0.2
+    assert history.rate('eur', 'pln', date(2024, 3, 1)) == 5
+    assert history.rate('pln', 'usd', date(2024, 1, 5)) == 0.3
+    with pytest.raises(KeyError) as error:
+        history.rate('usd', 'pln', date(2024, 1, 4))
+    assert error.value.args == ('pln',)
+    with pytest.raises(KeyError) as error:
+        history.rate('chf', 'pln', date(2024, 1, 4))
+    assert error.value.args == ('chf',)
+    with pytest.raises(KeyError):
+        history.rate('pln', 'eur', date(2023, 12, 31))
+
+
+def test_history_currencies_snapshot():
+    history = RateHistory(build_history(DAYS))
+    assert history.currencies(date(2024, 1, 1)) == {}
+    assert history.currencies(date(2024, 1, 3)) == DAYS[date(2024, 1, 2)]
+    assert history.currencies(date(2024, 1, 5)) == {
+        "pln": {"eur": 0.3, "usd": 0.3},
+        "eur": {"pln": 5},
+        "usd": {"pln": 3.5}
+    }
+
+
+def test_history_file_is_memory_mapped(tmp_path):
+    path = str(tmp_path / "rates.cph")
+    write_history(path, DAYS)
+    with RateHistory(path) as history:
+        assert history.mapping is not None
+        assert history.rates.format == 'd'
+        assert sorted(history.codes) == ['eur', 'pln', 'usd']
+        assert history.rate('eur', 'pln', date(2024, 1, 4)) == 5
+
+
+def test_history_reads_daily_files(tmp_path):
+    for day, currencies in DAYS.items():
+        (tmp_path / f"{day.isoformat()}.json").write_text(json.dumps(currencies))
+    (tmp_path / "notes.json").write_text("{}")
+    assert read_daily_rates(str(tmp_path)) == DAYS
+
+
+def test_history_rejects_other_files(tmp_path):
+    with pytest.raises(InvalidRateFileError):
+        RateHistory(b'{"pln": {"eur": 0.25}}' + bytes(32))
+    with pytest.raises(InvalidRateFileError):
+        RateHistory(build_history(DAYS)[:-2])
+    with pytest.raises(InvalidRateFileError):
+        RateHistory(build_history(DAYS)[:40])
@@ -0,0 +1,140 @@
+import json
+import os
+import threading
+import time
+import pytest
+from ..src.source.currencies import Currencies
+from ..src.source.currencies_reader import CurrenciesReader
+from ..src.source.rate_snapshot import RateSnapshot
+from ..src.source.rate_table import RateTable
+from ..src.source.rate_watcher import RateWatcher
+from ..src.interpreter.variables import CurrencyVariable
+from ..src.engines import run_program
+from .engines_test import parse
+
+
+RATES = {"pln": {"eur": 0.25}, "eur": {"pln": 4}, "usd": {"pln": 3.5}}
+NEW_RATES = {"pln": {"eur": 0.2}, "eur": {"pln": 5}, "usd": {"pln": 3.5}}
+
+
+def write_rates(path, rates):
+    with open(path, 'w') as file:
+        json.dump(rates, file)
+    stat = os.stat(path)  # make the change visible even within the file system's timestamp resolution
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+
+def converted(amount, source, target):
+    variable = CurrencyVariable('a', amount, source)
+    variable.exchange(target)
+    return variable.value
+
+
+def test_snapshot_is_immutable():
+    snapshot = RateSnapshot.freeze(RATES)
+    assert snapshot.currencies == RATES
+    with pytest.raises(TypeError):
+        snapshot.currencies['pln'] = {}
+    with pytest.raises(TypeError):
+        snapshot.currencies['pln']['eur'] = 1
+    assert RateSnapshot.freeze(RATES).version > snapshot.version
+
+
+def test_snapshot_shares_unchanged_rates():
+    first = RateSnapshot.freeze(RATES)
+    second = RateSnapshot.freeze(NEW_RATES, previous=first)
+    assert second.currencies['usd'] is first.currencies['usd']
+    assert second.currencies['pln'] is not first.currencies['pln']
+
+
+def test_pinned_snapshot_survives_publish():
+    Currencies.publish(RateSnapshot.freeze(RATES))
+    previous = Currencies.pin(Currencies.current())
+    try:
+        Currencies.publish(RateSnapshot.freeze(NEW_RATES))
+        assert converted(10, 'eur', 'pln') == 40
+    finally:
+        Currencies.pin(previous)
+    assert converted(10, 'eur', 'pln') == 50
+
+
+def test_pinned_table_grows_with_new_codes():
+    Currencies.publish(RateSnapshot.freeze(RATES))
+    previous = Currencies.pin(Currencies.current())
+    try:
+        RateTable.intern('snapshot-test-code')
+        with pytest.raises(KeyError):
+            converted(1, 'snapshot-test-code', 'pln')
+        assert Currencies.pinned.table.size == len(RateTable.codes)
+    finally:
+        Currencies.pin(previous)
+
+
+def test_run_program_pins_and_restores(capsys):
+    program = parse('void main() { cur a = 10 eur; print(a pln); }')
+    Currencies.currencies = RATES
+    run_program(program, 'vm')
+    assert capsys.readouterr().out == '40.0\n'
+    assert Currencies.pinned.snapshot is None
+    assert Currencies.snapshot.currencies is RATES
+
+
+def test_watcher_check(tmp_path):
+    path = str(tmp_path / "rates.json")
+    write_rates(path, RATES)
+    watcher = RateWatcher(path)
+    first = watcher.check()
+    assert first is Currencies.snapshot
+    assert first.rate_table is not None
+    assert watcher.check() is None
+    write_rates(path, RATES)
+    assert watcher.check() is None
+    write_rates(path, NEW_RATES)
+    second = watcher.check()
+    assert second.version > first.version
+    assert Currencies.currencies == NEW_RATES
+    assert second.currencies['usd'] is first.currencies['usd']
+
+
+def test_reader_and_watcher_share_digest(tmp_path):
+    path = str(tmp_path / "rates.json")
+    write_rates(path, RATES)
+    CurrenciesReader(path)
+    snapshot = Currencies.snapshot
+    assert RateWatcher(path).check() is None
+    assert Currencies.snapshot is snapshot
+
+
+def test_watcher_thread(tmp_path):
+    path = str(tmp_path / "rates.json")
+    write_rates(path, RATES)
+    CurrenciesReader(path)
+    watcher = RateWatcher(path, interval=0.01).start()
+    try:
+        write_rates(path, NEW_RATES)
+        deadline = time.monotonic() + 5
+        while Currencies.currencies != NEW_RATES and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert Currencies.currencies == NEW_RATES
+        with open(path, 'w') as file:
+            file.write('{"pln": ')
+        time.sleep(0.1)
+        assert Currencies.currencies == NEW_RATES
+    finally:
+        watcher.stop()
+    assert watcher.thread is None
+
+
+def test_current_waits_for_a_publish_in_progress():
+    Currencies.publish(RateSnapshot.freeze(RATES))
+    snapshot = RateSnapshot.freeze(NEW_RATES)
+    results = []
+    with Currencies.lock:  # the rates are set but not yet the snapshot of a publish
+        Currencies.currencies = snapshot.currencies
+        thread = threading.Thread(target=lambda: results.append(Currencies.current()))
+        thread.start()
+        thread.join(0.05)
+        Currencies.snapshot = snapshot
+    thread.join()
+    assert results == [snapshot]
+    assert Currencies.snapshot is snapshot
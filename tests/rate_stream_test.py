@@ -0,0 +1,74 @@
+import hashlib
+import io
+import json
+import pytest
+from ..src.source.compact_rates import CompactRates
+from ..src.source.currencies import Currencies
+from ..src.source.currencies_reader import CurrenciesReader
+from ..src.source.rate_stream import JsonRateStream
+from ..src.source.rate_table import RateTable
+
+
+def stream(text, chunk_size=3):
+    return JsonRateStream(io.BytesIO(text.encode()), chunk_size).read()
+
+
+def test_stream_matches_json():
+    with open("resources/currencies.json") as file:
+        text = file.read()
+    for chunk_size in (1, 2, 7, 1 << 16):
+        rates = stream(text, chunk_size)
+        assert isinstance(rates, CompactRates)
+        assert rates == json.loads(text)
+        assert list(rates) == list(json.loads(text))
+
+
+def test_stream_values():
+    rates = stream(' { "p\\u0142n" : {"eur": -1.5e-2, "usd": 4} ,"ąę": {}, "eur": {"pln": 0}}\n')
+    assert rates["płn"] == {"eur": -0.015, "usd": 4.0}
+    assert rates["ąę"] == {}
+    assert "usd" not in rates
+    assert len(rates) == 3
+    assert rates.rates.typecode == 'd'
+    assert list(rates.edges()) == [("płn", "eur", -0.015), ("płn", "usd", 4.0), ("eur", "pln", 0.0)]
+
+
+def test_stream_duplicate_currency_replaces_rates():
+    rates = stream('{"pln": {"eur": 1}, "eur": {}, "pln": {"usd": 2}}')
+    assert rates == {"pln": {"usd": 2}, "eur": {}}
+    assert list(rates.edges()) == [("pln", "usd", 2)]
+
+
+@pytest.mark.parametrize('text', ['', '{', '{"pln": 1}', '{"pln": {"eur": "1"}}', '{"pln": {}} {}',
+                                  '{"pln": {"eur": 1,}}', '[]'])
+def test_stream_errors(text):
+    with pytest.raises(ValueError):
+        stream(text)
+
+
+def test_stream_digest():
+    text = '{"pln": {"eur": 0.25}}'
+    file_stream = JsonRateStream(io.BytesIO(text.encode()), 4)
+    file_stream.read()
+    assert file_stream.digest.hexdigest() == hashlib.sha256(text.encode()).hexdigest()
+
+
+def test_table_from_compact_rates():
+    rates = stream('{"pln": {"eur": 0.25}, "eur": {"pln": 4, "usd": 1.1}}')
+    table = RateTable(rates)
+    pln, eur, usd = RateTable.intern('pln'), RateTable.intern('eur'), RateTable.intern('usd')
+    assert table.rate(pln, eur) == 0.25
+    assert table.rate(pln, usd) == 0.25 * 1.1
+    with pytest.raises(KeyError) as error:
+        table.rate(usd, pln)
+    assert error.value.args == ('usd',)
+
+
+def test_reader_streams_large_files():
+    CurrenciesReader("resources/currencies.json", streaming=True)
+    assert isinstance(Currencies.currencies, CompactRates)
+    streamed = Currencies.snapshot.digest
+    CurrenciesReader("resources/currencies.json")
+    assert not isinstance(Currencies.currencies, CompactRates)
+    assert Currencies.snapshot.digest == streamed
+    assert Currencies.table().rate(RateTable.intern('eur'), RateTable.intern('usd')) == 20
@@ -0,0 +1,129 @@
+import pytest
+from ..src.source.rate_table import RateTable
+from ..src.source.currencies import Currencies
+from ..src.source.currencies_reader import CurrenciesReader
+from ..src.interpreter.variables import CurrencyVariable
+
+
+RATES = {
+    "pln": {"eur": 0.25, "usd": 0.3},
+    "eur": {"pln": 4.5},
+    "usd": {"pln": 3.5, "eur": 0.9}
+}
+
+
+def test_rate_table_interns_codes():
+    table = RateTable(RATES)
+    assert table.codes[table.ids['eur']] == 'eur'
+    assert RateTable.intern('eur') == table.ids['eur']
+    assert table.ids[None] == 0
+    assert table.size == len(RateTable.codes)
+
+
+def test_rate_table_rows():
+    table = RateTable(RATES)
+    pln, eur, usd = RateTable.intern('pln'), RateTable.intern('eur'), RateTable.intern('usd')
+    assert table.rate(pln, eur) == 0.25
+    assert table.rate(usd, eur) == 0.9
+    assert table.rows[eur][eur] == 1.0
+    assert table.rows[0] == {}
+    assert not table.memoized
+
+
+def test_rate_table_triangulates_missing_pair():
+    table = RateTable(RATES)
+    eur, usd = RateTable.intern('eur'), RateTable.intern('usd')
+    assert table.edges[eur] is None
+    assert usd not in table.quoted(eur)
+    assert table.rate(eur, usd) == 4.5 * 0.3
+    assert table.rows[eur][usd] == 4.5 * 0.3
+    assert (eur, usd) in table.memoized
+
+
+def test_rate_table_prefers_fewest_conversions_then_best_rate():
+    table = RateTable({
+        "aaa": {"bbb": 2, "ccc": 3, "eee": 100},
+        "bbb": {"ddd": 5},
+        "ccc": {"ddd": 4},
+        "eee": {"fff": 100},
+        "fff": {"ddd": 100}
+    })
+    assert table.rate(RateTable.intern('aaa'), RateTable.intern('ddd')) == 12
+
+
+def test_rate_table_unreachable_pair():
+    table = RateTable({"pln": {"eur": 0.25}, "usd": {"chf": 0.9}})
+    with pytest.raises(KeyError) as error:
+        table.rate(RateTable.intern('pln'), RateTable.intern('usd'))
+    assert error.value.args == ('usd',)
+    with pytest.raises(KeyError) as error:
+        table.rate(RateTable.intern('eur'), RateTable.intern('pln'))
+    assert error.value.args == ('eur',)
+    with pytest.raises(KeyError) as error:
+        table.rate(0, RateTable.intern('usd'))
+    assert error.value.args == (None,)
+
+
+def test_rate_table_cache_is_bounded():
+    table = RateTable({"aaa": {"hub": 2}, "bbb": {"hub": 3}, "ccc": {"hub": 4},
+                       "hub": {"aaa": 0.5, "bbb": 0.25, "ccc": 0.2}}, cache_size=2)
+    aaa, bbb, ccc = RateTable.intern('aaa'), RateTable.intern('bbb'), RateTable.intern('ccc')
+    assert table.rate(aaa, bbb) == 0.5
+    assert table.rate(aaa, ccc) == 0.4
+    assert table.rate(bbb, ccc) == 3 * 0.2
+    assert list(table.memoized) == [(aaa, ccc), (bbb, ccc)]
+    assert bbb not in table.rows[aaa]
+    assert table.rate(aaa, bbb) == 0.5
+
+
+def test_currency_variable_carries_id():
+    Currencies.currencies = RATES
+    variable = CurrencyVariable('a', 10, 'usd')
+    assert variable.currency_id == RateTable.intern('usd')
+    variable.exchange('eur')
+    assert variable.currency == 'eur'
+    assert variable.currency_id == RateTable.intern('eur')
+    assert variable.value == 10 * 0.9
+    variable.exchange_id(RateTable.intern('eur'))
+    assert variable.value == 10 * 0.9
+    assert CurrencyVariable('b').currency is None
+    triangulated = CurrencyVariable('c', 2, 'eur')
+    triangulated.exchange('usd')
+    assert triangulated.value == 2 * 4.5 * 0.3
+
+
+def test_table_follows_replaced_rates():
+    Currencies.currencies = RATES
+    first = Currencies.table()
+    assert Currencies.table() is first
+    Currencies.currencies = {"pln": {"eur": 0.2}, "eur": {"pln": 5}}
+    assert Currencies.table() is not first
+    assert Currencies.table().rate(RateTable.intern('pln'), RateTable.intern('eur')) == 0.2
+
+
+def test_reader_builds_table():
+    CurrenciesReader("resources/currencies.json")
+    assert Currencies.snapshot.currencies is Currencies.currencies
+    assert Currencies.table() is Currencies.snapshot.rate_table
+    assert Currencies.table().source is Currencies.currencies
+    assert Currencies.table().rate(RateTable.intern('eur'), RateTable.intern('usd')) == 20
+
+
+def test_rate_table_reads_rows_on_first_use():
+    table = RateTable(RATES)
+    pln, eur, usd = RateTable.intern('pln'), RateTable.intern('eur'), RateTable.intern('usd')
+    assert all(edges is None for edges in table.edges)
+    assert table.rows[usd][pln] == 3.5
+    assert table.edges[usd] == {pln: 3.5, eur: 0.9}
+    assert table.edges[pln] is None and table.edges[eur] is None
+
+
+def test_extend_after_another_thread_added_the_rows():
+    table = RateTable(RATES)
+    RateTable.intern('extended')
+    size = table.size
+    table.extend()
+    table.size = size  # a thread that checked the size before the rows were added
+    table.extend()
+    assert table.size == len(table.rows) == len(table.edges) == len(RateTable.codes)
+    assert all(row.currency_id == currency_id for currency_id, row in enumerate(table.rows))
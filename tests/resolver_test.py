@@ -0,0 +1,95 @@
+import io
+import pytest
+from ..src.lexer.tokens import Tokens
+from ..src.lexer.token_types import TokenTypes
+from ..src.lexer.lexer import Lexer
+from ..src.parser.parser import Parser
+from ..src.source.currencies_reader import CurrenciesReader
+from ..src.source.currencies import Currencies
+from ..src.source.source import BufferedSource
+from ..src.interpreter.resolver import Resolver
+from ..src.interpreter.interpreter import Interpreter
+from ..src.engines import ENGINES, run_program
+from ..src.exceptions.exceptions import UndeclaredError, OverwriteError
+
+
+def parse(source_string):
+    CurrenciesReader("resources/currencies.json")
+    for currency in Currencies.currencies:
+        Tokens.keywords[currency] = TokenTypes.CURRENCY_TYPE
+    parser = Parser(Lexer(BufferedSource(io.StringIO(source_string))))
+    parser.parse_program()
+    return parser.program
+
+
+def test_slots_of_parameters_and_locals():
+    program = Resolver().resolve(parse('dec add(dec a, dec b) { dec c = a + b; c = c + a; return c; }'
+                                       'void main() { dec x = add(1, 2); print(x); }'))
+    add, main = program.function_defs
+    assert add.slots == {'a': 0, 'b': 1, 'c': 2}
+    assert [signature.slot for signature in add.parameters.signatures] == [0, 1]
+    init, assign, _ = add.block.statements
+    assert init.signature.slot == 2
+    assert assign.slot == 2
+    assert [primary_expr.slot for primary_expr in init.expression.multipl_exprs[0].primary_exprs] == [0]
+    assert main.slots == program.main_slots == {'x': 0}
+
+
+def test_main_functions_share_slots():
+    program = Resolver().resolve(parse('void main() { dec a = 1; } void main() { dec b = a; print(b); }'))
+    assert program.function_defs[0].slots is program.function_defs[1].slots
+    assert program.main_slots == {'a': 0, 'b': 1}
+
+
+@pytest.mark.parametrize('source_string, error', [
+    ('void main() { print(a); }', UndeclaredError),
+    ('void main() { a = 1; }', UndeclaredError),
+    ('void main() { dec a = a; }', UndeclaredError),
+    ('void main() { cur a = 1 pln; cur b = 1 c.get_currency(); }', UndeclaredError),
+    ('void main() { dec a = 1; dec a = 2; }', OverwriteError),
+    ('void main() { dec a = 1; if (a > 0) { cur a = 2 eur; } }', OverwriteError),
+    ('dec f(dec a) { dec a = 1; return a; } void main() { }', OverwriteError),
+    ('dec f(dec a, dec a) { return a; } void main() { }', OverwriteError),
+    ('void main() { dec a = 1; } void main() { dec a = 2; }', OverwriteError),
+    ('dec unused() { return missing; } void main() { }', UndeclaredError)
+])
+def test_errors_reported_at_resolve_time(source_string, error):
+    with pytest.raises(error):
+        Resolver().resolve(parse(source_string))
+
+
+@pytest.mark.parametrize('engine', ENGINES)
+def test_errors_reported_before_running(capsys, engine):
+    with pytest.raises(UndeclaredError):
+        run_program(parse('void main() { print("started"); print(a); }'), engine)
+    assert capsys.readouterr().out == ''
+
+
+@pytest.mark.parametrize('engine', ENGINES)
+def test_declarations_that_may_not_run(capsys, engine):
+    program = parse('void main() {'
+                    'dec i = 0;'
+                    'if (i > 0) { dec a = 1; } else { dec a = 2; }'
+                    'print(a);'
+                    'while (i < 1) { dec b = i; i = i + 1; }'
+                    'print(b);'
+                    '}')
+    run_program(program, engine)
+    assert capsys.readouterr().out == '2.0\n0.0\n'
+
+
+@pytest.mark.parametrize('engine', ENGINES)
+def test_errors_that_depend_on_the_run(capsys, engine):
+    with pytest.raises(OverwriteError):
+        run_program(parse('void main() { dec i = 0; while (i < 2) { dec a = i; i = i + 1; } }'), engine)
+    with pytest.raises(UndeclaredError):
+        run_program(parse('void main() { dec i = 0; if (i > 0) { dec a = 1; } print(a); }'), engine)
+
+
+def test_interpreter_frames_are_lists():
+    interpreter = Interpreter(None)
+    interpreter.interpret(parse('void main() { dec a = 1; cur b = 2 eur; }'))
+    scope = interpreter.scope_manager.current_scope
+    assert scope.slots == {'a': 0, 'b': 1}
+    assert [variable.value for variable in scope.values] == [1, 2]
+    assert scope.symbols['b'].currency == 'eur'
@@ -0,0 +1,140 @@
+import io
+from ..src.lexer.lexer import Lexer
+from ..src.lexer.token import TokenTypes
+from ..src.source.source import FileSource, BufferedSource, MmapSource
+
+
+def read_positions(source):
+    positions = []
+    source.move_carr_one_pos()
+    while source.character != '':
+        positions.append((source.character, source.line, source.column))
+        source.move_carr_one_pos()
+    positions.append((source.character, source.line, source.column))
+    return positions
+
+
+def test_buffered_source_positions():
+    program = "dec a = 5;\n  cur b = a eur;\n\n# comment\nprint(a);"
+    file_positions = read_positions(FileSource(io.StringIO(program)))
+    buffered_positions = read_positions(BufferedSource(io.StringIO(program)))
+    assert buffered_positions == file_positions
+
+
+def test_buffered_source_empty():
+    source = BufferedSource(io.StringIO(""))
+    source.move_carr_one_pos()
+    assert source.character == ''
+    assert source.get_position() == (1, 2)
+
+
+def test_buffered_source_peek():
+    source = BufferedSource(io.StringIO("<=a"))
+    source.move_carr_one_pos()
+    assert source.character == '<'
+    assert source.peek() == '='
+    assert source.peek(2) == 'a'
+    assert source.peek(3) == ''
+    assert source.character == '<'
+    assert source.get_position() == (1, 2)
+
+
+def test_file_source_peek():
+    source = FileSource(io.StringIO("<=a"))
+    source.move_carr_one_pos()
+    assert source.peek() == '='
+    assert source.peek(2) == 'a'
+    source.move_carr_one_pos()
+    assert source.character == '='
+
+
+def test_lexer_with_buffered_source():
+    lexer = Lexer(BufferedSource(io.StringIO("a <= b\n  != c")))
+    expected = [(TokenTypes.IDENTIFIER, 1, 1), (TokenTypes.LESS_OR_EQUAL, 1, 3), (TokenTypes.IDENTIFIER, 1, 6),
+                (TokenTypes.NOT_EQUAL, 2, 3), (TokenTypes.IDENTIFIER, 2, 6), (TokenTypes.EOT, 2, 7)]
+    for token_type, line, column in expected:
+        lexer.get_next_token()
+        assert (lexer.token.type, lexer.token.line, lexer.token.column) == (token_type, line, column)
+
+
+def test_lookahead_keeps_columns():
+    lexer = Lexer(BufferedSource(io.StringIO("a < b")))
+    lexer.get_next_token()
+    lexer.get_next_token()
+    assert lexer.token.type == TokenTypes.LESS_THAN
+    lexer.get_next_token()
+    assert lexer.token.type == TokenTypes.IDENTIFIER
+    assert lexer.token.column == 5
+
+
+def test_mmap_source_positions(tmp_path):
+    program = "cur zł = 5 pln;\n  print(\"żółw €\", zł);\n"
+    path = tmp_path / "program.txt"
+    path.write_text(program, encoding='utf-8')
+    file_positions = read_positions(FileSource(io.StringIO(program)))
+    with open(path, encoding='utf-8') as file:
+        mmap_positions = read_positions(MmapSource(file))
+    assert mmap_positions == file_positions
+
+
+def test_mmap_source_empty(tmp_path):
+    path = tmp_path / "program.txt"
+    path.write_text("")
+    with open(path) as file:
+        source = MmapSource(file)
+        source.move_carr_one_pos()
+        assert source.character == ''
+        assert source.get_position() == (1, 2)
+
+
+def test_mmap_source_peek(tmp_path):
+    path = tmp_path / "program.txt"
+    path.write_text("!€=", encoding='utf-8')
+    with open(path, encoding='utf-8') as file:
+        source = MmapSource(file)
+        source.move_carr_one_pos()
+        assert source.peek() == '€'
+        assert source.peek(2) == '='
+        assert source.peek(3) == ''
+        source.move_carr_one_pos()
+        assert source.character == '€'
+        assert source.get_position() == (1, 3)
+
+
+def test_lexer_with_mmap_source(tmp_path):
+    path = tmp_path / "program.txt"
+    path.write_text("a >= b\n# comment\nprint")
+    with open(path) as file:
+        lexer = Lexer(MmapSource(file))
+        token_types = []
+        lexer.get_next_token()
+        while lexer.token.type != TokenTypes.EOT:
+            token_types.append(lexer.token.type)
+            lexer.get_next_token()
+    assert token_types == [TokenTypes.IDENTIFIER, TokenTypes.GREATER_OR_EQUAL, TokenTypes.IDENTIFIER,
+                           TokenTypes.PRINT]
+
+
+def test_mmap_source_translates_newlines_like_text_mode(tmp_path):
+    path = tmp_path / "program.txt"
+    path.write_bytes("print(\"a\r\nb\rc\");\r\n\r\nż\r".encode('utf-8'))
+    with open(path, encoding='utf-8') as file:
+        file_positions = read_positions(FileSource(file))
+    with open(path, encoding='utf-8') as file, MmapSource(file) as source:
+        assert read_positions(source) == file_positions
+    with open(path, encoding='utf-8') as file, MmapSource(file) as source:
+        source.move_carr_one_pos()
+        assert source.peek(8) == '\n' and source.peek(9) == 'b'
+        assert source.read_remaining() == file.read()[1:]
+
+
+def test_mmap_source_closes_the_map(tmp_path):
+    path = tmp_path / "program.txt"
+    path.write_text("print(1);")
+    with open(path) as file:
+        with MmapSource(file) as source:
+            source.move_carr_one_pos()
+        assert source.buffer.closed
+    path.write_text("")
+    with open(path) as file:
+        MmapSource(file).close()
@@ -0,0 +1,96 @@
+import io
+import pytest
+from ..src.lexer.lexer import Lexer
+from ..src.lexer.token import TokenTypes
+from ..src.lexer.token_stream import TokenStream
+from ..src.lexer.token_array import TokenArray
+from ..src.source.source import BufferedSource
+from ..src.parser.parser import Parser
+
+
+def create_lexer(source_string, engine="reference"):
+    return Lexer(BufferedSource(io.StringIO(source_string)), engine=engine)
+
+
+def test_tokens_generator():
+    token_types = [token.type for token in create_lexer("dec a = 5;").tokens()]
+    assert token_types == [TokenTypes.DECIMAL, TokenTypes.IDENTIFIER, TokenTypes.ASSIGNMENT, TokenTypes.NUMBER,
+                           TokenTypes.SEMICOLON, TokenTypes.EOT]
+
+
+def test_tokens_generator_fast_engine():
+    reference = [(token.type, token.value, token.line, token.column)
+                 for token in create_lexer("void main() {\n print(\"a\", 1.5);\n}").tokens()]
+    fast = [(token.type, token.value, token.line, token.column)
+            for token in create_lexer("void main() {\n print(\"a\", 1.5);\n}", "fast").tokens()]
+    assert fast == reference
+
+
+def test_token_stream_peek_and_advance():
+    stream = TokenStream(create_lexer("a + b * c").tokens())
+    assert stream.token.type == TokenTypes.IDENTIFIER
+    assert stream.peek(0) is stream.token
+    assert stream.peek().type == TokenTypes.PLUS
+    assert stream.peek(3).type == TokenTypes.MULTIPLY
+    assert stream.advance().type == TokenTypes.PLUS
+    assert stream.peek(2).type == TokenTypes.MULTIPLY
+    assert stream.advance().value == 'b'
+    assert stream.advance().type == TokenTypes.MULTIPLY
+    assert stream.advance().value == 'c'
+    assert stream.advance().type == TokenTypes.EOT
+
+
+def test_token_stream_wraps_ring_buffer():
+    stream = TokenStream(create_lexer("a b c d e f g h").tokens(), capacity=3)
+    values = []
+    while stream.token.type != TokenTypes.EOT:
+        assert stream.peek(3) is not None
+        values.append(stream.token.value)
+        stream.advance()
+    assert values == ['a', 'b', 'c', 'd', 'e', 'f', 'g', 'h']
+
+
+def test_token_stream_repeats_eot():
+    stream = TokenStream(create_lexer("a").tokens())
+    assert stream.peek(5).type == TokenTypes.EOT
+    stream.advance()
+    assert stream.advance().type == TokenTypes.EOT
+    assert stream.advance().type == TokenTypes.EOT
+
+
+def test_token_stream_peek_too_far():
+    stream = TokenStream(create_lexer("a").tokens(), capacity=2)
+    with pytest.raises(ValueError):
+        stream.peek(3)
+
+
+def test_parser_with_token_stream():
+    stream = TokenStream(create_lexer("void main() { dec a = 1; }", "fast").tokens())
+    parser = Parser(stream)
+    parser.parse_program()
+    assert parser.program.function_defs[0].signature.id == 'main'
+    assert parser.program.function_defs[0].block.statements[0].signature.id == 'a'
+
+
+def test_token_has_no_instance_dict():
+    token = next(create_lexer("12.5").tokens())
+    assert not hasattr(token, '__dict__')
+    assert token.numerical_value == 12.5
+
+
+def test_token_array_round_trip():
+    tokens = list(create_lexer('cur a = 5 eur;\nprint("a", a, a);').tokens())
+    token_array = TokenArray.from_tokens(tokens)
+    assert len(token_array) == len(tokens)
+    assert [(token.type, token.line, token.column, token.value) for token in token_array] == \
+           [(token.type, token.line, token.column, token.value) for token in tokens]
+    assert token_array.value_table.count('a') == 1
+
+
+def test_parser_with_token_array():
+    token_array = TokenArray.from_tokens(create_lexer("dec add(dec a, dec b) { return a + b; }").tokens())
+    parser = Parser(token_array)
+    parser.parse_program()
+    function_def = parser.program.function_defs[0]
+    assert function_def.signature.id == 'add'
+    assert [signature.id for signature in function_def.parameters.signatures] == ['a', 'b']
@@ -0,0 +1,71 @@
+import pytest
+from .engines_test import parse, run
+from .vm_test import EDGE_CASES
+from ..src.compiler.transpiler import PythonTranspiler, load_program, CODE_CACHE, CODE_CACHE_SIZE
+from ..src.exceptions.exceptions import NotTranspilableError
+
+
+TRANSPILER_CASES = {
+    'conditional_declaration': 'void main() { dec a = 1; if (a > 2) { dec b = 1; } else { dec c = 2; } '
+                               'if (a < 2) { dec b = 3; print(b); } print(b); }',
+    'declared_in_both_branches': 'void main() { dec a = 1; if (a > 2) { dec b = 1; } else { dec b = 2; } print(b); }',
+    'side_effects_in_conditions': 'dec f(dec a) { print("f", a); return a; } '
+                                  'void main() { if (f(1) > 0 | f(2) > 0) { print("or"); } '
+                                  'if (f(3) < 0 & f(4) < 0) { print("and"); } }',
+    'loop_return_type': 'dec f() { dec i = 0; while (i < 3) { i = i + 1; return 1 eur; } return i; } '
+                        'void main() { print(f()); }',
+    'void_loop_return': 'void f() { dec i = 0; while (i < 3) { i = i + 1; if (i == 2) { return i; } } } '
+                        'void main() { f(); }',
+    'missing_return': 'dec f(dec a) { if (a > 1) { return a; } } void main() { print(f(2)); print(f(0)); }',
+    'uninitialized_currency': 'void main() { cur a; a = 5; }',
+    'uninitialized_decimal': 'void main() { dec a; print(a); a = 2; print(a * 3); }',
+    'argument_count': 'dec f(dec a) { return a; } void main() { print(f(1, 2)); }',
+    'currency_arguments': 'cur f(cur a, dec b) { return a * b pln; } '
+                          'void main() { cur a = 3 eur; print(f(a, 2), " ", f(a usd, 1)); }',
+    'main_called': 'void main() { print("main"); } void helper() { main(); }',
+    'undeclared_function': 'void main() { print("before"); missing(); }',
+    'division_by_literal_zero': 'void main() { dec a = 4 / 0; }',
+    'negated_conjunction': 'void main() { dec i = 0; while (i < 3 & i > 0 - 1) { i = i + 1; } '
+                           'if (!(i > 1 & i < 2)) { print("not both ", i); } }'
+}
+
+
+@pytest.mark.parametrize('name', list(EDGE_CASES.keys()) + list(TRANSPILER_CASES.keys()))
+def test_python_engine_matches_visitor(capsys, name):
+    source = {**EDGE_CASES, **TRANSPILER_CASES}[name]
+    expected = run(capsys, source, 'visitor')
+    assert run(capsys, source, 'python') == expected
+
+
+def test_argument_checks_are_lifted_out_of_functions():
+    source = PythonTranspiler().transpile(parse('dec add(dec a, dec b) { return a + b; } '
+                                                'void main() { print(add(1, 2)); }'))
+    assert 'def f_add(v_a, v_b):\n    t1 = v_a\n    t1 += v_b\n    return t1\n' in source
+    assert 'Error' not in source
+
+
+def test_untyped_program_is_not_transpiled(capsys):
+    source = 'void f() { } void main() { dec a = f(); }'
+    with pytest.raises(NotTranspilableError):
+        PythonTranspiler().transpile(parse(source))
+    assert run(capsys, source, 'python') == run(capsys, source, 'visitor')
+
+
+def test_compiled_code_is_cached():
+    source = 'void main() { print(1); }'
+    run_first = load_program(parse(source))
+    size = len(CODE_CACHE)
+    run_second = load_program(parse(source))
+    assert len(CODE_CACHE) == size
+    assert run_first.__code__ is run_second.__code__
+
+
+def test_code_cache_keeps_recently_used_sources():
+    first = 'void main() { print(0); }'
+    load_program(parse(first))
+    for index in range(1, CODE_CACHE_SIZE + 5):
+        load_program(parse(first))  # used again, so kept while the older sources are dropped
+        load_program(parse(f'void main() {{ print({index}); }}'))
+    assert len(CODE_CACHE) == CODE_CACHE_SIZE
+    assert PythonTranspiler().transpile(parse(first)) in CODE_CACHE
+    assert PythonTranspiler().transpile(parse('void main() { print(1); }')) not in CODE_CACHE
@@ -0,0 +1,72 @@
+from .engines_test import parse, run
+from .programs import PROGRAMS
+from ..src.lexer.token_types import TokenTypes
+from ..src.interpreter.resolver import Resolver
+from ..src.compiler.compiler import Compiler
+from ..src.compiler.disassembler import disassemble
+
+
+def resolved(source_string):
+    return Resolver().resolve(parse(source_string))
+
+
+def printed(program):  # the expressions printed by the last 'main' function, in order
+    return program.function_defs[-1].block.statements[-1].printables
+
+
+def test_infers_types_and_currencies():
+    program = resolved('void main() { dec a = 2; cur b = 3 eur; cur c = b + (1 eur) usd; '
+                       'print(a * 2 / a, b - 2 eur, c + b, a eur, (b) pln, b * a, -b); }')
+    expressions = printed(program)
+    assert [(expression.type, expression.currency) for expression in expressions] == [
+        (TokenTypes.DECIMAL, None), (TokenTypes.CURRENCY, 'eur'), (TokenTypes.CURRENCY, 'eur'),
+        (TokenTypes.DECIMAL, None), (TokenTypes.CURRENCY, 'pln'), (TokenTypes.CURRENCY, 'eur'),
+        (TokenTypes.CURRENCY, 'eur')]
+    assert expressions[2].multipl_exprs[1].currency == 'eur'
+
+
+def test_currency_of_every_store_of_a_variable():
+    program = resolved('void main() { cur a = 1 eur; cur b = a; cur c = 2 usd; b = b + 3 usd; '
+                       'c = 1 eur; print(a, b, c); }')
+    assert [expression.currency for expression in printed(program)] == ['eur', 'eur', None]
+
+
+def test_currency_read_at_run_time_is_not_known():
+    program = resolved('cur f(cur a) { return a + 1 eur; } '
+                       'void main() { cur a = 1 eur; cur b = 2 a.get_currency(); print(b, f(a), b + a); }')
+    assert printed(program)[0].type == TokenTypes.CURRENCY
+    assert [expression.currency for expression in printed(program)] == [None, None, None]
+    assert program.function_defs[0].block.statements[0].expression.currency is None
+
+
+def test_leaves_unproven_expressions_untyped():
+    program = resolved('void log(dec a) { print(a); } dec twice(dec a) { return a * 2; } '
+                       'void main() { cur a = 1 eur; dec b = 2; print(a + b, a * a, b / a, (b) eur, log(b), '
+                       'twice(a) + 1); }')
+    assert [expression.type for expression in printed(program)] == [None, None, None, None, None,
+                                                                     TokenTypes.DECIMAL]
+
+
+def test_marks_calls_with_arguments_of_the_parameter_types():
+    program = resolved('dec twice(dec a) { return a * 2; } '
+                       'void main() { cur a = 1 eur; print(twice(2), twice(a), twice(1, 2), missing(1)); }')
+    calls = [expression.multipl_exprs[0].primary_exprs[0].function_call for expression in printed(program)]
+    assert [call.typed for call in calls] == [True, False, False, False]
+
+
+def test_vm_runs_typed_operations_without_checks():
+    listing = disassemble(Compiler().compile_program(resolved(
+        'dec twice(dec a) { return a * 2 / 4; } '
+        'void main() { cur a = 1 eur; cur b = 2 a.get_currency(); print(a + 2 eur, b - a, twice(1) + 1); }')))
+    assert 'MUL_DEC' in listing and 'DIV_DEC' in listing
+    assert 'ADD_TYPED          0' in listing
+    assert 'SUB_TYPED          1' in listing
+    assert 'CALL_TYPED         1' in listing
+    assert ' ADD ' not in listing and ' MUL ' not in listing
+
+
+def test_typed_program_runs_like_the_visitor(capsys):
+    expected = run(capsys, PROGRAMS['inferred_types'], 'visitor')
+    assert expected[1] is None
+    for engine in ('closure', 'vm', 'python'):
+        assert run(capsys, PROGRAMS['inferred_types'], engine) == expected
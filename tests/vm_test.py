@@ -0,0 +1,85 @@
+import pytest
+from .engines_test import parse, run
+from ..src.compiler.compiler import Compiler
+from ..src.compiler.disassembler import disassemble
+from ..src.compiler.opcodes import OPNAMES
+from ..src.engines import run_program
+from ..src.exceptions.exceptions import CallDepthError, InvalidReturnedTypeError
+
+
+EDGE_CASES = {
+    'multiply_chain': 'void main() { cur a = 2 eur; dec b = 3; print(a * b * 5, " ", b * a * 5, " ", b * 2 / 4); }',
+    'currency_parts': 'void main() { cur a = 2 eur; cur b = 1 usd; cur c = 3 b.get_currency(); '
+                      'cur d = a b.get_currency(); dec e = 4; print(c, " ", d, " ", (a + b) pln, " ", -a, " ", -(e * 2)); }',
+    'conditions': 'void main() { dec a = 1; if (!a > 2 & (a == 1 | a != 1)) { print("yes"); } '
+                  'if (!(a < 0) & a >= 1 & a <= 1) { print("also"); } }',
+    'redeclare_in_loop': 'void main() { dec i = 0; while (i < 2) { dec j = i; i = i + 1; } }',
+    'duplicate_parameter': 'dec f(dec a, dec a) { return a; } void main() { print(f(1, 2)); }',
+    'two_mains': 'void main() { print("first"); return 1; } void main() { print("second"); print("skipped"); }',
+    'return_in_main': 'void main() { print("before"); if (1 == 1) { return 1; } print("after"); }',
+    'nested_return_in_loop': 'dec f(dec n) { dec i = 0; while (i < n) { i = i + 1; if (i == 2) { return i; } } '
+                             'return 0; } void main() { print(f(5)); }',
+    'change_type': 'void main() { cur a; a = 5; }',
+    'get_currency_of_decimal': 'void main() { dec a = 1; cur b = 2 a.get_currency(); }',
+    'nested_calls': 'dec add(dec a, dec b) { return a + b; } dec twice(dec a) { return add(a, a); } '
+                    'void main() { dec a = 1; print(add(twice(a), twice(add(a, 2))), " ", a); }',
+    'wrong_returned_type': 'cur f() { return 1; } void main() { print("before"); dec a = f(); }'
+}
+
+
+@pytest.mark.parametrize('name', EDGE_CASES.keys())
+def test_vm_matches_visitor(capsys, name):
+    expected = run(capsys, EDGE_CASES[name], 'visitor')
+    assert run(capsys, EDGE_CASES[name], 'vm') == expected
+
+
+def test_compiler_assigns_slots():
+    program = Compiler().compile_program(parse('dec f(dec a, cur b) { dec c = a; return c; } void main() { }'))
+    function = program.functions['f']
+    assert function.local_names == ['a', 'b', 'c']
+    assert function.parameters == [0, 1]
+    assert len(function.code) % 2 == 0
+
+
+def test_disassembler_lists_every_instruction():
+    program = Compiler().compile_program(parse('void main() { dec a = 2; while (a < 10) { a = a * 2; } print(a); }'))
+    listing = disassemble(program)
+    lines = listing.splitlines()
+    assert lines[0].startswith('main(): 1 slots')
+    assert len(lines) == 1 + len(program.entry.code) // 2
+    assert 'DECLARE_DEC        0 (a)' in listing
+    assert 'JUMP               to 0' not in listing
+    assert all(line.split()[-1] != '?' for line in lines)
+    assert {line.replace('>>', '').split()[1] for line in lines[1:]} <= set(OPNAMES)
+
+
+DEEP_RECURSION = '''
+dec sum(dec n) {
+    if (n > 0) {
+        return sum(n - 1) + n;
+    }
+    return 0;
+}
+
+void main() {
+    print(sum(DEPTH));
+}
+'''
+
+
+def test_vm_recursion_is_not_limited_by_python(capsys):
+    run_program(parse(DEEP_RECURSION.replace('DEPTH', '20000')), 'vm')
+    assert capsys.readouterr().out == f"{float(sum(range(20001)))}\n"
+
+
+def test_vm_max_depth(capsys):
+    program = parse(DEEP_RECURSION.replace('DEPTH', '100'))
+    run_program(program, 'vm', max_depth=101)
+    assert capsys.readouterr().out == "5050.0\n"
+    with pytest.raises(CallDepthError):
+        run_program(program, 'vm', max_depth=100)
+
+
+def test_vm_checks_returned_type_of_nested_call():
+    with pytest.raises(InvalidReturnedTypeError):
+        run_program(parse('cur f() { return 1; } dec g() { return f(); } void main() { dec a = g(); }'), 'vm')